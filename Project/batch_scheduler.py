@@ -0,0 +1,121 @@
+"""
+Micro-Batching Request Scheduler
+Coalesces concurrent profile scoring calls into one matrix product
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Collects profiles from concurrent callers and scores them together
+
+    A background thread waits for the first queued profile, then keeps
+    collecting for up to max_wait_ms (or until max_batch profiles are
+    queued) and scores the whole batch with one score_batch call. Each
+    caller gets its own row of the resulting profiles x schemes matrix.
+    Threads call score(); coroutines await score_async().
+    """
+
+    def __init__(self, score_batch, max_batch=32, max_wait_ms=2.0):
+        """
+        Args:
+            score_batch: Callable mapping a list of profiles to a profiles x schemes
+                         score matrix, e.g. HighAccuracyPredictor.score_profiles
+            max_batch: Maximum profiles scored together
+            max_wait_ms: How long the first profile of a batch waits for company
+        """
+        self.score_batch = score_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.profiles = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        # Orders submit() against close(), so nothing is queued behind the stop sentinel
+        self._submit_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, user_data):
+        """Queue one profile; returns a Future resolving to its score row"""
+        future = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put((user_data, future))
+        return future
+
+    def score(self, user_data, timeout=None):
+        """Score row of one profile, blocking until its batch has been scored"""
+        return self.submit(user_data).result(timeout)
+
+    async def score_async(self, user_data):
+        """Score row of one profile without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(user_data))
+
+    def close(self):
+        """Score what is already queued, then stop the worker thread"""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+
+    def stats(self):
+        """Batch counters for tuning max_batch and max_wait_ms"""
+        return {
+            'batches': self.batches,
+            'profiles': self.profiles,
+            'mean_batch_size': round(self.profiles / self.batches, 2) if self.batches else 0.0,
+            'max_batch': self.max_batch,
+            'max_wait_ms': self.max_wait * 1000,
+        }
+
+    def _collect(self):
+        """Block for the first queued request, then gather more until full or timed out"""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Finish this batch first; the sentinel stops the loop afterwards
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            # Callers that gave up (cancelled futures) are dropped from the batch
+            batch = [(user_data, future) for user_data, future in batch
+                     if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                scores = self.score_batch([user_data for user_data, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.profiles += len(batch)
+            for row, (_, future) in zip(scores, batch):
+                future.set_result(row)
@@ -0,0 +1,557 @@
+"""
+Performance Benchmarks for the High Accuracy Predictor
+Run with: python benchmarks.py <benchmark> [--data updated_data.csv]
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import random
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+
+from batch_scheduler import MicroBatcher
+from parallel_scoring import ParallelScorer
+
+from high_accuracy_model import (HighAccuracyPredictor, SCHEME_MATRICES, CSR_PARTS,
+                                 ABBREVIATION_EXPANSIONS, advanced_clean_column, boost_masks,
+                                 min_score_for_confidence, prepare_scheme_rows, read_scheme_chunks,
+                                 top_k)
+
+
+SAMPLE_PROFILES = [
+    {'age': 20, 'income': 150000, 'occupation': 'Student', 'category': 'General',
+     'location': 'Delhi', 'education': 'Undergraduate', 'family_size': 4, 'years_experience': 0},
+    {'age': 65, 'income': 80000, 'occupation': 'Retired', 'category': 'General',
+     'location': 'Maharashtra', 'education': 'Graduate', 'family_size': 2, 'years_experience': 40},
+    {'age': 35, 'income': 60000, 'occupation': 'Farmer', 'category': 'SC',
+     'location': 'Punjab', 'education': 'High School', 'family_size': 6, 'years_experience': 15},
+    {'age': 28, 'income': 250000, 'occupation': 'MSME', 'category': 'Women',
+     'location': 'Kerala', 'education': 'Postgraduate', 'family_size': 3, 'years_experience': 5},
+]
+
+
+OCCUPATIONS = ['Student', 'Farmer', 'Government', 'Private', 'MSME', 'Self-Employed',
+               'Unemployed', 'Retired', 'Worker']
+CATEGORIES = ['General', 'SC', 'ST', 'OBC', 'Women', 'Minority']
+EDUCATION = ['Primary', 'High School', 'Undergraduate', 'Graduate', 'Postgraduate',
+             'Diploma', 'Professional']
+LOCATIONS = ['Delhi', 'Maharashtra', 'Punjab', 'Kerala', 'Bihar', 'Tamil Nadu']
+
+
+def random_profiles(count, seed=42):
+    """Synthetic citizen profiles drawn from the web form's value ranges"""
+    rng = random.Random(seed)
+    return [{'age': rng.randint(1, 90),
+             'income': rng.choice([20000, 60000, 90000, 150000, 250000, 400000, 900000]),
+             'occupation': rng.choice(OCCUPATIONS),
+             'category': rng.choice(CATEGORIES),
+             'location': rng.choice(LOCATIONS),
+             'education': rng.choice(EDUCATION),
+             'family_size': rng.randint(1, 8),
+             'years_experience': rng.choice([0, 1, 5, 20])}
+            for _ in range(count)]
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the predictor's progress prints while timing"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def timed(fn, repeat=1):
+    """Best wall-clock time of fn() in seconds, plus its last return value"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_cold_start(args):
+    """Worker start-up: full CSV fit vs loading saved artifacts"""
+    with quiet():
+        fit_time, predictor = timed(lambda: HighAccuracyPredictor(args.data))
+    print(f"Fit from CSV:        {fit_time * 1000:8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        with quiet():
+            predictor.save_model(directory)
+            load_time, _ = timed(lambda: HighAccuracyPredictor.load_model(directory, data_path=args.data),
+                                 repeat=args.repeat)
+        print(f"Load from artifacts: {load_time * 1000:8.1f} ms")
+    print(f"Speed-up:            {fit_time / load_time:8.1f}x")
+
+
+def _proportional_memory_kb():
+    """Pss and Private memory of this process (Linux /proc/self/smaps_rollup)"""
+    usage = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('Pss', 'Private_Clean', 'Private_Dirty'):
+                usage[key] = int(value.split()[0])
+    return usage['Pss'], usage['Private_Clean'] + usage['Private_Dirty']
+
+
+def _memory_worker(directory, mmap, barrier, results):
+    """One simulated web worker: load the model, serve a few requests, report memory"""
+    with quiet():
+        predictor = HighAccuracyPredictor.load_model(directory, mmap=mmap)
+        for profile in SAMPLE_PROFILES:
+            predictor.predict_schemes(profile, top_n=500, min_confidence=60)
+    # Measure only once every worker has mapped the files, so shared pages are split N ways
+    barrier.wait()
+    results.put(_proportional_memory_kb())
+    barrier.wait()
+
+
+def bench_memory(args):
+    """Total memory of N worker processes: heap-loaded vs memory-mapped matrices"""
+    with quiet():
+        predictor = HighAccuracyPredictor(args.data)
+    matrix_kb = sum(getattr(getattr(predictor, name), part).nbytes
+                    for name in SCHEME_MATRICES for part in CSR_PARTS) // 1024
+    print(f"Scheme matrices: {matrix_kb:,} KB per copy\n")
+
+    ctx = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as directory:
+        with quiet():
+            predictor.save_model(directory)
+        print(f"{'Workers':>8} | {'Mode':>6} | {'Total PSS':>12} | {'Private/worker':>15}")
+        print("-" * 52)
+        for workers in args.workers:
+            for mmap in (False, True):
+                barrier = ctx.Barrier(workers)
+                results = ctx.Queue()
+                procs = [ctx.Process(target=_memory_worker, args=(directory, mmap, barrier, results))
+                         for _ in range(workers)]
+                for proc in procs:
+                    proc.start()
+                usage = [results.get() for _ in procs]
+                for proc in procs:
+                    proc.join()
+                total_pss = sum(pss for pss, _ in usage)
+                private = sum(priv for _, priv in usage) / workers
+                print(f"{workers:>8} | {'mmap' if mmap else 'heap':>6} | "
+                      f"{total_pss / 1024:>9.1f} MB | {private / 1024:>12.1f} MB")
+
+
+def bench_fused(args):
+    """Per-query scoring latency: three cosine_similarity calls vs one fused mat-vec"""
+    with quiet():
+        predictor = HighAccuracyPredictor(args.data)
+    profiles = [predictor.create_enhanced_profile(p) for p in SAMPLE_PROFILES]
+
+    separate = [predictor.ensemble_scores([p])[0] for p in profiles]
+    separate_time, _ = timed(lambda: [predictor.ensemble_scores([p]) for p in profiles], repeat=args.repeat)
+
+    predictor.build_fused_matrix()
+    fused = [predictor.ensemble_scores([p])[0] for p in profiles]
+    fused_time, _ = timed(lambda: [predictor.ensemble_scores([p]) for p in profiles], repeat=args.repeat)
+
+    max_diff = max(abs(a - b).max() for a, b in zip(separate, fused))
+    same_rank = all((a.argsort() == b.argsort()).all() for a, b in zip(separate, fused))
+    per_query = lambda t: t / len(profiles) * 1000
+    print(f"Three cosine_similarity: {per_query(separate_time):7.2f} ms/query")
+    print(f"Fused mat-vec:           {per_query(fused_time):7.2f} ms/query")
+    print(f"Speed-up:                {separate_time / fused_time:7.2f}x")
+    print(f"Max score difference:    {max_diff:.2e} | Identical ranking: {same_rank}")
+
+
+def bench_batch(args):
+    """Throughput: predict_schemes per profile vs predict_schemes_batch"""
+    with quiet():
+        predictor = HighAccuracyPredictor(args.data, fused=True)
+    profiles = random_profiles(args.profiles)
+
+    with quiet():
+        loop_time, looped = timed(lambda: [predictor.predict_schemes(p, top_n=50, min_confidence=60)
+                                           for p in profiles])
+        batch_time, batched = timed(lambda: predictor.predict_schemes_batch(profiles, top_n=50,
+                                                                            min_confidence=60))
+    print(f"Per-profile loop: {len(profiles) / loop_time:8,.0f} profiles/sec")
+    print(f"Batch API:        {len(profiles) / batch_time:8,.0f} profiles/sec")
+    print(f"Speed-up:         {loop_time / batch_time:8.2f}x | Identical results: {looped == batched}")
+
+
+def bench_top_k(args):
+    """Top-500 selection with a 60% confidence floor: full argsort vs argpartition + threshold"""
+    with quiet():
+        predictor = HighAccuracyPredictor(args.data, fused=True)
+    profiles = random_profiles(args.profiles)
+    scores = predictor.ensemble_scores([predictor.create_enhanced_profile(p) for p in profiles])
+    min_score = min_score_for_confidence(60)
+
+    sort_time, _ = timed(lambda: [row.argsort()[-500:][::-1] for row in scores], repeat=args.repeat)
+    single_time, _ = timed(lambda: [top_k(row, 500, min_score) for row in scores], repeat=args.repeat)
+    matrix_time, _ = timed(lambda: top_k(scores, 500, min_score), repeat=args.repeat)
+    per_row = lambda t: t / len(scores) * 1e6
+    print(f"argsort per row:               {per_row(sort_time):8.1f} µs/profile")
+    print(f"top_k per row (threshold):     {per_row(single_time):8.1f} µs/profile")
+    print(f"top_k row-wise on the matrix:  {per_row(matrix_time):8.1f} µs/profile")
+    kept = sum(len(top_k(row, 500, min_score)) for row in scores) / len(scores)
+    print(f"Candidates kept per profile:   {kept:8.1f} of 500")
+
+
+def bench_profile(args):
+    """Profile vectors: build + clean + tokenize the full text vs cached part counts"""
+    with quiet():
+        predictor = HighAccuracyPredictor(args.data)
+    profiles = random_profiles(args.profiles)
+
+    text_time, by_text = timed(lambda: predictor.transform_profiles(
+        [predictor.create_enhanced_profile(p) for p in profiles]), repeat=args.repeat)
+    cached_time, by_parts = timed(lambda: predictor.encode_profiles(profiles), repeat=args.repeat)
+
+    identical = all((a != b).nnz == 0 for a, b in zip(by_text, by_parts))
+    per_profile = lambda t: t / len(profiles) * 1000
+    print(f"Profile text + transform: {per_profile(text_time):7.3f} ms/profile")
+    print(f"Cached part vectors:      {per_profile(cached_time):7.3f} ms/profile")
+    print(f"Speed-up:                 {text_time / cached_time:7.1f}x | Identical vectors: {identical}")
+
+
+def _replace_loop_clean(text):
+    """Previous advanced_clean: one str.replace pass per abbreviation (reference only)"""
+    if pd.isna(text) or text == '':
+        return ''
+    text = str(text).lower()
+    text = re.sub(r'[^\w\s\-\/]', ' ', text)
+    text = ' '.join(text.split())
+    for abbr, full in ABBREVIATION_EXPANSIONS.items():
+        text = text.replace(abbr, full)
+    return text
+
+
+def bench_clean(args):
+    """Load-time text cleaning: per-row replace loop vs one compiled regex per column"""
+    df = pd.read_csv(args.data)
+    columns = ['eligibility', 'benefits', 'schemeCategory']
+
+    loop_time, old = timed(lambda: [df[c].apply(_replace_loop_clean) for c in columns], repeat=args.repeat)
+    regex_time, new = timed(lambda: [advanced_clean_column(df[c]) for c in columns], repeat=args.repeat)
+
+    print(f"Per-row replace loop:  {loop_time * 1000:8.1f} ms")
+    print(f"Column-wise regex:     {regex_time * 1000:8.1f} ms")
+    print(f"Speed-up:              {loop_time / regex_time:8.1f}x")
+    for column, before, after in zip(columns, old, new):
+        print(f"{column:>15} text: {before.str.len().sum():>12,} -> {after.str.len().sum():>12,} chars")
+
+    # Shorter documents also make the three TF-IDF fits cheaper
+    with quiet():
+        predictor = HighAccuracyPredictor(args.data)
+    vectorizers = [predictor.vectorizer_eligibility, predictor.vectorizer_benefits,
+                   predictor.vectorizer_category]
+    fit = lambda docs: [clone(v).fit_transform(d) for v, d in zip(vectorizers, docs)]
+    old_fit, _ = timed(lambda: fit(old))
+    new_fit, _ = timed(lambda: fit(new))
+    print(f"Clean + fit (old):     {(loop_time + old_fit) * 1000:8.1f} ms")
+    print(f"Clean + fit (new):     {(regex_time + new_fit) * 1000:8.1f} ms")
+
+
+def _load_test(score, profiles, threads):
+    """Closed-loop load: each thread scores its share of profiles back to back"""
+    min_score = min_score_for_confidence(60)
+    latencies = [[] for _ in range(threads)]
+
+    def client(n):
+        for user_data in profiles[n::threads]:
+            start = time.perf_counter()
+            top_k(score(user_data), 500, min_score)
+            latencies[n].append(time.perf_counter() - start)
+
+    clients = [threading.Thread(target=client, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return np.concatenate(latencies) * 1000, len(profiles) / elapsed
+
+
+def bench_coalesce(args):
+    """Concurrent single-profile requests: one score per thread vs the micro-batcher"""
+    with quiet():
+        predictor = HighAccuracyPredictor(args.data, fused=True)
+    profiles = random_profiles(args.profiles)
+    predictor.encode_profiles(profiles)  # warm the part caches so both runs pay the same
+
+    print(f"max_batch={args.max_batch}, max_wait={args.max_wait} ms, {len(profiles)} requests\n")
+    print(f"{'Threads':>7} | {'Mode':<10} | {'p50 ms':>8} | {'p99 ms':>8} | {'req/sec':>8} | {'batch':>5}")
+    for threads in args.workers:
+        rows = [('direct', *_load_test(predictor.score_profile, profiles, threads), 1.0)]
+        batcher = MicroBatcher(predictor.score_profiles, args.max_batch, args.max_wait)
+        latencies, throughput = _load_test(batcher.score, profiles, threads)
+        batcher.close()
+        rows.append(('batched', latencies, throughput, batcher.stats()['mean_batch_size']))
+        for mode, latencies, throughput, batch_size in rows:
+            p50, p99 = np.percentile(latencies, [50, 99])
+            print(f"{threads:>7} | {mode:<10} | {p50:8.2f} | {p99:8.2f} | {throughput:8,.0f} | {batch_size:5.1f}")
+
+
+def bench_templates(args):
+    """Page rendering: render_template_string per request vs precompiled and pre-rendered pages"""
+    from flask import render_template_string
+    with quiet():
+        import app_realdata as web
+        state = web.reloader.current
+        results = web.cached_prediction(state, SAMPLE_PROFILES[1], web.RESULT_TIERS)
+    client = web.app.test_client()
+    catalog_index = state.catalog_index
+    pages = [
+        ('/ (form)', web.MAIN_PAGE_HTML, web.main_page_template,
+         dict(total_schemes=catalog_index.size, user_data=None)),
+        ('/ (results)', web.MAIN_PAGE_HTML, web.main_page_template,
+         dict(results=results, user_data=SAMPLE_PROFILES[1], user_data_json='{}', eligible_count=0,
+              avg_confidence=0, central_count=0, state_count=0, total_schemes=catalog_index.size)),
+        ('/dataset', web.DATASET_PAGE_HTML, web.dataset_page_template,
+         dict(levels=catalog_index.levels(), categories=catalog_index.categories(),
+              total_schemes=catalog_index.size)),
+        ('/insights', web.INSIGHTS_PAGE_HTML, web.insights_page_template,
+         dict(total_schemes=catalog_index.size, central_schemes=0, state_schemes=0)),
+    ]
+    per_call = lambda fn, n=50: timed(lambda: [fn() for _ in range(n)], repeat=args.repeat)[0] / n * 1000
+
+    print(f"{'Page':<13} | {'recompile ms':>12} | {'precompiled ms':>14}")
+    with web.app.test_request_context():
+        for name, source, template, context in pages:
+            recompile = per_call(lambda: render_template_string(source, **context))
+            precompiled = per_call(lambda: web.render_page(template, **context))
+            print(f"{name:<13} | {recompile:12.3f} | {precompiled:14.3f}")
+
+    print(f"\n{'Static page':<13} | {'GET 200 ms':>12} | {'GET 304 ms':>14}")
+    for url in ('/', '/dataset', '/insights'):
+        etag = client.get(url).headers['ETag']
+        full = per_call(lambda: client.get(url))
+        revalidated = per_call(lambda: client.get(url, headers={'If-None-Match': etag}))
+        print(f"{url:<13} | {full:12.3f} | {revalidated:14.3f}")
+
+
+def bench_parallel(args):
+    """
+    Offline ranking throughput: in-process vs a pool of memory-mapped workers
+
+    Profiles are fed in 10,000-profile chunks, cycling through 20 pre-generated
+    ones, and results are dropped as they come back, so a 1M-profile run stays
+    within a few hundred MB.
+    """
+    chunk_size = 10000
+    pool = [random_profiles(chunk_size, seed=seed) for seed in range(min(20, -(-args.profiles // chunk_size)))]
+
+    def chunks():
+        for n, start in enumerate(range(0, args.profiles, chunk_size)):
+            yield pool[n % len(pool)][:args.profiles - start]
+
+    with tempfile.TemporaryDirectory() as directory:
+        with quiet():
+            HighAccuracyPredictor(args.data, fused=True).save_model(directory)
+            predictor = HighAccuracyPredictor.load_model(directory, mmap=True, fused=True)
+        single, _ = timed(lambda: [predictor.rank_schemes_batch(chunk, 10) for chunk in chunks()], repeat=1)
+        print(f"{args.profiles:,} profiles, top 10, {multiprocessing.cpu_count()} CPUs\n")
+        print(f"{'Workers':>7} | {'start s':>7} | {'profiles/sec':>12} | {'speed-up':>8}")
+        print(f"{'-':>7} | {'-':>7} | {args.profiles / single:12,.0f} | {1.0:8.2f}")
+        for workers in args.workers:
+            start = time.perf_counter()
+            with ParallelScorer(directory, max_workers=workers) as scorer:
+                list(scorer.rank_chunks([SAMPLE_PROFILES] * workers))  # let the workers load the model
+                started = time.perf_counter() - start
+                elapsed, _ = timed(lambda: sum(1 for _ in scorer.rank_chunks(chunks(), 10)), repeat=1)
+            print(f"{workers:>7} | {started:7.1f} | {args.profiles / elapsed:12,.0f} | {single / elapsed:8.2f}")
+
+
+def bench_update(args):
+    """Catalogue changes: full refit from the CSV vs update_schemes on the changed rows"""
+    with quiet():
+        fit_time, predictor = timed(lambda: HighAccuracyPredictor(args.data, fused=True))
+    print(f"Full fit from CSV:     {fit_time * 1000:8.1f} ms")
+
+    raw = pd.read_csv(args.data)
+    for changes in (1, 10, 100):
+        sample = raw.sample(2 * changes, random_state=changes)
+        upserts = sample.copy()
+        # Half the rows are edits of existing schemes, half are new schemes
+        upserts.loc[upserts.index[changes:], 'slug'] = [f'new-scheme-{n}' for n in range(changes)]
+        upserts['eligibility'] = upserts['eligibility'] + ' Updated for senior citizens.'
+        with quiet():
+            update_time, _ = timed(lambda: predictor.update_schemes(upserts), repeat=args.repeat)
+        print(f"Update {2 * changes:>3} schemes:     {update_time * 1000:8.1f} ms")
+
+    with quiet():
+        refit_time, _ = timed(predictor.refit)
+    print(f"Refit (in memory):     {refit_time * 1000:8.1f} ms")
+
+
+def synthetic_catalogue(source, rows, path):
+    """
+    Write a catalogue of rows real schemes, resampled, with unique slugs and texts
+    
+    pandas shares identical strings within a read, and a vocabulary shares repeated
+    n-grams, either of which would flatter repeated rows.
+    """
+    catalogue = source.sample(rows, replace=rows > len(source), random_state=rows)
+    suffix = pd.Series([f' Ref {n}.' for n in range(rows)], index=catalogue.index)
+    catalogue['slug'] = [f'scheme-{n}' for n in range(rows)]
+    for col in ('details', 'benefits', 'eligibility', 'application', 'documents'):
+        catalogue[col] = catalogue[col].fillna('') + suffix
+    catalogue.to_csv(path, index=False)
+
+
+def _ingest_worker(path, chunksize, results):
+    """Load one catalogue the way HighAccuracyPredictor does before fitting; report its cost"""
+    # tracemalloc counts live Python and NumPy allocations, which freed-but-unreturned
+    # heap pages would hide in RSS
+    tracemalloc.start()
+    start = time.perf_counter()
+    if chunksize:
+        df, _, _ = read_scheme_chunks(path, chunksize)
+    else:
+        df = prepare_scheme_rows(pd.read_csv(path))
+        boost_masks(df['eligibility'])
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    results.put((elapsed, peak, retained))
+
+
+def bench_ingest(args):
+    """Catalogue ingestion memory: whole-file read vs chunked, dtype-optimized read"""
+    source = pd.read_csv(args.data)
+    ctx = multiprocessing.get_context('spawn')
+    print(f"{'Rows':>8} | {'Mode':<13} | {'Time s':>7} | {'Peak MB':>8} | {'Retained MB':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            path = f'{directory}/catalogue_{rows}.csv'
+            synthetic_catalogue(source, rows, path)
+            for mode, chunksize in (('whole file', None), ('chunks of 10k', 10000)):
+                results = ctx.Queue()
+                proc = ctx.Process(target=_ingest_worker, args=(path, chunksize, results))
+                proc.start()
+                elapsed, peak, retained = results.get()
+                proc.join()
+                print(f"{rows:>8,} | {mode:<13} | {elapsed:7.1f} | {peak / 1e6:8.0f} | {retained / 1e6:11.0f}")
+
+
+def _fit_worker(path, engine, results):
+    """Fit one engine's vectorizers on a chunk-loaded catalogue; report the fit's cost"""
+    with quiet():
+        predictor = HighAccuracyPredictor(path, build=False, chunksize=10000, engine=engine)
+        predictor.schemes_df, _, _ = read_scheme_chunks(path, predictor.chunksize)
+        tracemalloc.start()
+        start = time.perf_counter()
+        predictor.fit_vectorizers()
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    nnz = sum(getattr(predictor, name).nnz for name in SCHEME_MATRICES[:3])
+    results.put((elapsed, peak, retained, nnz))
+
+
+def bench_hashing(args):
+    """Hashing engine vs TF-IDF: vectorizer fit cost by catalogue size, and ranking agreement"""
+    with quiet():
+        tfidf = HighAccuracyPredictor(args.data, fused=True)
+        hashing = HighAccuracyPredictor(args.data, fused=True, engine='hashing')
+    profiles = random_profiles(args.profiles)
+    reference, scores = tfidf.score_profiles(profiles), hashing.score_profiles(profiles)
+    print(f"Ranking agreement on {args.data} ({args.profiles} profiles, hashing vs TF-IDF):")
+    for k in (1, 10, 50):
+        expected = np.argsort(-reference, axis=1)[:, :k]
+        found = np.argsort(-scores, axis=1)[:, :k]
+        overlap = np.mean([len(set(a) & set(b)) / k for a, b in zip(expected, found)])
+        print(f"  top-{k:<3} overlap: {overlap:6.1%}")
+    print(f"  median |score difference|: {np.median(np.abs(reference - scores)):.4f}\n")
+
+    source = pd.read_csv(args.data)
+    ctx = multiprocessing.get_context('spawn')
+    print(f"{'Rows':>8} | {'Engine':<7} | {'Fit s':>6} | {'Peak MB':>8} | {'Retained MB':>11} | {'Matrix nnz':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            path = f'{directory}/catalogue_{rows}.csv'
+            synthetic_catalogue(source, rows, path)
+            for engine in ('tfidf', 'hashing'):
+                results = ctx.Queue()
+                proc = ctx.Process(target=_fit_worker, args=(path, engine, results))
+                proc.start()
+                elapsed, peak, retained, nnz = results.get()
+                proc.join()
+                print(f"{rows:>8,} | {engine:<7} | {elapsed:6.1f} | {peak / 1e6:8.0f} | "
+                      f"{retained / 1e6:11.0f} | {nnz:11,}")
+
+
+def bench_results(args):
+    """Result assembly: build_results for 15-500 hits, and batch throughput with it"""
+    with quiet():
+        predictor = HighAccuracyPredictor(args.data, fused=True)
+    scores = predictor.score_profile(SAMPLE_PROFILES[0])
+    print(f"{'Hits':>5} | {'build_results ms':>16} | {'us/hit':>7}")
+    for hits in (15, 100, 500):
+        indices = top_k(scores, hits)
+        elapsed, _ = timed(lambda: predictor.build_results(indices, scores[indices]), repeat=args.repeat)
+        print(f"{hits:>5} | {elapsed * 1000:16.2f} | {elapsed / hits * 1e6:7.1f}")
+
+    profiles = random_profiles(args.profiles)
+    for top_n in (15, 100):
+        with quiet():
+            elapsed, _ = timed(lambda: predictor.predict_schemes_batch(profiles, top_n), repeat=1)
+        print(f"predict_schemes_batch, top {top_n:<3}: {len(profiles) / elapsed:8,.0f} profiles/sec")
+
+
+BENCHMARKS = {
+    'cold-start': bench_cold_start,
+    'memory': bench_memory,
+    'fused': bench_fused,
+    'batch': bench_batch,
+    'top-k': bench_top_k,
+    'profile': bench_profile,
+    'clean': bench_clean,
+    'coalesce': bench_coalesce,
+    'templates': bench_templates,
+    'parallel': bench_parallel,
+    'update': bench_update,
+    'ingest': bench_ingest,
+    'hashing': bench_hashing,
+    'results': bench_results,
+}
+
+# Defaults that differ by benchmark (parallel targets large offline batches on 8 cores)
+PROFILE_DEFAULTS = {'parallel': 1000000}
+WORKER_DEFAULTS = {'parallel': [1, 2, 4, 8]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--data', default='updated_data.csv', help='Scheme dataset CSV')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions per timing (best is reported)')
+    parser.add_argument('--workers', type=int, nargs='+', default=None,
+                        help='Worker process counts (memory, parallel) or client threads (coalesce); '
+                             'default 1 2 4 8 for parallel, 1 4 16 otherwise')
+    parser.add_argument('--profiles', type=int, default=None,
+                        help='Synthetic profiles to score (default 1,000,000 for parallel, 1,000 otherwise)')
+    parser.add_argument('--rows', type=int, nargs='+', default=[3400, 50000, 200000],
+                        help='Synthetic catalogue sizes (ingest, hashing)')
+    parser.add_argument('--max-batch', type=int, default=32, help='Micro-batch size cap (coalesce)')
+    parser.add_argument('--max-wait', type=float, default=2.0, help='Micro-batch wait in ms (coalesce)')
+    args = parser.parse_args()
+    if args.profiles is None:
+        args.profiles = PROFILE_DEFAULTS.get(args.benchmark, 1000)
+    if args.workers is None:
+        args.workers = WORKER_DEFAULTS.get(args.benchmark, [1, 4, 16])
+
+    print("\n" + "="*70)
+    print(f"BENCHMARK: {args.benchmark}")
+    print("="*70 + "\n")
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == '__main__':
+    main()
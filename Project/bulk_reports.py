@@ -0,0 +1,214 @@
+"""
+Bulk Eligibility Reports
+Score a whole beneficiary list in batches and render one report per profile in parallel
+
+Run with: python bulk_reports.py profiles.csv --output reports/ [--format pdf|txt]
+          python bulk_reports.py profiles.jsonl --output reports.zip
+
+Reports are written atomically, so an interrupted run can be restarted with the
+same arguments and skips every report that is already finished.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import time
+import zipfile
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from high_accuracy_model import HighAccuracyPredictor
+from profile_io import PARQUET_AVAILABLE, iter_profile_chunks, safe_filename
+from reports import PDF_AVAILABLE, iter_text_report, write_pdf_report
+
+
+def render_report(task):
+    """Write one report file (runs in a worker process); returns its file name"""
+    name, user_data, results, report_format, directory = task
+    path = os.path.join(directory, name)
+    # Written under a temporary name first, so a finished file is always complete
+    partial = path + '.part'
+    if report_format == 'pdf':
+        with open(partial, 'wb') as f:
+            write_pdf_report(user_data, results, f)
+    else:
+        with open(partial, 'w', encoding='utf-8') as f:
+            f.writelines(iter_text_report(user_data, results))
+    os.replace(partial, path)
+    return name
+
+
+def claim_report_name(pid, extension, claimed):
+    """
+    File name for pid's report, unique within this run
+
+    Ids that repeat or only differ in characters safe_filename() replaces (or in
+    case) get -2, -3, ... suffixes in input order, so reruns of the same input
+    pick the same names again and can resume.
+    """
+    stem = safe_filename(pid)
+    name, suffix = f'{stem}.{extension}', 1
+    while name.lower() in claimed:
+        suffix += 1
+        name = f'{stem}-{suffix}.{extension}'
+    claimed.add(name.lower())
+    return name, suffix > 1
+
+
+def finished_reports(directory, zip_path=None):
+    """Names of the reports from earlier runs; unfinished .part files are removed"""
+    done = set()
+    for name in os.listdir(directory):
+        if name.endswith('.part'):
+            os.remove(os.path.join(directory, name))
+        else:
+            done.add(name)
+    if zip_path and os.path.exists(zip_path):
+        with zipfile.ZipFile(zip_path) as archive:
+            done.update(archive.namelist())
+    return done
+
+
+def pack_zip(directory, zip_path):
+    """Add the rendered reports to zip_path (appending on a resumed run), then drop the directory"""
+    names = sorted(os.listdir(directory))
+    mode = 'a' if os.path.exists(zip_path) else 'w'
+    with zipfile.ZipFile(zip_path, mode, compression=zipfile.ZIP_DEFLATED) as archive:
+        existing = set(archive.namelist())
+        for name in names:
+            if name not in existing:
+                archive.write(os.path.join(directory, name), name)
+    shutil.rmtree(directory)
+    return len(names)
+
+
+def export_reports(profile_path, output, report_format='pdf', workers=None, chunk_size=500,
+                   data_path='updated_data.csv', models_dir='models/', top_n=500, min_confidence=60):
+    """
+    Render a report for every valid profile in profile_path
+
+    Args:
+        profile_path: .csv or .jsonl file of profiles (optional profile_id/id column)
+        output: Output directory, or a .zip file
+        report_format: 'pdf' or 'txt'
+        workers: Rendering processes (default: one per CPU)
+        chunk_size: Profiles scored per batch
+        top_n, min_confidence: Schemes included per report (as in /download_pdf)
+
+    Returns:
+        Dictionary of counts and timings
+    """
+    as_zip = output.endswith('.zip')
+    directory = output[:-len('.zip')] + '.parts' if as_zip else output
+    os.makedirs(directory, exist_ok=True)
+    done = finished_reports(directory, output if as_zip else None)
+    extension = 'pdf' if report_format == 'pdf' else 'txt'
+
+    predictor = HighAccuracyPredictor.from_artifacts(data_path, models_dir, mmap=True, fused=True)
+    workers = workers or os.cpu_count()
+    print(f"\n📄 Rendering {report_format.upper()} reports with {workers} workers into {output}")
+    if done:
+        print(f"↻ Resuming: {len(done):,} reports already finished")
+
+    stats = {'profiles': 0, 'skipped': 0, 'invalid': 0, 'renamed': 0, 'rendered': 0, 'score_seconds': 0.0}
+    # Lower-cased names given out in this run; done only holds those of earlier runs
+    claimed = set()
+    start = time.perf_counter()
+    pending = set()
+
+    def collect(return_when):
+        nonlocal pending
+        finished, pending = wait(pending, return_when=return_when)
+        for future in finished:
+            future.result()
+            stats['rendered'] += 1
+        elapsed = time.perf_counter() - start
+        sys.stdout.write(f"\r   {stats['rendered']:,} rendered | {stats['skipped']:,} skipped | "
+                         f"{stats['rendered'] / max(elapsed, 1e-9):,.1f} reports/sec")
+        sys.stdout.flush()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            for ids, profiles, errors in iter_profile_chunks(profile_path, chunk_size):
+                stats['profiles'] += len(ids) + len(errors)
+                stats['invalid'] += len(errors)
+                for pid, message in errors:
+                    print(f"\n⚠️ Skipping profile {pid}: {message}")
+
+                names = []
+                for pid in ids:
+                    name, renamed = claim_report_name(pid, extension, claimed)
+                    if renamed:
+                        stats['renamed'] += 1
+                        print(f"\n⚠️ Duplicate profile id {pid}: writing its report as {name}")
+                    names.append(name)
+                todo = [i for i, name in enumerate(names) if name not in done]
+                stats['skipped'] += len(names) - len(todo)
+                if not todo:
+                    continue
+
+                score_start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results = predictor.predict_schemes_batch([profiles[i] for i in todo],
+                                                              top_n=top_n, min_confidence=min_confidence)
+                stats['score_seconds'] += time.perf_counter() - score_start
+
+                for i, report_results in zip(todo, results):
+                    pending.add(pool.submit(render_report, (names[i], profiles[i], report_results,
+                                                            report_format, directory)))
+                    # Bound the queued work (and the results held for it)
+                    if len(pending) >= workers * 8:
+                        collect(FIRST_COMPLETED)
+            collect(ALL_COMPLETED)
+        except KeyboardInterrupt:
+            pool.shutdown(wait=True, cancel_futures=True)
+            print(f"\n⏸️ Interrupted after {stats['rendered']:,} reports; rerun the same command to resume")
+            raise
+
+    stats['seconds'] = time.perf_counter() - start
+    if as_zip:
+        packed = pack_zip(directory, output)
+        print(f"\n✓ Packed {packed:,} reports into {output}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('profiles', help='Profiles as .csv or .jsonl')
+    parser.add_argument('--output', default='reports/', help='Output directory, or a .zip file')
+    parser.add_argument('--format', choices=['pdf', 'txt'], default='pdf' if PDF_AVAILABLE else 'txt')
+    parser.add_argument('--workers', type=int, default=None, help='Rendering processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Profiles scored per batch')
+    parser.add_argument('--data', default='updated_data.csv', help='Scheme dataset CSV')
+    parser.add_argument('--models', default='models/', help='Saved model directory')
+    args = parser.parse_args()
+
+    if args.format == 'pdf' and not PDF_AVAILABLE:
+        parser.error("PDF reports need reportlab (pip install reportlab); use --format txt")
+    if args.profiles.endswith('.parquet') and not PARQUET_AVAILABLE:
+        parser.error("Parquet files need pyarrow (pip install pyarrow); use .csv or .jsonl instead")
+
+    print("\n" + "="*70)
+    print("BULK ELIGIBILITY REPORTS")
+    print("="*70)
+    try:
+        stats = export_reports(args.profiles, args.output, args.format, args.workers, args.chunk_size,
+                               args.data, args.models)
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+    print("\n" + "="*70)
+    print(f"✅ {stats['rendered']:,} reports rendered in {stats['seconds']:.1f}s "
+          f"({stats['rendered'] / max(stats['seconds'], 1e-9):,.1f} reports/sec)")
+    print(f"   Profiles read: {stats['profiles']:,} | already done: {stats['skipped']:,} | "
+          f"invalid: {stats['invalid']:,} | duplicate ids renamed: {stats['renamed']:,}")
+    scored = stats['profiles'] - stats['skipped'] - stats['invalid']
+    print(f"   Scoring: {stats['score_seconds']:.2f}s "
+          f"({scored / max(stats['score_seconds'], 1e-9):,.0f} profiles/sec)")
+    print("="*70 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Dataset Statistics
+Aggregates for the insights page and the plot generator, computed once per dataset version
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from high_accuracy_model import compute_data_hash
+
+
+STATS_VERSION = 1
+STATS_FILE = 'dataset_stats.json'
+TEXT_FIELDS = ('details', 'eligibility', 'benefits')
+HISTOGRAM_BINS = 50
+PERCENTILES = (25, 50, 75, 90, 99)
+
+# Stats already loaded in this process, by dataset hash
+_loaded = {}
+_lock = threading.Lock()
+
+
+def length_summary(lengths):
+    """Mean, min, max, percentiles and a histogram of text lengths (characters)"""
+    counts, edges = np.histogram(lengths, bins=HISTOGRAM_BINS)
+    summary = {
+        'mean': float(lengths.mean()),
+        'min': int(lengths.min()),
+        'max': int(lengths.max()),
+        'histogram': {'counts': counts.tolist(), 'edges': edges.tolist()},
+    }
+    for q, value in zip(PERCENTILES, np.percentile(lengths, PERCENTILES)):
+        summary[f'p{q}'] = float(value)
+    return summary
+
+
+def compute_dataset_stats(data_path):
+    """
+    Aggregate the scheme CSV in one pass over the columns that are needed
+
+    Rows without a scheme name or eligibility text are left out, as the predictor drops them.
+    """
+    df = pd.read_csv(data_path, usecols=['scheme_name', 'level', 'schemeCategory', *TEXT_FIELDS])
+    df = df.dropna(subset=['scheme_name', 'eligibility'])
+
+    level_counts = df['level'].fillna('').value_counts()
+    category_counts = df['schemeCategory'].fillna('').value_counts()
+    return {
+        'stats_version': STATS_VERSION,
+        'total_schemes': len(df),
+        'level_counts': {level: int(count) for level, count in level_counts.items()},
+        'category_counts': {category: int(count) for category, count in category_counts.items()},
+        'text_lengths': {field: length_summary(df[field].fillna('').astype(str).str.len().to_numpy())
+                         for field in TEXT_FIELDS},
+    }
+
+
+def read_cache(path):
+    """The cached stats in path, or {} if there are none or the file is unreadable"""
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        # Missing, or truncated by a writer that died: recompute
+        return {}
+    return cached if isinstance(cached, dict) else {}
+
+
+def write_cache(path, stats):
+    """Write the stats JSON to a private temporary file and rename it into place"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, partial = tempfile.mkstemp(dir=directory, prefix=f'.{STATS_FILE}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(stats, f, indent=2)
+        os.replace(partial, path)
+    except BaseException:
+        os.unlink(partial)
+        raise
+
+
+def dataset_stats(data_path='updated_data.csv', directory='models/', data_hash=None):
+    """
+    Statistics of data_path, recomputed only when the CSV has changed
+
+    Results are kept in memory and in directory/dataset_stats.json, both keyed on
+    the file's SHA-256, so a reloaded or edited dataset gets fresh numbers.
+
+    Args:
+        data_path: Scheme dataset CSV
+        directory: Where the JSON cache lives (shared with the model artifacts)
+        data_hash: SHA-256 of data_path if already known, e.g. predictor.data_hash
+    """
+    data_hash = data_hash or compute_data_hash(data_path)
+    with _lock:
+        if data_hash in _loaded:
+            return _loaded[data_hash]
+
+        path = os.path.join(directory, STATS_FILE)
+        stats = None
+        cached = read_cache(path)
+        if cached.get('source_sha256') == data_hash and cached.get('stats_version') == STATS_VERSION:
+            stats = cached
+
+        if stats is None:
+            print(f"📊 Computing dataset statistics for {data_path}...")
+            stats = compute_dataset_stats(data_path)
+            stats['source_sha256'] = data_hash
+            write_cache(path, stats)
+
+        _loaded.clear()
+        _loaded[data_hash] = stats
+        return stats
@@ -9,6 +9,7 @@ import seaborn as sns
 import numpy as np
 from pathlib import Path
 import warnings
+from dataset_stats import dataset_stats
 warnings.filterwarnings('ignore')
 
 # Set style
@@ -23,15 +24,18 @@ print("\n" + "="*70)
 print("GENERATING DATA VISUALIZATIONS FOR REAL DATASET")
 print("="*70 + "\n")
 
-# Load the real dataset
-print("📊 Loading dataset...")
-df = pd.read_csv('updated_data.csv')
-print(f"✓ Loaded {len(df)} schemes\n")
+# Load the dataset aggregates (computed once per CSV version, shared with the web app)
+print("📊 Loading dataset statistics...")
+stats = dataset_stats('updated_data.csv', 'models/')
+total_schemes = stats['total_schemes']
+level_counts = pd.Series(stats['level_counts'])
+category_counts_all = pd.Series(stats['category_counts'])
+text_lengths = stats['text_lengths']
+print(f"✓ Loaded statistics for {total_schemes} schemes\n")
 
 # 1. SCHEME LEVEL DISTRIBUTION
 print("1. Creating Scheme Level Distribution (Central vs State)...")
 plt.figure(figsize=(10, 6))
-level_counts = df['level'].value_counts()
 colors = ['#667eea', '#764ba2']
 bars = plt.bar(level_counts.index, level_counts.values, color=colors, alpha=0.8, edgecolor='black')
 plt.title('Government Schemes by Level', fontsize=16, fontweight='bold', pad=20)
@@ -43,7 +47,7 @@ plt.grid(axis='y', alpha=0.3)
 for bar in bars:
     height = bar.get_height()
     plt.text(bar.get_x() + bar.get_width()/2., height,
-             f'{int(height)}\n({height/len(df)*100:.1f}%)',
+             f'{int(height)}\n({height/total_schemes*100:.1f}%)',
              ha='center', va='bottom', fontsize=11, fontweight='bold')
 
 plt.tight_layout()
@@ -54,7 +58,7 @@ print("   ✓ Saved: scheme_level_distribution.png")
 # 2. TOP SCHEME CATEGORIES
 print("2. Creating Top Scheme Categories...")
 plt.figure(figsize=(14, 8))
-category_counts = df['schemeCategory'].value_counts().head(15)
+category_counts = category_counts_all.head(15)
 colors_grad = plt.cm.viridis(np.linspace(0.3, 0.9, len(category_counts)))
 bars = plt.barh(range(len(category_counts)), category_counts.values, color=colors_grad, edgecolor='black')
 plt.yticks(range(len(category_counts)), category_counts.index, fontsize=10)
@@ -74,8 +78,8 @@ print("   ✓ Saved: top_categories.png")
 # 3. SCHEME CATEGORY PIE CHART (Top 10)
 print("3. Creating Category Distribution Pie Chart...")
 plt.figure(figsize=(12, 8))
-top_10_categories = df['schemeCategory'].value_counts().head(10)
-other_count = df['schemeCategory'].value_counts()[10:].sum()
+top_10_categories = category_counts_all.head(10).copy()
+other_count = category_counts_all[10:].sum()
 top_10_categories['Others'] = other_count
 
 colors = plt.cm.Set3(range(len(top_10_categories)))
@@ -105,42 +109,27 @@ plt.close()
 print("   ✓ Saved: category_pie_chart.png")
 
 # 4. SCHEME TEXT LENGTH ANALYSIS
-print("4. Creating Scheme Text Length Analysis...")
-df['details_length'] = df['details'].astype(str).str.len()
-df['eligibility_length'] = df['eligibility'].astype(str).str.len()
-df['benefits_length'] = df['benefits'].astype(str).str.len()
+def plot_length_histogram(ax, field, color):
+    """Histogram from the precomputed bin counts, with the median marked"""
+    lengths = text_lengths[field]
+    edges = lengths['histogram']['edges']
+    ax.hist(edges[:-1], bins=edges, weights=lengths['histogram']['counts'],
+            color=color, alpha=0.7, edgecolor='black')
+    ax.set_xlabel('Character Count', fontsize=11)
+    ax.set_ylabel('Number of Schemes', fontsize=11)
+    ax.set_title(f'{field.title()} Text Length', fontsize=13, fontweight='bold')
+    ax.axvline(lengths['p50'], color='red', linestyle='--',
+               linewidth=2, label=f"Median: {lengths['p50']:.0f}")
+    ax.legend()
+    ax.grid(alpha=0.3)
+
 
+print("4. Creating Scheme Text Length Analysis...")
 fig, axes = plt.subplots(1, 3, figsize=(16, 5))
 
-# Details length
-axes[0].hist(df['details_length'], bins=50, color='#667eea', alpha=0.7, edgecolor='black')
-axes[0].set_xlabel('Character Count', fontsize=11)
-axes[0].set_ylabel('Number of Schemes', fontsize=11)
-axes[0].set_title('Details Text Length', fontsize=13, fontweight='bold')
-axes[0].axvline(df['details_length'].median(), color='red', linestyle='--', 
-                linewidth=2, label=f'Median: {df["details_length"].median():.0f}')
-axes[0].legend()
-axes[0].grid(alpha=0.3)
-
-# Eligibility length
-axes[1].hist(df['eligibility_length'], bins=50, color='#764ba2', alpha=0.7, edgecolor='black')
-axes[1].set_xlabel('Character Count', fontsize=11)
-axes[1].set_ylabel('Number of Schemes', fontsize=11)
-axes[1].set_title('Eligibility Text Length', fontsize=13, fontweight='bold')
-axes[1].axvline(df['eligibility_length'].median(), color='red', linestyle='--',
-                linewidth=2, label=f'Median: {df["eligibility_length"].median():.0f}')
-axes[1].legend()
-axes[1].grid(alpha=0.3)
-
-# Benefits length
-axes[2].hist(df['benefits_length'], bins=50, color='#f093fb', alpha=0.7, edgecolor='black')
-axes[2].set_xlabel('Character Count', fontsize=11)
-axes[2].set_ylabel('Number of Schemes', fontsize=11)
-axes[2].set_title('Benefits Text Length', fontsize=13, fontweight='bold')
-axes[2].axvline(df['benefits_length'].median(), color='red', linestyle='--',
-                linewidth=2, label=f'Median: {df["benefits_length"].median():.0f}')
-axes[2].legend()
-axes[2].grid(alpha=0.3)
+plot_length_histogram(axes[0], 'details', '#667eea')
+plot_length_histogram(axes[1], 'eligibility', '#764ba2')
+plot_length_histogram(axes[2], 'benefits', '#f093fb')
 
 plt.suptitle('Text Content Analysis', fontsize=16, fontweight='bold', y=1.02)
 plt.tight_layout()
@@ -159,7 +148,7 @@ fig.suptitle('Government Schemes Dataset - Complete Overview',
 
 # 1. Total schemes metric
 ax1 = fig.add_subplot(gs[0, 0])
-ax1.text(0.5, 0.5, str(len(df)), ha='center', va='center', 
+ax1.text(0.5, 0.5, str(total_schemes), ha='center', va='center', 
          fontsize=60, fontweight='bold', color='#667eea')
 ax1.text(0.5, 0.2, 'Total Schemes', ha='center', va='center',
          fontsize=14, color='gray')
@@ -168,7 +157,7 @@ ax1.set_facecolor('#f8f9ff')
 
 # 2. Central schemes
 ax2 = fig.add_subplot(gs[0, 1])
-central_count = len(df[df['level'] == 'Central'])
+central_count = stats['level_counts'].get('Central', 0)
 ax2.text(0.5, 0.5, str(central_count), ha='center', va='center',
          fontsize=60, fontweight='bold', color='#764ba2')
 ax2.text(0.5, 0.2, 'Central Schemes', ha='center', va='center',
@@ -178,7 +167,7 @@ ax2.set_facecolor('#fef3ff')
 
 # 3. State schemes
 ax3 = fig.add_subplot(gs[0, 2])
-state_count = len(df[df['level'] == 'State'])
+state_count = stats['level_counts'].get('State', 0)
 ax3.text(0.5, 0.5, str(state_count), ha='center', va='center',
          fontsize=60, fontweight='bold', color='#f093fb')
 ax3.text(0.5, 0.2, 'State Schemes', ha='center', va='center',
@@ -188,7 +177,6 @@ ax3.set_facecolor('#fff3f8')
 
 # 4. Level distribution (pie)
 ax4 = fig.add_subplot(gs[1, :2])
-level_counts = df['level'].value_counts()
 colors = ['#667eea', '#764ba2']
 wedges, texts, autotexts = ax4.pie(level_counts.values, labels=level_counts.index,
                                      autopct='%1.1f%%', startangle=90, colors=colors)
@@ -200,7 +188,7 @@ ax4.set_title('Central vs State Distribution', fontsize=13, fontweight='bold', p
 
 # 5. Top 5 categories
 ax5 = fig.add_subplot(gs[1, 2])
-top_5 = df['schemeCategory'].value_counts().head(5)
+top_5 = category_counts_all.head(5)
 ax5.barh(range(len(top_5)), top_5.values, color=plt.cm.viridis(np.linspace(0.3, 0.9, 5)))
 ax5.set_yticks(range(len(top_5)))
 ax5.set_yticklabels([cat[:20] + '...' if len(cat) > 20 else cat for cat in top_5.index],
@@ -212,15 +200,10 @@ ax5.grid(axis='x', alpha=0.3)
 # 6. Text statistics table
 ax6 = fig.add_subplot(gs[2, :])
 stats_data = [
-    ['Details', f'{df["details_length"].mean():.0f}', 
-     f'{df["details_length"].median():.0f}', 
-     f'{df["details_length"].max():.0f}'],
-    ['Eligibility', f'{df["eligibility_length"].mean():.0f}',
-     f'{df["eligibility_length"].median():.0f}',
-     f'{df["eligibility_length"].max():.0f}'],
-    ['Benefits', f'{df["benefits_length"].mean():.0f}',
-     f'{df["benefits_length"].median():.0f}',
-     f'{df["benefits_length"].max():.0f}']
+    [field.title(), f"{text_lengths[field]['mean']:.0f}",
+     f"{text_lengths[field]['p50']:.0f}",
+     f"{text_lengths[field]['max']:.0f}"]
+    for field in ('details', 'eligibility', 'benefits')
 ]
 
 table = ax6.table(cellText=stats_data,
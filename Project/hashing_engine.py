@@ -0,0 +1,208 @@
+"""
+Hashing TF-IDF Engine
+Out-of-core alternative to TfidfVectorizer: hashed n-gram features with streamed IDF statistics
+
+TfidfVectorizer collects every distinct n-gram of the corpus in a Python dict before
+max_features prunes it, which for 4-grams over a large catalogue takes far more memory
+than the text itself. HashingTfidfIndex maps n-grams to a fixed number of hashed columns
+instead, so its whole state is two count arrays of n_features entries, updated chunk by
+chunk with partial_fit (and forget, for documents that are removed again).
+"""
+
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+
+
+class HashedVocabulary:
+    """
+    Read-only vocabulary_ view of a HashingTfidfIndex
+
+    Maps a term to the output column of its hashed column, if that column is kept,
+    like the term -> column dict of a fitted TfidfVectorizer, so ProfileEncoder and
+    token_counts work unchanged.
+    """
+
+    def __init__(self, index, cache_size=65536):
+        self.index = index
+        self.columns = index.columns_
+        self.column = lru_cache(maxsize=cache_size)(self._column)
+
+    def _column(self, term):
+        # Same hashed column as HashingVectorizer (signed murmurhash3, seed 0)
+        hashed = abs(murmurhash3_32(term, seed=0)) % self.index.n_features
+        position = np.searchsorted(self.columns, hashed)
+        if position < len(self.columns) and self.columns[position] == hashed:
+            return int(position)
+        return None
+
+    def get(self, term, default=None):
+        column = self.column(term)
+        return default if column is None else column
+
+    def __contains__(self, term):
+        return self.get(term) is not None
+
+    def __len__(self):
+        return len(self.columns)
+
+
+class HashingTfidfIndex:
+    """
+    TF-IDF weighting over hashed n-grams, with IDF statistics accumulated in chunks
+
+    Used in place of the TfidfVectorizers of HighAccuracyPredictor: transform()
+    weights text the same way (sublinear tf, smoothed idf, L2 norm), and max_df and
+    max_features select columns as TfidfVectorizer selects terms. No vocabulary is
+    built; n-grams that hash to the same column share it.
+
+    Output rows have one column per kept hashed column (columns_, in hash order),
+    so the scheme matrices stay as narrow as with a fitted vocabulary.
+
+    Once chosen, columns_ and idf_ stay fixed while partial_fit and forget update
+    the statistics, so rows weighted earlier stay comparable with new ones.
+    reweight() applies the new statistics; every output row must be weighted again
+    after it.
+    """
+
+    use_idf = True
+    norm = 'l2'
+
+    def __init__(self, n_features=2 ** 20, ngram_range=(1, 1), stop_words=None, sublinear_tf=True,
+                 max_df=1.0, max_features=None):
+        """
+        Args:
+            n_features: Fixed number of hashed columns
+            ngram_range, stop_words, sublinear_tf: As for TfidfVectorizer
+            max_df: Ignore columns found in more than this share of documents
+            max_features: Keep only this many columns, by total term count (None = all)
+        """
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.sublinear_tf = sublinear_tf
+        self.max_df = max_df
+        self.max_features = max_features
+        self.hasher = HashingVectorizer(n_features=n_features, ngram_range=ngram_range,
+                                        stop_words=stop_words, alternate_sign=False, norm=None)
+        self.doc_freq = np.zeros(n_features, dtype=np.int32)
+        self.term_freq = np.zeros(n_features, dtype=np.float32)
+        self.n_docs = 0
+        self._columns = self._idf = None
+
+    def __getstate__(self):
+        # Pickle only the non-zero counts. Kept columns and IDF are stored as they are,
+        # since the counts may have moved on since they were chosen.
+        state = self.__dict__.copy()
+        seen = np.flatnonzero(self.doc_freq)
+        state['doc_freq'] = (seen, self.doc_freq[seen])
+        state['term_freq'] = self.term_freq[seen]
+        return state
+
+    def __setstate__(self, state):
+        seen, doc_freq = state['doc_freq']
+        state['doc_freq'] = np.zeros(state['n_features'], dtype=np.int32)
+        state['doc_freq'][seen] = doc_freq
+        term_freq, state['term_freq'] = state['term_freq'], np.zeros(state['n_features'], dtype=np.float32)
+        state['term_freq'][seen] = term_freq
+        self.__dict__.update(state)
+
+    # Tokenization hooks, as on TfidfVectorizer (used by ProfileEncoder and token_counts)
+    def build_preprocessor(self):
+        return self.hasher.build_preprocessor()
+
+    def build_tokenizer(self):
+        return self.hasher.build_tokenizer()
+
+    def get_stop_words(self):
+        return self.hasher.get_stop_words()
+
+    @property
+    def vocabulary_(self):
+        """Term -> output column lookup; take it again after reweight"""
+        return HashedVocabulary(self)
+
+    def _select_columns(self):
+        keep = (self.doc_freq > 0) & (self.doc_freq <= self.max_df * self.n_docs)
+        if self.max_features is not None and keep.sum() > self.max_features:
+            ranked = np.argsort(-np.where(keep, self.term_freq, -1), kind='stable')
+            keep = np.zeros_like(keep)
+            keep[ranked[:self.max_features]] = True
+        self._columns = np.flatnonzero(keep)
+        doc_freq = self.doc_freq[self._columns]
+        self._idf = np.log((1 + self.n_docs) / (1 + doc_freq)) + 1.0
+
+    @property
+    def columns_(self):
+        """Hashed columns kept by max_df/max_features, in output column order"""
+        if self._columns is None:
+            self._select_columns()
+        return self._columns
+
+    @property
+    def idf_(self):
+        """Smoothed IDF of each output column, from everything seen so far"""
+        if self._idf is None:
+            self._select_columns()
+        return self._idf
+
+    def _count(self, texts, sign=1):
+        """Hashed term counts of texts, added to (sign=-1: removed from) the IDF statistics"""
+        counts = self.hasher.transform(texts)
+        self.doc_freq += sign * np.bincount(counts.indices, minlength=self.n_features).astype(np.int32)
+        self.term_freq += sign * np.bincount(counts.indices, weights=counts.data,
+                                             minlength=self.n_features).astype(np.float32)
+        self.n_docs += sign * counts.shape[0]
+        return counts
+
+    def partial_fit(self, texts):
+        """Add a chunk of documents to the IDF statistics (columns_ and idf_ stay as they are)"""
+        self._count(texts)
+        return self
+
+    def forget(self, texts):
+        """Remove documents added earlier (e.g. retired or replaced rows) from the IDF statistics"""
+        self._count(texts, sign=-1)
+        return self
+
+    def reweight(self):
+        """Choose columns_ and idf_ again from the current statistics"""
+        self._select_columns()
+        return self
+
+    def weight(self, counts):
+        """TF-IDF rows (in output columns) from hashed term counts, under the current statistics"""
+        counts = counts[:, self.columns_]
+        if self.sublinear_tf:
+            np.log(counts.data, counts.data)
+            counts.data += 1.0
+        counts.data *= self.idf_[counts.indices]
+        return normalize(counts, copy=False)
+
+    def transform(self, texts):
+        """TF-IDF rows of texts; the statistics are not changed"""
+        return self.weight(self.hasher.transform(texts))
+
+    def fit_transform(self, texts, chunk_size=10000):
+        """
+        Start over, stream texts through the statistics, then weight every row
+
+        Texts are tokenized once, chunk_size at a time. Each chunk's raw counts are
+        spilled to a temporary file until the final statistics are known, so only
+        one chunk of them is in memory at a time.
+        """
+        self.doc_freq[:] = 0
+        self.term_freq[:] = 0
+        self.n_docs = 0
+        self._columns = self._idf = None
+        with tempfile.TemporaryDirectory() as spill:
+            paths = []
+            for start in range(0, len(texts), chunk_size):
+                paths.append(f'{spill}/{len(paths)}.npz')
+                sparse.save_npz(paths[-1], self._count(texts[start:start + chunk_size]), compressed=False)
+            return sparse.vstack([self.weight(sparse.load_npz(path)) for path in paths]
+                                 + [sparse.csr_matrix((0, len(self.columns_)))], format='csr')
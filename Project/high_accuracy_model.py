@@ -8,15 +8,740 @@ import numpy as np
 import re
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import StandardScaler
+from sklearn.preprocessing import StandardScaler, normalize
 import joblib
 import json
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import contextlib
+from functools import lru_cache
+from scipy import sparse
+
+try:
+    import fcntl
+except ImportError:  # Windows: artifact_lock is a no-op
+    fcntl = None
+
+from hashing_engine import HashingTfidfIndex
+
+
+# Rule-based boosts: (keywords searched in the raw eligibility text, multiplier)
+AGE_BOOST_RULES = {
+    'senior': (['60', 'senior', 'elderly', 'pension', 'old'], 1.5),
+    'minor': (['minor', 'child', 'below 18', 'under 18'], 1.5),
+    'youth': (['youth', 'young', '18-35', 'student'], 1.3),
+}
+INCOME_BOOST_RULE = (['bpl', 'poor', 'poverty', 'low income', 'ews'], 1.4)
+LOW_INCOME_LIMIT = 100000
+
+# Row order of HighAccuracyPredictor.age_boost_table (row 0 = no age boost)
+AGE_GROUPS = ('none', 'senior', 'minor', 'youth')
+
+# Bump whenever the files written by save_model change layout
+ARTIFACT_VERSION = 3
+METADATA_FILE = 'high_acc_metadata.json'
+
+# Catalogue drift at which update_schemes recommends a full refit (see needs_refit):
+# share of schemes added, modified or retired since the last fit, and rise in the
+# out-of-vocabulary token rate of the eligibility text added since then
+REFIT_CHANGED_FRACTION = 0.25
+REFIT_OOV_INCREASE = 0.10
+
+# Ensemble weights of the three similarity scores
+ENSEMBLE_WEIGHTS = {'eligibility': 0.60, 'benefits': 0.25, 'category': 0.15}
+
+# Confidence scaling per score band: (score lower bound (exclusive), intercept, slope).
+# Based on actual cosine similarity ranges; typical scores are 0.1-0.6, 0.4+ is very good.
+CONFIDENCE_BANDS = (
+    (0.40, 80, 30),   # Excellent match (rare): 92-98% range
+    (0.30, 70, 35),   # Very good match: 80-84% range
+    (0.20, 60, 40),   # Good match: 68-76% range
+    (0.10, 50, 50),   # Moderate match: 55-65% range
+    (-np.inf, 35, 100),  # Weak match: 35-45% range
+)
+MIN_CONFIDENCE, MAX_CONFIDENCE = 35, 98
+
+# Result payloads show scheme names up to 100 characters and display texts up to 300,
+# plus '...' when a text is longer
+RESULT_NAME_LENGTH = 100
+RESULT_TEXT_LENGTH = 300
+
+# Lean (chunked) ingestion: the only CSV columns read, and how much of each display text
+# is kept. 301 characters still decide the '...' of a result correctly.
+SCHEME_COLUMNS = ['scheme_name', 'slug', 'details', 'benefits', 'eligibility', 'level', 'schemeCategory']
+DISPLAY_TEXT_FIELDS = ('details', 'benefits', 'eligibility')
+DISPLAY_TEXT_LENGTH = RESULT_TEXT_LENGTH + 1
+CATEGORICAL_COLUMNS = ('level', 'schemeCategory')
+
+# Scoring engines: 'tfidf' fits vocabularies, 'hashing' streams hashed n-grams (see
+# hashing_engine.py) with this many columns per vectorizer
+ENGINES = ('tfidf', 'hashing')
+HASHING_FEATURES = {'eligibility': 2 ** 22, 'benefits': 2 ** 22, 'category': 2 ** 20}
+HASHING_CHUNK_SIZE = 10000
+
+# CSR scheme matrices stored as raw data/indices/indptr .npy arrays
+SCHEME_MATRICES = ('eligibility_vectors', 'benefits_vectors', 'category_vectors', 'fused_vectors')
+CSR_PARTS = ('data', 'indices', 'indptr')
+
+
+def age_boost_group(age):
+    """Index into AGE_GROUPS for the age boost that applies to a user"""
+    if age >= 60:
+        return 1
+    if age < 18:
+        return 2
+    if 18 <= age <= 35:
+        return 3
+    return 0
+
+
+def compute_data_hash(path, chunk_size=1 << 20):
+    """SHA-256 of a dataset file, used to detect stale model artifacts"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_array(path, array):
+    """
+    np.save via a temporary file and rename
+    
+    Processes that have the old file memory-mapped keep reading the old contents;
+    truncating a mapped file in place would crash them.
+    """
+    with open(path + '.tmp', 'wb') as f:
+        np.save(f, array)
+    os.replace(path + '.tmp', path)
+
+
+def save_csr(matrix, prefix):
+    """Write a CSR matrix as raw .npy arrays that load_csr can memory-map"""
+    matrix.sort_indices()
+    for part in CSR_PARTS:
+        save_array(f'{prefix}.{part}.npy', getattr(matrix, part))
+
+
+def load_csr(prefix, shape, mmap=False):
+    """
+    Read a CSR matrix written by save_csr
+    
+    With mmap=True the arrays are read-only np.memmap views of the files, so every
+    process that opens the same artifacts shares one page-cache copy.
+    """
+    arrays = tuple(np.load(f'{prefix}.{part}.npy', mmap_mode='r' if mmap else None)
+                   for part in CSR_PARTS)
+    matrix = sparse.csr_matrix(arrays, shape=tuple(shape), copy=False)
+    matrix.has_sorted_indices = True
+    return matrix
+
+
+@contextlib.contextmanager
+def artifact_lock(directory):
+    """
+    Exclusive lock on a model directory (its .lock file), across processes
+    
+    Held while artifacts are checked, rebuilt or swapped in, so processes sharing
+    models/ never load a set that another one is halfway through replacing.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, '.lock'), 'a') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def install_artifacts(staging, directory):
+    """Move the files saved into staging over those in directory (metadata last), then remove staging"""
+    names = sorted(os.listdir(staging), key=lambda name: name == METADATA_FILE)
+    for name in names:
+        os.replace(os.path.join(staging, name), os.path.join(directory, name))
+    os.rmdir(staging)
+
+
+def confidence_from_scores(scores):
+    """Map ensemble scores to the 35-98% confidence scale (vectorized)"""
+    scores = np.asarray(scores, dtype=float)
+    confidence = np.select([scores > lower for lower, _, _ in CONFIDENCE_BANDS],
+                           [intercept + (scores * slope) for _, intercept, slope in CONFIDENCE_BANDS],
+                           default=CONFIDENCE_BANDS[-1][1] + (scores * CONFIDENCE_BANDS[-1][2]))
+    return np.clip(confidence, MIN_CONFIDENCE, MAX_CONFIDENCE)
+
+
+def min_score_for_confidence(min_confidence):
+    """
+    Lowest ensemble score that can still reach min_confidence
+    
+    The confidence mapping is monotonic, so a confidence filter can be applied as a
+    score threshold before any result is built. The bound is slightly conservative;
+    the exact confidence check still happens in build_results.
+    """
+    if min_confidence <= MIN_CONFIDENCE:
+        return -np.inf
+    if min_confidence > MAX_CONFIDENCE:
+        return np.inf
+    
+    upper = np.inf
+    bands = []
+    for lower, intercept, slope in CONFIDENCE_BANDS:
+        bands.append((lower, upper, intercept, slope))
+        upper = lower
+    
+    for lower, upper, intercept, slope in reversed(bands):
+        needed = (min_confidence - intercept) / slope
+        if needed <= upper:
+            return max(needed, lower) - 1e-9
+    return np.inf
+
+
+def top_positions(scores, k):
+    """
+    Positions of the k highest values of a 1-D score array, in no particular order
+    
+    Scores tied with the k-th highest are taken lowest position first, so the
+    selection is the first k of a stable descending sort.
+    """
+    if len(scores) <= k:
+        return np.arange(len(scores))
+    kth = np.partition(scores, -k)[-k]
+    above = np.flatnonzero(scores > kth)
+    tied = np.flatnonzero(scores == kth)[:k - len(above)]
+    return np.concatenate([above, tied])
+
+
+def top_k(scores, k, min_score=-np.inf):
+    """
+    Positions of the k highest scores, best first, via argpartition
+    
+    For a 1-D array returns one index array; for a 2-D score matrix returns one
+    index array per row. Scores below min_score are never selected. k is clamped
+    to [0, number of scores]. Ties are broken by position (lowest first), so both
+    paths select exactly what a stable descending sort would.
+    """
+    k = int(np.clip(k, 0, scores.shape[-1]))
+    if scores.ndim == 1:
+        if k == 0:
+            return np.empty(0, dtype=int)
+        candidates = np.flatnonzero(scores >= min_score) if np.isfinite(min_score) else np.arange(len(scores))
+        if len(candidates) > k:
+            candidates = candidates[top_positions(scores[candidates], k)]
+        return candidates[np.lexsort((candidates, -scores[candidates]))]
+    
+    if k == 0:
+        return [np.empty(0, dtype=int) for _ in range(len(scores))]
+    selected = np.argpartition(scores, -k, axis=1)[:, -k:]
+    selected_scores = np.take_along_axis(scores, selected, axis=1)
+    # argpartition picks arbitrarily among scores tied with the k-th highest; rows
+    # where some of those were left out are reselected lowest position first
+    kth = selected_scores.min(axis=1, keepdims=True)
+    for row in np.flatnonzero((scores == kth).sum(axis=1) > (selected_scores == kth).sum(axis=1)):
+        selected[row] = top_positions(scores[row], k)
+    selected_scores = np.take_along_axis(scores, selected, axis=1)
+    order = np.lexsort((selected, -selected_scores))
+    selected = np.take_along_axis(selected, order, axis=1)
+    selected_scores = np.take_along_axis(selected_scores, order, axis=1)
+    return [row[row_scores >= min_score] for row, row_scores in zip(selected, selected_scores)]
+
+
+def keyword_mask(texts, keywords):
+    """Boolean mask of texts containing any of the keywords (substring match)"""
+    pattern = '|'.join(re.escape(w) for w in keywords)
+    return texts.str.contains(pattern, regex=True).to_numpy(dtype=bool)
+
+
+def boost_masks(eligibility):
+    """Per-scheme age boost table (AGE_GROUPS x schemes) and income boost of raw eligibility texts"""
+    elig_text = eligibility.astype(str).str.lower()
+    
+    age_boost_table = np.ones((len(AGE_GROUPS), len(elig_text)))
+    for group, (keywords, factor) in AGE_BOOST_RULES.items():
+        mask = keyword_mask(elig_text, keywords)
+        age_boost_table[AGE_GROUPS.index(group), mask] = factor
+    
+    keywords, factor = INCOME_BOOST_RULE
+    return age_boost_table, np.where(keyword_mask(elig_text, keywords), factor, 1.0)
+
+
+def fuse_matrices(eligibility, benefits, category):
+    """Row-normalized blocks scaled by their ensemble weights, stacked side by side"""
+    return sparse.hstack([
+        normalize(eligibility) * ENSEMBLE_WEIGHTS['eligibility'],
+        normalize(benefits) * ENSEMBLE_WEIGHTS['benefits'],
+        normalize(category) * ENSEMBLE_WEIGHTS['category'],
+    ], format='csr')
+
+
+def token_counts(vectorizer, texts):
+    """(tokens, tokens missing from the vocabulary) of texts, as words the fitted vectorizer sees"""
+    preprocess, tokenize = vectorizer.build_preprocessor(), vectorizer.build_tokenizer()
+    stop_words = vectorizer.get_stop_words() or ()
+    vocabulary = vectorizer.vocabulary_
+    total = missing = 0
+    for text in texts:
+        tokens = [t for t in tokenize(preprocess(text)) if t not in stop_words]
+        total += len(tokens)
+        missing += sum(t not in vocabulary for t in tokens)
+    return total, missing
+
+
+# Comprehensive abbreviation expansion used by advanced_clean
+ABBREVIATION_EXPANSIONS = {
+    'sc': 'scheduled caste sc',
+    'st': 'scheduled tribe st',
+    'sc/st': 'scheduled caste scheduled tribe sc st',
+    'obc': 'other backward class obc',
+    'bpl': 'below poverty line bpl poor low income economically weaker',
+    'apl': 'above poverty line apl',
+    'pwd': 'person with disability pwd disabled handicapped',
+    'ews': 'economically weaker section ews poor low income',
+    'msme': 'micro small medium enterprise msme sme business',
+    'sme': 'small medium enterprise sme business',
+    'iti': 'industrial training institute iti technical diploma',
+    'ngo': 'non government organization ngo',
+    'govt': 'government govt public sector',
+    'pvt': 'private pvt',
+    '₹': 'rupees rs money amount',
+    'rs': 'rupees rs money',
+    'lakh': 'lakh 100000 one hundred thousand',
+    'crore': 'crore 10000000 ten million'
+}
+
+# All abbreviations in one alternation (longest first, so 'sc/st' wins over 'sc'),
+# matched only as whole words: 'st' inside 'student' is left alone
+ABBREVIATION_PATTERN = re.compile(
+    r'(?<!\w)(' + '|'.join(re.escape(abbr) for abbr in
+                           sorted(ABBREVIATION_EXPANSIONS, key=len, reverse=True)) + r')(?!\w)')
+# Runs of punctuation and whitespace, i.e. what advanced_clean turns into one space
+SEPARATOR_PATTERN = re.compile(r'[^\w\-\/]+')
+
+
+def expand_abbreviation(match):
+    return ABBREVIATION_EXPANSIONS[match.group(1)]
+
+
+def clean_text(text):
+    """advanced_clean for one string: lowercase, separators to spaces, abbreviations expanded"""
+    text = SEPARATOR_PATTERN.sub(' ', str(text).lower()).strip()
+    return ABBREVIATION_PATTERN.sub(expand_abbreviation, text)
+
+
+def advanced_clean_column(texts):
+    """HighAccuracyPredictor.advanced_clean applied to a whole pandas column at once"""
+    texts = texts.fillna('').astype(str).str.lower()
+    texts = texts.str.replace(SEPARATOR_PATTERN, ' ', regex=True).str.strip()
+    return texts.str.replace(ABBREVIATION_PATTERN, expand_abbreviation, regex=True)
+
+
+def check_unique_slugs(slugs, source):
+    """Raise ValueError naming every slug that occurs more than once (update_schemes keys rows by slug)"""
+    slugs = pd.Series(slugs).dropna()
+    duplicates = sorted(set(slugs[slugs.duplicated()].astype(str)))
+    if duplicates:
+        raise ValueError(f"Duplicate slugs in {source}: {', '.join(duplicates)}")
+
+
+def prepare_scheme_rows(df):
+    """Drop schemes without a name or eligibility text, fill gaps and add the clean_* columns"""
+    df = df.dropna(subset=['scheme_name', 'eligibility']).copy()
+    for col in ['eligibility', 'details', 'benefits', 'level', 'schemeCategory']:
+        df[col] = df[col].fillna('')
+    
+    # Enhanced cleaning
+    df['clean_eligibility'] = advanced_clean_column(df['eligibility'])
+    df['clean_benefits'] = advanced_clean_column(df['benefits'])
+    df['clean_category'] = advanced_clean_column(df['schemeCategory'])
+    return df
+
+
+def trim_display_fields(df, length=DISPLAY_TEXT_LENGTH):
+    """Cut the display texts to length characters and store level/category as categoricals"""
+    for col in DISPLAY_TEXT_FIELDS:
+        df[col] = df[col].str.slice(0, length)
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype('category')
+    return df
+
+
+def read_scheme_chunks(path, chunksize):
+    """
+    Read the scheme CSV in chunks into a trimmed schemes DataFrame and its boost masks
+    
+    Each chunk is read with only SCHEME_COLUMNS as strings, then cleaned. Its boost
+    masks are computed from the full eligibility text before the display texts are
+    trimmed, so only the trimmed rows and the clean_* columns are kept from chunk to
+    chunk. All chunks are joined before vectorizing, so the clean_* text of the whole
+    catalogue is still in memory at once.
+    
+    Returns:
+        (schemes_df, age_boost_table, income_boost)
+    """
+    frames, age_tables, income_boosts = [], [], []
+    for chunk in pd.read_csv(path, usecols=SCHEME_COLUMNS, dtype=str, chunksize=chunksize):
+        chunk = prepare_scheme_rows(chunk)
+        age_boost_table, income_boost = boost_masks(chunk['eligibility'])
+        age_tables.append(age_boost_table)
+        income_boosts.append(income_boost)
+        frames.append(trim_display_fields(chunk))
+    
+    # Categories differ between chunks, so they are unified once after concatenating
+    df = pd.concat(frames, ignore_index=True)
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype(str).astype('category')
+    return df, np.hstack(age_tables), np.concatenate(income_boosts)
+
+
+# Profile keyword tables for create_enhanced_profile, built once at import time.
+# Age and income use [min, max) brackets; the other tables are matched by substring.
+
+# AGE - Ultra comprehensive
+AGE_KEYWORDS = {
+    (0, 5): ['infant', 'baby', 'toddler', 'child', 'newborn', 'below 5', 'under 5'] * 5,
+    (5, 14): ['child', 'minor', 'kid', 'school student', 'primary', 'elementary', 'below 14'] * 5,
+    (14, 18): ['minor', 'teenager', 'adolescent', 'school', 'secondary', 'below 18', '14-18'] * 5,
+    (18, 25): ['youth', 'young', 'student', 'college', 'university', 'undergraduate', 'young adult',
+               'scholarship', 'education', 'training', 'skill', 'fresher', 'entry level', '18-25'] * 5,
+    (25, 35): ['young adult', 'youth', 'professional', 'employee', 'entrepreneur', 'startup',
+               'career', 'job', 'employment', 'skilled', '25-35', 'young professional'] * 4,
+    (35, 45): ['adult', 'professional', 'experienced', 'skilled', 'employee', 'worker', '35-45'] * 3,
+    (45, 60): ['middle aged', 'adult', 'experienced', 'professional', 'senior employee', '45-60'] * 3,
+    (60, 120): ['senior citizen', 'elderly', 'old age', 'aged', 'pension', 'pensioner', 'retired',
+                'above 60', '60 plus', '60 years', 'old person', 'geriatric', 'super senior'] * 6
+}
+
+# INCOME - Very detailed brackets
+INCOME_KEYWORDS = {
+    (0, 50000): ['below poverty line', 'bpl', 'extremely poor', 'very low income', 'destitute',
+                'economically weaker section', 'ews', 'poorest', 'needy', 'underprivileged'] * 6,
+    (50000, 100000): ['low income', 'poor', 'below poverty', 'bpl', 'economically weak',
+                     'disadvantaged', 'lower income', 'limited income'] * 5,
+    (100000, 200000): ['lower middle income', 'modest income', 'limited resources',
+                      'lower middle class', 'economically moderate'] * 4,
+    (200000, 300000): ['middle income', 'middle class', 'moderate income', 'average income'] * 3,
+    (300000, 500000): ['upper middle income', 'comfortable income', 'decent income'] * 2,
+    (500000, 999999999): ['high income', 'well off', 'affluent', 'comfortable']
+}
+
+# OCCUPATION - Maximum coverage
+OCCUPATION_KEYWORDS = {
+    'student': ['student', 'learner', 'pupil', 'scholar', 'studying', 'education',
+               'school', 'college', 'university', 'academic', 'trainee'] * 5,
+    'farmer': ['farmer', 'agriculture', 'farming', 'cultivator', 'agricultural worker',
+              'rural', 'crop', 'land', 'kisan', 'krishi', 'farming community', 'agrarian'] * 5,
+    'government': ['government employee', 'govt worker', 'public sector', 'civil servant',
+                  'sarkari', 'government job', 'public service', 'govt staff'] * 4,
+    'private': ['private employee', 'private sector', 'company', 'corporate', 'salaried',
+               'employed', 'private job', 'company employee'] * 4,
+    'msme': ['msme', 'entrepreneur', 'business owner', 'small business', 'startup',
+            'micro enterprise', 'small scale', 'self employed business', 'businessman'] * 5,
+    'self-employed': ['self employed', 'own business', 'independent', 'freelancer',
+                     'consultant', 'self reliant', 'own work'] * 4,
+    'unemployed': ['unemployed', 'jobless', 'without job', 'seeking employment',
+                  'job seeker', 'looking for work', 'no job', 'unemployment'] * 5,
+    'retired': ['retired', 'pension', 'pensioner', 'ex employee', 'superannuated',
+               'retirement', 'former employee', 'ex service'] * 5,
+    'worker': ['worker', 'labour', 'labourer', 'daily wage', 'wage earner',
+              'construction', 'manual worker', 'unorganized sector', 'laborer'] * 5
+}
+
+# CATEGORY - Maximum emphasis
+CATEGORY_KEYWORDS = {
+    'SC': ['scheduled caste', 'sc', 'dalit', 'scheduled castes', 'socially backward',
+           'socially disadvantaged', 'reserved category'] * 5,
+    'ST': ['scheduled tribe', 'st', 'tribal', 'adivasi', 'indigenous', 'scheduled tribes',
+           'tribal community', 'tribe'] * 5,
+    'OBC': ['other backward class', 'obc', 'backward class', 'backward caste',
+            'socially and educationally backward'] * 5,
+    'WOMEN': ['woman', 'women', 'female', 'girl', 'lady', 'mother', 'wife', 'daughter',
+             'widow', 'mahila', 'women empowerment', 'girl child', 'ladies'] * 6,
+    'MINORITY': ['minority', 'religious minority', 'minority community', 'minorities'] * 4,
+    'GENERAL': ['general', 'general category', 'unreserved', 'open category'] * 2
+}
+
+# EDUCATION - Comprehensive
+EDUCATION_KEYWORDS = {
+    'primary': ['primary', 'basic education', 'elementary', 'literacy', 'minimal education',
+               'school', 'below 10th'] * 3,
+    'high school': ['high school', 'secondary', 'matriculation', '10th', '12th',
+                   'school education', 'intermediate'] * 3,
+    'undergraduate': ['undergraduate', 'graduation', 'college', 'pursuing degree',
+                     'graduate student', 'ug', 'bachelor pursuing'] * 4,
+    'graduate': ['graduate', 'graduated', 'degree holder', 'bachelor', 'degree',
+                'higher education', 'college graduate', 'qualified'] * 4,
+    'postgraduate': ['postgraduate', 'masters', 'post graduate', 'pg', 'higher degree',
+                    'advanced degree', 'masters degree'] * 4,
+    'diploma': ['diploma', 'iti', 'polytechnic', 'technical', 'vocational',
+               'skill training', 'certificate'] * 4,
+    'professional': ['professional', 'engineering', 'medical', 'technical degree',
+                    'specialized degree', 'professional qualification'] * 3
+}
+
+# FAMILY SIZE - indexed by family_size_bucket()
+FAMILY_KEYWORDS = (
+    [],
+    ['family', 'dependents', 'household'] * 2,
+    ['large family', 'big family', 'many dependents', 'family'] * 3,
+)
+
+# EXPERIENCE - indexed by experience_bucket()
+EXPERIENCE_KEYWORDS = (
+    ['fresher', 'no experience', 'beginner', 'entry level', 'new'] * 3,
+    ['less experience', 'junior', 'early career', 'inexperienced'] * 2,
+    ['experienced', 'skilled', 'professional', 'qualified'] * 2,
+    ['highly experienced', 'senior', 'expert', 'veteran'] * 2,
+)
+
+
+def bracket(value, table):
+    """Key of the [min, max) bracket of an age/income table that contains value"""
+    for low, high in table:
+        if low <= value < high:
+            return (low, high)
+    return None
+
+
+def family_size_bucket(family_size):
+    """Index into FAMILY_KEYWORDS"""
+    if family_size > 5:
+        return 2
+    if family_size > 3:
+        return 1
+    return 0
+
+
+def experience_bucket(years):
+    """Index into EXPERIENCE_KEYWORDS"""
+    if years == 0:
+        return 0
+    if years < 3:
+        return 1
+    if years < 10:
+        return 2
+    return 3
+
+
+def profile_parts(user_data):
+    """
+    Hashable keys of the keyword parts that make up a user's profile text
+    
+    Every form field maps onto a small finite domain (age and income onto
+    brackets), so these keys are also a canonical form of the profile.
+    """
+    return (
+        ('age', bracket(user_data.get('age', 0), AGE_KEYWORDS)),
+        ('income', bracket(user_data.get('income', 0), INCOME_KEYWORDS)),
+        ('occupation', user_data.get('occupation', '').lower()),
+        ('category', user_data.get('category', '').upper()),
+        ('education', user_data.get('education', '').lower()),
+        ('location', user_data.get('location', '')),
+        ('family_size', family_size_bucket(user_data.get('family_size', 1))),
+        ('experience', experience_bucket(user_data.get('years_experience', 0))),
+    )
+
+
+def profile_part_keywords(part):
+    """Keyword list of one profile part returned by profile_parts"""
+    kind, value = part
+    if kind == 'age':
+        return AGE_KEYWORDS.get(value, [])
+    if kind == 'income':
+        return INCOME_KEYWORDS.get(value, [])
+    if kind == 'occupation':
+        keywords = [value] * 5
+        for occ_key, words in OCCUPATION_KEYWORDS.items():
+            if occ_key in value:
+                keywords.extend(words)
+        return keywords
+    if kind == 'category':
+        return [value.lower()] * 5 + CATEGORY_KEYWORDS.get(value, [])
+    if kind == 'education':
+        keywords = [value] * 3
+        for edu_key, words in EDUCATION_KEYWORDS.items():
+            if edu_key in value:
+                keywords.extend(words)
+        return keywords
+    if kind == 'location':
+        return [value, value.lower(), 'India', 'Indian', 'citizen', 'resident'] * 3
+    if kind == 'family_size':
+        return FAMILY_KEYWORDS[value]
+    return EXPERIENCE_KEYWORDS[value]
+
+
+class ProfileEncoder:
+    """
+    TF-IDF profile vectors assembled from cached per-part term counts
+    
+    A profile text is a handful of cleaned keyword parts joined by spaces. The
+    in-vocabulary n-gram counts of each part are cached, so encoding a profile
+    only adds those counts to the few n-grams that span two parts instead of
+    re-tokenizing the whole multi-kilobyte text. The output is identical to
+    vectorizer.transform() of the joined text.
+    """
+    
+    def __init__(self, vectorizer, cache_size=4096):
+        self.vectorizer = vectorizer
+        self.vocabulary = vectorizer.vocabulary_
+        self.min_n, self.max_n = vectorizer.ngram_range
+        self._preprocess = vectorizer.build_preprocessor()
+        self._tokenize = vectorizer.build_tokenizer()
+        self._stop_words = vectorizer.get_stop_words()
+        self.part_counts = lru_cache(maxsize=cache_size)(self._part_counts)
+        self.boundary_columns = lru_cache(maxsize=cache_size)(self._boundary_columns)
+    
+    def _tokens(self, text):
+        tokens = self._tokenize(self._preprocess(text))
+        if self._stop_words is not None:
+            tokens = [t for t in tokens if t not in self._stop_words]
+        return tokens
+    
+    def _part_counts(self, text):
+        """Tokens of a cleaned part plus its vocabulary columns and counts"""
+        tokens = self._tokens(text)
+        columns = []
+        for n in range(self.min_n, self.max_n + 1):
+            for i in range(len(tokens) - n + 1):
+                column = self.vocabulary.get(' '.join(tokens[i:i + n]))
+                if column is not None:
+                    columns.append(column)
+        columns, counts = np.unique(np.array(columns, dtype=np.int64), return_counts=True)
+        return tuple(tokens), columns, counts
+    
+    def _boundary_columns(self, tail, head):
+        """Vocabulary columns of n-grams that start in tail and end in head (token tuples)"""
+        window = tail + head
+        columns = []
+        for n in range(max(self.min_n, 2), self.max_n + 1):
+            for i in range(max(len(tail) - n + 1, 0), len(tail)):
+                if i + n <= len(window):
+                    column = self.vocabulary.get(' '.join(window[i:i + n]))
+                    if column is not None:
+                        columns.append(column)
+        return np.array(columns, dtype=np.int64)
+    
+    def transform(self, profiles):
+        """
+        Encode profiles given as lists of cleaned part texts (in profile order)
+        
+        Returns:
+            CSR matrix equal to vectorizer.transform([' '.join(parts) for parts in profiles])
+        """
+        rows, columns, counts = [], [], []
+        for row, part_texts in enumerate(profiles):
+            tail = ()
+            for text in part_texts:
+                tokens, part_columns, part_counts = self.part_counts(text)
+                rows.append(np.full(len(part_columns), row))
+                columns.append(part_columns)
+                counts.append(part_counts)
+                
+                if tail and tokens and self.max_n > 1:
+                    boundary = self.boundary_columns(tail, tokens[:self.max_n - 1])
+                    rows.append(np.full(len(boundary), row))
+                    columns.append(boundary)
+                    counts.append(np.ones(len(boundary), dtype=np.int64))
+                if self.max_n > 1:
+                    tail = (tail + tokens)[-(self.max_n - 1):]
+        
+        shape = (len(profiles), len(self.vocabulary))
+        if not columns:
+            return sparse.csr_matrix(shape, dtype=np.float64)
+        X = sparse.csr_matrix((np.concatenate(counts).astype(np.float64),
+                               (np.concatenate(rows), np.concatenate(columns))), shape=shape)
+        X.sum_duplicates()
+        
+        # Same weighting as TfidfTransformer.transform
+        if self.vectorizer.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1.0
+        if self.vectorizer.use_idf:
+            X.data *= self.vectorizer.idf_[X.indices]
+        if self.vectorizer.norm is not None:
+            X = normalize(X, norm=self.vectorizer.norm, copy=False)
+        return X
+
+
+def result_text(text):
+    """A display text as shown in results: 300 characters, then '...' if it was longer"""
+    return text[:RESULT_TEXT_LENGTH] + '...' if len(str(text)) > RESULT_TEXT_LENGTH else text
+
+
+def scheme_ids(count):
+    """Result ids of the first count scheme positions"""
+    return np.array([f'SCH{idx:04d}' for idx in range(count)], dtype=object)
+
+
+class SchemeDisplayStore:
+    """
+    Display payload of every scheme, precomputed for build_results
+    
+    One object array per result field, indexed by scheme position, with names and
+    texts already cut to their result length. Assembling results is then array
+    indexing instead of a pandas row (Series) per hit. The strings are shared with
+    schemes_df wherever no cut was needed.
+    """
+    
+    def __init__(self, schemes_df):
+        self.scheme_ids = scheme_ids(len(schemes_df))
+        self.names = np.array([name[:RESULT_NAME_LENGTH] for name in schemes_df['scheme_name']], dtype=object)
+        self.slugs = schemes_df['slug'].to_numpy(dtype=object)
+        self.texts = tuple(np.array([result_text(text) for text in schemes_df[col]], dtype=object)
+                           for col in DISPLAY_TEXT_FIELDS)
+        self.levels = schemes_df['level'].to_numpy(dtype=object)
+        self.categories = schemes_df['schemeCategory'].to_numpy(dtype=object)
+    
+    def patch(self, rows, order):
+        """
+        Store for update_schemes: rows (new and changed schemes) appended, then
+        reordered like the scheme matrices; only rows' payloads are computed
+        """
+        new = SchemeDisplayStore(rows)
+        stack = lambda old, added: np.concatenate([old, added])[order]
+        store = SchemeDisplayStore.__new__(SchemeDisplayStore)
+        store.scheme_ids = scheme_ids(len(order))
+        store.names = stack(self.names, new.names)
+        store.slugs = stack(self.slugs, new.slugs)
+        store.texts = tuple(stack(old, added) for old, added in zip(self.texts, new.texts))
+        store.levels = stack(self.levels, new.levels)
+        store.categories = stack(self.categories, new.categories)
+        return store
+    
+    def columns(self, positions):
+        """(ids, names, slugs, details, benefits, eligibility, levels, categories) at scheme positions"""
+        return (self.scheme_ids[positions], self.names[positions], self.slugs[positions],
+                *(texts[positions] for texts in self.texts),
+                self.levels[positions], self.categories[positions])
+
 
 class HighAccuracyPredictor:
     """Maximum accuracy model with ensemble approach"""
     
-    def __init__(self, data_path='updated_data.csv'):
+    def __init__(self, data_path='updated_data.csv', build=True, fused=False, chunksize=None,
+                 engine='tfidf'):
+        """
+        Args:
+            data_path: Scheme dataset CSV
+            build: Load and fit now (False for load_model)
+            fused: Also build the fused scoring matrix
+            chunksize: Read the CSV in chunks of this many rows and keep only the
+                       display fields (trimmed) - for very large catalogues
+            engine: 'tfidf' (fitted vocabularies) or 'hashing' (hashed n-grams with
+                    streamed IDF, no vocabulary - for catalogues too large to fit one)
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {', '.join(ENGINES)}")
         self.data_path = data_path
+        self.chunksize = chunksize
+        self.engine = engine
+        # Length the display texts are trimmed to (None: full rows are kept)
+        self.display_length = DISPLAY_TEXT_LENGTH if chunksize else None
         self.schemes_df = None
         self.vectorizer_eligibility = None
         self.vectorizer_benefits = None
@@ -24,28 +749,54 @@ class HighAccuracyPredictor:
         self.eligibility_vectors = None
         self.benefits_vectors = None
         self.category_vectors = None
-        self.load_and_process_data()
+        self.age_boost_table = None
+        self.income_boost = None
+        self.fused_vectors = None
+        self.profile_encoders = None
+        self.display_store = None
+        self.catalog_drift = None
+        self.part_text = lru_cache(maxsize=4096)(self._clean_part)
+        self.data_hash = None
+        if build:
+            self.load_and_process_data()
+            if fused:
+                self.build_fused_matrix()
         
     def load_and_process_data(self):
         """Load with maximum preprocessing"""
         print("🚀 Loading dataset with MAXIMUM accuracy optimizations...")
         
-        self.schemes_df = pd.read_csv(self.data_path)
-        print(f"✓ Loaded {len(self.schemes_df)} schemes")
-        
-        # Clean
-        self.schemes_df = self.schemes_df.dropna(subset=['scheme_name', 'eligibility'])
-        for col in ['eligibility', 'details', 'benefits', 'level', 'schemeCategory']:
-            self.schemes_df[col] = self.schemes_df[col].fillna('')
-        
-        # Enhanced cleaning
-        self.schemes_df['clean_eligibility'] = self.schemes_df['eligibility'].apply(self.advanced_clean)
-        self.schemes_df['clean_benefits'] = self.schemes_df['benefits'].apply(self.advanced_clean)
-        self.schemes_df['clean_category'] = self.schemes_df['schemeCategory'].apply(self.advanced_clean)
-        
+        self.data_hash = compute_data_hash(self.data_path)
+        if self.chunksize:
+            self.schemes_df, self.age_boost_table, self.income_boost = read_scheme_chunks(
+                self.data_path, self.chunksize)
+            print(f"✓ Loaded {len(self.schemes_df)} schemes in chunks of {self.chunksize:,} rows")
+        else:
+            raw = pd.read_csv(self.data_path)
+            print(f"✓ Loaded {len(raw)} schemes")
+            
+            # Clean
+            self.schemes_df = prepare_scheme_rows(raw)
+            self.build_boost_masks()
+        self.build_display_store()
+        self.fit_vectorizers()
+    
+    def fit_vectorizers(self):
+        """Fit the three vectorizers on schemes_df and build everything derived from them"""
         # TRIPLE VECTORIZATION for ensemble
         print("✓ Creating triple-vectorization ensemble...")
+        if self.engine == 'hashing':
+            self.fit_hashing_vectorizers()
+        else:
+            self.fit_tfidf_vectorizers()
+        
+        self.build_profile_encoders()
+        self.reset_catalog_drift()
         
+        print(f"✓ Triple-vectorization complete: {len(self.schemes_df)} schemes ready")
+    
+    def fit_tfidf_vectorizers(self):
+        """Fit vocabulary-based TF-IDF vectorizers and the scheme matrices"""
         # Vectorizer 1: Eligibility focused (most important)
         self.vectorizer_eligibility = TfidfVectorizer(
             max_features=1500,
@@ -81,187 +832,169 @@ class HighAccuracyPredictor:
         self.category_vectors = self.vectorizer_category.fit_transform(
             self.schemes_df['clean_category']
         )
-        
-        print(f"✓ Triple-vectorization complete: {len(self.schemes_df)} schemes ready")
     
-    def advanced_clean(self, text):
-        """Maximum text cleaning"""
-        if pd.isna(text) or text == '':
-            return ''
-        
-        text = str(text).lower()
-        text = re.sub(r'[^\w\s\-\/]', ' ', text)
-        text = ' '.join(text.split())
-        
-        # Comprehensive abbreviation expansion
-        expansions = {
-            'sc': 'scheduled caste sc',
-            'st': 'scheduled tribe st',
-            'sc/st': 'scheduled caste scheduled tribe sc st',
-            'obc': 'other backward class obc',
-            'bpl': 'below poverty line bpl poor low income economically weaker',
-            'apl': 'above poverty line apl',
-            'pwd': 'person with disability pwd disabled handicapped',
-            'ews': 'economically weaker section ews poor low income',
-            'msme': 'micro small medium enterprise msme sme business',
-            'sme': 'small medium enterprise sme business',
-            'iti': 'industrial training institute iti technical diploma',
-            'ngo': 'non government organization ngo',
-            'govt': 'government govt public sector',
-            'pvt': 'private pvt',
-            '₹': 'rupees rs money amount',
-            'rs': 'rupees rs money',
-            'lakh': 'lakh 100000 one hundred thousand',
-            'crore': 'crore 10000000 ten million'
-        }
+    def fit_hashing_vectorizers(self):
+        """
+        Same three views with HashingTfidfIndex: settings mirror fit_tfidf_vectorizers,
+        and the texts are hashed chunk by chunk, so no vocabulary is ever held
+        """
+        chunk_size = self.chunksize or HASHING_CHUNK_SIZE
+        self.vectorizer_eligibility = HashingTfidfIndex(
+            n_features=HASHING_FEATURES['eligibility'],
+            max_features=1500,
+            ngram_range=(1, 4),
+            max_df=0.85,
+            sublinear_tf=True,
+            stop_words='english'
+        )
+        self.eligibility_vectors = self.vectorizer_eligibility.fit_transform(
+            self.schemes_df['clean_eligibility'], chunk_size
+        )
         
-        for abbr, full in expansions.items():
-            text = text.replace(abbr, full)
+        self.vectorizer_benefits = HashingTfidfIndex(
+            n_features=HASHING_FEATURES['benefits'],
+            max_features=800,
+            ngram_range=(1, 3),
+            sublinear_tf=True,
+            stop_words='english'
+        )
+        self.benefits_vectors = self.vectorizer_benefits.fit_transform(
+            self.schemes_df['clean_benefits'], chunk_size
+        )
         
-        return text
+        self.vectorizer_category = HashingTfidfIndex(
+            n_features=HASHING_FEATURES['category'],
+            max_features=300,
+            ngram_range=(1, 2),
+            sublinear_tf=True
+        )
+        self.category_vectors = self.vectorizer_category.fit_transform(
+            self.schemes_df['clean_category'], chunk_size
+        )
     
-    def create_enhanced_profile(self, user_data):
-        """MAXIMUM keyword generation"""
-        keywords = []
-        
-        # AGE - Ultra comprehensive
-        age = user_data.get('age', 0)
-        age_mappings = {
-            (0, 5): ['infant', 'baby', 'toddler', 'child', 'newborn', 'below 5', 'under 5'] * 5,
-            (5, 14): ['child', 'minor', 'kid', 'school student', 'primary', 'elementary', 'below 14'] * 5,
-            (14, 18): ['minor', 'teenager', 'adolescent', 'school', 'secondary', 'below 18', '14-18'] * 5,
-            (18, 25): ['youth', 'young', 'student', 'college', 'university', 'undergraduate', 'young adult',
-                       'scholarship', 'education', 'training', 'skill', 'fresher', 'entry level', '18-25'] * 5,
-            (25, 35): ['young adult', 'youth', 'professional', 'employee', 'entrepreneur', 'startup',
-                       'career', 'job', 'employment', 'skilled', '25-35', 'young professional'] * 4,
-            (35, 45): ['adult', 'professional', 'experienced', 'skilled', 'employee', 'worker', '35-45'] * 3,
-            (45, 60): ['middle aged', 'adult', 'experienced', 'professional', 'senior employee', '45-60'] * 3,
-            (60, 120): ['senior citizen', 'elderly', 'old age', 'aged', 'pension', 'pensioner', 'retired',
-                        'above 60', '60 plus', '60 years', 'old person', 'geriatric', 'super senior'] * 6
-        }
-        
-        for (min_age, max_age), words in age_mappings.items():
-            if min_age <= age < max_age:
-                keywords.extend(words)
-                break
-        
-        # INCOME - Very detailed brackets
-        income = user_data.get('income', 0)
-        income_mappings = {
-            (0, 50000): ['below poverty line', 'bpl', 'extremely poor', 'very low income', 'destitute',
-                        'economically weaker section', 'ews', 'poorest', 'needy', 'underprivileged'] * 6,
-            (50000, 100000): ['low income', 'poor', 'below poverty', 'bpl', 'economically weak',
-                             'disadvantaged', 'lower income', 'limited income'] * 5,
-            (100000, 200000): ['lower middle income', 'modest income', 'limited resources',
-                              'lower middle class', 'economically moderate'] * 4,
-            (200000, 300000): ['middle income', 'middle class', 'moderate income', 'average income'] * 3,
-            (300000, 500000): ['upper middle income', 'comfortable income', 'decent income'] * 2,
-            (500000, 999999999): ['high income', 'well off', 'affluent', 'comfortable']
-        }
-        
-        for (min_inc, max_inc), words in income_mappings.items():
-            if min_inc <= income < max_inc:
-                keywords.extend(words)
-                break
-        
-        # OCCUPATION - Maximum coverage
-        occupation = user_data.get('occupation', '').lower()
-        keywords.extend([occupation] * 5)
-        
-        occupation_map = {
-            'student': ['student', 'learner', 'pupil', 'scholar', 'studying', 'education',
-                       'school', 'college', 'university', 'academic', 'trainee'] * 5,
-            'farmer': ['farmer', 'agriculture', 'farming', 'cultivator', 'agricultural worker',
-                      'rural', 'crop', 'land', 'kisan', 'krishi', 'farming community', 'agrarian'] * 5,
-            'government': ['government employee', 'govt worker', 'public sector', 'civil servant',
-                          'sarkari', 'government job', 'public service', 'govt staff'] * 4,
-            'private': ['private employee', 'private sector', 'company', 'corporate', 'salaried',
-                       'employed', 'private job', 'company employee'] * 4,
-            'msme': ['msme', 'entrepreneur', 'business owner', 'small business', 'startup',
-                    'micro enterprise', 'small scale', 'self employed business', 'businessman'] * 5,
-            'self-employed': ['self employed', 'own business', 'independent', 'freelancer',
-                             'consultant', 'self reliant', 'own work'] * 4,
-            'unemployed': ['unemployed', 'jobless', 'without job', 'seeking employment',
-                          'job seeker', 'looking for work', 'no job', 'unemployment'] * 5,
-            'retired': ['retired', 'pension', 'pensioner', 'ex employee', 'superannuated',
-                       'retirement', 'former employee', 'ex service'] * 5,
-            'worker': ['worker', 'labour', 'labourer', 'daily wage', 'wage earner',
-                      'construction', 'manual worker', 'unorganized sector', 'laborer'] * 5
-        }
+    def reweight_hashing_vectorizers(self):
+        """
+        Refit of the hashing engine from the statistics update_schemes kept current
         
-        for occ_key, words in occupation_map.items():
-            if occ_key in occupation:
-                keywords.extend(words)
+        Columns and IDF are chosen again from the streamed counts, then every scheme
+        is weighted in one pass, chunk by chunk, with nothing spilled to disk.
+        """
+        chunk_size = self.chunksize or HASHING_CHUNK_SIZE
+        for name, vectorizer, column in self.hashing_views():
+            vectorizer.reweight()
+            texts = self.schemes_df[column]
+            setattr(self, name, sparse.vstack(
+                [vectorizer.transform(texts[start:start + chunk_size])
+                 for start in range(0, len(texts), chunk_size)]
+                + [sparse.csr_matrix((0, len(vectorizer.columns_)))], format='csr'))
+    
+    def hashing_views(self):
+        """(scheme matrix name, vectorizer, clean_* column) of each of the three views"""
+        return zip(SCHEME_MATRICES[:3],
+                   (self.vectorizer_eligibility, self.vectorizer_benefits, self.vectorizer_category),
+                   ('clean_eligibility', 'clean_benefits', 'clean_category'))
+    
+    def build_boost_masks(self):
+        """Precompute per-scheme rule-boost multipliers from the eligibility text"""
+        self.age_boost_table, self.income_boost = boost_masks(self.schemes_df['eligibility'])
+    
+    def build_display_store(self):
+        """Precompute the result payload of every scheme (see SchemeDisplayStore)"""
+        self.display_store = SchemeDisplayStore(self.schemes_df)
+    
+    def build_fused_matrix(self):
+        """
+        Precompute one weighted scheme matrix for single mat-vec scoring
         
-        # CATEGORY - Maximum emphasis
-        category = user_data.get('category', '').upper()
-        keywords.extend([category.lower()] * 5)
-        
-        category_map = {
-            'SC': ['scheduled caste', 'sc', 'dalit', 'scheduled castes', 'socially backward',
-                   'socially disadvantaged', 'reserved category'] * 5,
-            'ST': ['scheduled tribe', 'st', 'tribal', 'adivasi', 'indigenous', 'scheduled tribes',
-                   'tribal community', 'tribe'] * 5,
-            'OBC': ['other backward class', 'obc', 'backward class', 'backward caste',
-                    'socially and educationally backward'] * 5,
-            'WOMEN': ['woman', 'women', 'female', 'girl', 'lady', 'mother', 'wife', 'daughter',
-                     'widow', 'mahila', 'women empowerment', 'girl child', 'ladies'] * 6,
-            'MINORITY': ['minority', 'religious minority', 'minority community', 'minorities'] * 4,
-            'GENERAL': ['general', 'general category', 'unreserved', 'open category'] * 2
-        }
+        Each block is L2-normalized and scaled by its ensemble weight, then the three
+        blocks are stacked horizontally. Dotting it with the stacked, normalized user
+        vectors gives the same weighted sum of cosine similarities as three
+        cosine_similarity calls.
+        """
+        self.fused_vectors = fuse_matrices(self.eligibility_vectors, self.benefits_vectors,
+                                           self.category_vectors)
+    
+    def build_profile_encoders(self):
+        """Per-vectorizer encoders that build profile vectors from cached part counts"""
+        self.profile_encoders = (ProfileEncoder(self.vectorizer_eligibility),
+                                 ProfileEncoder(self.vectorizer_benefits),
+                                 ProfileEncoder(self.vectorizer_category))
+    
+    def encode_profiles(self, users):
+        """Eligibility/benefits/category vectors of user profile dictionaries"""
+        part_texts = [self.profile_part_texts(user_data) for user_data in users]
+        return tuple(encoder.transform(part_texts) for encoder in self.profile_encoders)
+    
+    def transform_profiles(self, profiles):
+        """Eligibility/benefits/category vectors of cleaned profile texts"""
+        return (self.vectorizer_eligibility.transform(profiles),
+                self.vectorizer_benefits.transform(profiles),
+                self.vectorizer_category.transform(profiles))
+    
+    def ensemble_scores(self, profiles):
+        """Weighted similarity of cleaned profile texts to every scheme (profiles x schemes)"""
+        return self.similarity_scores(self.transform_profiles(profiles))
+    
+    def similarity_scores(self, user_vectors):
+        """Weighted ensemble similarity of (eligibility, benefits, category) user vectors"""
+        user_vec_elig, user_vec_bene, user_vec_cate = user_vectors
         
-        if category in category_map:
-            keywords.extend(category_map[category])
-        
-        # EDUCATION - Comprehensive
-        education = user_data.get('education', '').lower()
-        keywords.extend([education] * 3)
-        
-        education_map = {
-            'primary': ['primary', 'basic education', 'elementary', 'literacy', 'minimal education',
-                       'school', 'below 10th'] * 3,
-            'high school': ['high school', 'secondary', 'matriculation', '10th', '12th',
-                           'school education', 'intermediate'] * 3,
-            'undergraduate': ['undergraduate', 'graduation', 'college', 'pursuing degree',
-                             'graduate student', 'ug', 'bachelor pursuing'] * 4,
-            'graduate': ['graduate', 'graduated', 'degree holder', 'bachelor', 'degree',
-                        'higher education', 'college graduate', 'qualified'] * 4,
-            'postgraduate': ['postgraduate', 'masters', 'post graduate', 'pg', 'higher degree',
-                            'advanced degree', 'masters degree'] * 4,
-            'diploma': ['diploma', 'iti', 'polytechnic', 'technical', 'vocational',
-                       'skill training', 'certificate'] * 4,
-            'professional': ['professional', 'engineering', 'medical', 'technical degree',
-                            'specialized degree', 'professional qualification'] * 3
-        }
+        if self.fused_vectors is not None:
+            user_vecs = sparse.hstack([normalize(user_vec_elig), normalize(user_vec_bene),
+                                       normalize(user_vec_cate)], format='csr')
+            # CSR matrix times a dense block keeps the scheme matrix in its stored layout
+            return (self.fused_vectors @ user_vecs.T.toarray()).T
         
-        for edu_key, words in education_map.items():
-            if edu_key in education:
-                keywords.extend(words)
+        # Calculate three similarity scores
+        sim_eligibility = cosine_similarity(user_vec_elig, self.eligibility_vectors)
+        sim_benefits = cosine_similarity(user_vec_bene, self.benefits_vectors)
+        sim_category = cosine_similarity(user_vec_cate, self.category_vectors)
         
-        # LOCATION
-        location = user_data.get('location', '')
-        keywords.extend([location, location.lower(), 'India', 'Indian', 'citizen', 'resident'] * 3)
-        
-        # FAMILY SIZE
-        family_size = user_data.get('family_size', 1)
-        if family_size > 5:
-            keywords.extend(['large family', 'big family', 'many dependents', 'family'] * 3)
-        elif family_size > 3:
-            keywords.extend(['family', 'dependents', 'household'] * 2)
-        
-        # EXPERIENCE
-        exp = user_data.get('years_experience', 0)
-        if exp == 0:
-            keywords.extend(['fresher', 'no experience', 'beginner', 'entry level', 'new'] * 3)
-        elif exp < 3:
-            keywords.extend(['less experience', 'junior', 'early career', 'inexperienced'] * 2)
-        elif exp < 10:
-            keywords.extend(['experienced', 'skilled', 'professional', 'qualified'] * 2)
-        else:
-            keywords.extend(['highly experienced', 'senior', 'expert', 'veteran'] * 2)
+        # WEIGHTED ENSEMBLE: Eligibility 60%, Benefits 25%, Category 15%
+        return (sim_eligibility * ENSEMBLE_WEIGHTS['eligibility'] +
+                sim_benefits * ENSEMBLE_WEIGHTS['benefits'] +
+                sim_category * ENSEMBLE_WEIGHTS['category'])
+    
+    def apply_boosts(self, scores, age, income):
+        """Multiply similarity scores in place by the age/income rule boosts"""
+        scores *= self.age_boost_table[age_boost_group(age)]
+        if income < LOW_INCOME_LIMIT:
+            scores *= self.income_boost
+        return scores
+    
+    def apply_boosts_batch(self, scores, ages, incomes):
+        """apply_boosts for a profiles x schemes score matrix and per-profile ages/incomes"""
+        groups = np.select([ages >= 60, ages < 18, ages <= 35], [1, 2, 3], default=0)
+        scores *= self.age_boost_table[groups]
+        low_income = incomes < LOW_INCOME_LIMIT
+        scores[low_income] *= self.income_boost
+        return scores
+    
+    def advanced_clean(self, text):
+        """Maximum text cleaning"""
+        if pd.isna(text) or text == '':
+            return ''
         
-        profile = ' '.join(keywords)
-        return self.advanced_clean(profile)
+        # Comprehensive abbreviation expansion (one pass, whole words only)
+        return clean_text(text)
+    
+    def create_enhanced_profile(self, user_data):
+        """MAXIMUM keyword generation"""
+        return ' '.join(self.profile_part_texts(user_data))
+    
+    def profile_part_texts(self, user_data):
+        """Cleaned, non-empty keyword parts of a profile, in profile order"""
+        texts = (self.part_text(part) for part in profile_parts(user_data))
+        return [text for text in texts if text]
+    
+    def _clean_part(self, part):
+        return self.advanced_clean(' '.join(profile_part_keywords(part)))
+    
+    def profile_key(self, user_data):
+        """Hashable key for everything that determines a user's scores (for result caching)"""
+        return (profile_parts(user_data),
+                age_boost_group(user_data.get('age', 0)),
+                user_data.get('income', 0) < LOW_INCOME_LIMIT)
     
     def predict_schemes(self, user_data, top_n=15, min_confidence=0):
         """
@@ -275,110 +1008,336 @@ class HighAccuracyPredictor:
         Returns:
             List of matching schemes, filtered by min_confidence
         """
-        profile = self.create_enhanced_profile(user_data)
-        
-        # Get vectors for user profile
-        user_vec_elig = self.vectorizer_eligibility.transform([profile])
-        user_vec_bene = self.vectorizer_benefits.transform([profile])
-        user_vec_cate = self.vectorizer_category.transform([profile])
+        return self.select_results(self.score_profile(user_data), top_n, min_confidence)
+    
+    def predict_schemes_tiered(self, user_data, tiers, ensemble_score=None):
+        """
+        Score a profile once and return the first non-empty confidence tier
         
-        # Calculate three similarity scores
-        sim_eligibility = cosine_similarity(user_vec_elig, self.eligibility_vectors)[0]
-        sim_benefits = cosine_similarity(user_vec_bene, self.benefits_vectors)[0]
-        sim_category = cosine_similarity(user_vec_cate, self.category_vectors)[0]
+        Args:
+            user_data: User profile dictionary
+            tiers: Sequence of (top_n, min_confidence) pairs, tried in order on the
+                   same scores, e.g. ((500, 60), (10, 50)) falls back to the top 10
+                   at 50% when nothing reaches 60%
+            ensemble_score: Boosted scores of this profile if already computed
+                            (e.g. by a batch), otherwise the profile is scored here
         
-        # WEIGHTED ENSEMBLE: Eligibility 60%, Benefits 25%, Category 15%
-        ensemble_score = (sim_eligibility * 0.60 + 
-                         sim_benefits * 0.25 + 
-                         sim_category * 0.15)
+        Returns:
+            List of matching schemes from the first tier that has any
+        """
+        if ensemble_score is None:
+            ensemble_score = self.score_profile(user_data)
         
-        # Apply rule-based boosts
-        age = user_data.get('age', 0)
-        income = user_data.get('income', 0)
+        results = []
+        for top_n, min_confidence in tiers:
+            results = self.select_results(ensemble_score, top_n, min_confidence)
+            if results:
+                break
+            print(f"⚠️ No schemes found with {min_confidence}%+ confidence, trying next tier...")
         
-        for idx, row in self.schemes_df.iterrows():
-            elig_text = str(row['eligibility']).lower()
-            
-            # Age boosts
-            if age >= 60 and any(w in elig_text for w in ['60', 'senior', 'elderly', 'pension', 'old']):
-                ensemble_score[idx] *= 1.5
-            elif age < 18 and any(w in elig_text for w in ['minor', 'child', 'below 18', 'under 18']):
-                ensemble_score[idx] *= 1.5
-            elif 18 <= age <= 35 and any(w in elig_text for w in ['youth', 'young', '18-35', 'student']):
-                ensemble_score[idx] *= 1.3
-            
-            # Income boosts
-            if income < 100000 and any(w in elig_text for w in ['bpl', 'poor', 'poverty', 'low income', 'ews']):
-                ensemble_score[idx] *= 1.4
+        return results
+    
+    def score_profile(self, user_data):
+        """Boosted ensemble score of one user profile against every scheme"""
+        ensemble_score = self.similarity_scores(self.encode_profiles([user_data]))[0]
         
-        # Get top schemes
-        top_indices = ensemble_score.argsort()[-top_n:][::-1]
+        # Apply rule-based boosts (precomputed per-scheme masks)
+        return self.apply_boosts(ensemble_score, user_data.get('age', 0), user_data.get('income', 0))
+    
+    def score_profiles(self, profiles):
+        """Boosted ensemble scores of several profiles as a profiles x schemes matrix"""
+        scores = self.similarity_scores(self.encode_profiles(profiles))
+        return self.apply_boosts_batch(scores,
+                                       np.array([user_data.get('age', 0) for user_data in profiles]),
+                                       np.array([user_data.get('income', 0) for user_data in profiles]))
+    
+    def select_results(self, ensemble_score, top_n, min_confidence=0):
+        """Top schemes from a score vector as result dictionaries"""
+        # Get top schemes (schemes that cannot reach min_confidence are skipped)
+        top_indices = top_k(ensemble_score, top_n, min_score_for_confidence(min_confidence))
         
         # Debug: Show score distribution
         top_scores = ensemble_score[top_indices]
         print(f"\n🔍 Score Distribution (Top {top_n}):")
-        print(f"   Highest: {top_scores[0]:.4f}")
-        print(f"   Lowest:  {top_scores[-1]:.4f}")
-        print(f"   Average: {top_scores.mean():.4f}")
+        if len(top_scores):
+            print(f"   Highest: {top_scores[0]:.4f}")
+            print(f"   Lowest:  {top_scores[-1]:.4f}")
+            print(f"   Average: {top_scores.mean():.4f}")
+        else:
+            print(f"   No scheme can reach {min_confidence}% confidence")
+        
+        results = self.build_results(top_indices, top_scores, min_confidence)
+        if min_confidence > 0:
+            print(f"✓ Filtered to {len(results)} schemes with confidence ≥ {min_confidence}%")
+        
+        return results
+    
+    def rank_schemes_batch(self, profiles, top_n=15, min_confidence=0, chunk_size=1000):
+        """
+        Ranked scheme positions and ensemble scores for many user profiles
+        
+        Profiles are encoded together and scored chunk by chunk as a
+        profiles x schemes matrix, with the rule boosts applied as masks.
+        This is the compact form behind predict_schemes_batch and the JSON API.
+        
+        Args:
+            profiles: List of user profile dictionaries
+            top_n: Maximum number of schemes to return per profile
+            min_confidence: Minimum confidence threshold (0-100)
+            chunk_size: Profiles scored per matrix (bounds peak memory)
+        
+        Returns:
+            One (indices, scores) pair of arrays per profile, best match first
+        """
+        min_score = min_score_for_confidence(min_confidence)
+        ranked = []
+        
+        for chunk_start in range(0, len(profiles), chunk_size):
+            chunk = profiles[chunk_start:chunk_start + chunk_size]
+            scores = self.score_profiles(chunk)
+            for row_scores, indices in zip(scores, top_k(scores, top_n, min_score)):
+                ranked.append((indices, row_scores[indices]))
+        
+        return ranked
+    
+    def predict_schemes_batch(self, profiles, top_n=15, min_confidence=0, chunk_size=1000):
+        """
+        Vectorized prediction for many user profiles at once
+        
+        Args:
+            profiles: List of user profile dictionaries
+            top_n: Maximum number of schemes to return per profile
+            min_confidence: Minimum confidence threshold (0-100)
+            chunk_size: Profiles scored per matrix (bounds peak memory)
+        
+        Returns:
+            One list of matching schemes per profile, as returned by predict_schemes
+        """
+        start = time.perf_counter()
+        results = [self.build_results(indices, scores, min_confidence)
+                   for indices, scores in self.rank_schemes_batch(profiles, top_n, min_confidence, chunk_size)]
+        
+        elapsed = time.perf_counter() - start
+        print(f"✓ Scored {len(profiles)} profiles in {elapsed:.2f}s "
+              f"({len(profiles) / max(elapsed, 1e-9):,.0f} profiles/sec)")
+        return results
+    
+    def build_results(self, indices, scores, min_confidence=0):
+        """Result dictionaries for ranked scheme positions and their ensemble scores"""
+        scores = np.asarray(scores, dtype=float)
+        confidences = confidence_from_scores(scores)
+        shown = confidences >= min_confidence
+        columns = self.display_store.columns(np.asarray(indices, dtype=np.intp)[shown])
         
         results = []
-        for idx in top_indices:
-            scheme = self.schemes_df.iloc[idx]
-            score = ensemble_score[idx]
-            
-            # More realistic confidence scaling based on actual cosine similarity ranges
-            # Typical scores: 0.1-0.6 range, with 0.4+ being very good
-            if score > 0.40:  # Excellent match (rare)
-                confidence = 80 + (score * 30)  # 92-98% range
-            elif score > 0.30:  # Very good match
-                confidence = 70 + (score * 35)  # 80-84% range
-            elif score > 0.20:  # Good match
-                confidence = 60 + (score * 40)  # 68-76% range
-            elif score > 0.10:  # Moderate match
-                confidence = 50 + (score * 50)  # 55-65% range
-            else:  # Weak match
-                confidence = 35 + (score * 100)  # 35-45% range
-            
-            confidence = min(98, max(35, confidence))
-            
+        for (scheme_id, name, slug, details, benefits, eligibility, level, category,
+             confidence, score) in zip(*columns, confidences[shown].tolist(), scores[shown].tolist()):
             # Stricter eligibility: only schemes with 70%+ confidence are truly eligible
             is_eligible = confidence >= 70
             
             results.append({
-                'scheme_id': f'SCH{idx:04d}',
-                'scheme_name': scheme['scheme_name'][:100],
-                'slug': scheme['slug'],
-                'details': scheme['details'][:300] + '...' if len(str(scheme['details'])) > 300 else scheme['details'],
-                'benefits': scheme['benefits'][:300] + '...' if len(str(scheme['benefits'])) > 300 else scheme['benefits'],
-                'eligibility': scheme['eligibility'][:300] + '...' if len(str(scheme['eligibility'])) > 300 else scheme['eligibility'],
-                'level': scheme['level'],
-                'category': scheme['schemeCategory'],
-                'probability': float(confidence),
+                'scheme_id': scheme_id,
+                'scheme_name': name,
+                'slug': slug,
+                'details': details,
+                'benefits': benefits,
+                'eligibility': eligibility,
+                'level': level,
+                'category': category,
+                'probability': confidence,
                 'eligible': is_eligible,
-                'similarity_score': float(score),
+                'similarity_score': score,
                 'match_quality': 'Excellent' if confidence >= 80 else 'Very Good' if confidence >= 70 else 'Good' if confidence >= 60 else 'Fair'
             })
         
-        # Filter by minimum confidence threshold
-        if min_confidence > 0:
-            results = [r for r in results if r['probability'] >= min_confidence]
-            print(f"✓ Filtered to {len(results)} schemes with confidence ≥ {min_confidence}%")
-        
         return results
     
+    def reset_catalog_drift(self):
+        """Start drift tracking from the current fit (rows and baseline out-of-vocabulary rate)"""
+        tokens, missing = token_counts(self.vectorizer_eligibility, self.schemes_df['clean_eligibility'])
+        self.catalog_drift = {'fit_rows': len(self.schemes_df), 'fit_oov_rate': missing / max(tokens, 1),
+                              'changed': 0, 'tokens': 0, 'oov_tokens': 0}
+    
+    def update_schemes(self, upserts=None, retired_slugs=()):
+        """
+        Add, modify or retire schemes by slug without refitting the vocabularies
+        
+        Only the changed rows are cleaned and transformed with the fitted vectorizers;
+        the scheme matrices, fused matrix and boost masks are patched around them.
+        Modified schemes keep their position, new ones are appended and retired ones
+        removed, so later scheme positions (scheme ids) shift. Indexes and caches built
+        on schemes_df must be rebuilt afterwards.
+        
+        Args:
+            upserts: DataFrame of scheme rows in the CSV layout; a known slug replaces that scheme
+                (slugs must be unique here and in the catalogue, otherwise ValueError)
+            retired_slugs: Slugs of schemes to remove (unknown slugs are ignored)
+        
+        Returns:
+            Dictionary with the number of schemes added, modified and retired
+        """
+        if self.catalog_drift is None:
+            # Artifacts saved before drift tracking: measure from the catalogue as it is
+            self.reset_catalog_drift()
+        old = self.schemes_df
+        raw_columns = [col for col in old.columns if not col.startswith('clean_')]
+        check_unique_slugs(old['slug'], 'the catalogue')
+        rows = old.iloc[:0] if upserts is None else upserts
+        check_unique_slugs(rows['slug'], 'the upserts')
+        rows = rows.reindex(columns=raw_columns)
+        
+        unusable = rows[['slug', 'scheme_name', 'eligibility']].isna().any(axis=1)
+        if unusable.any():
+            raise ValueError(f"{unusable.sum()} scheme rows lack a slug, scheme_name or eligibility")
+        retired = set(retired_slugs)
+        conflicting = retired & set(rows['slug'])
+        if conflicting:
+            raise ValueError(f"Schemes both updated and retired: {', '.join(sorted(conflicting))}")
+        rows = prepare_scheme_rows(rows)
+        
+        # Stacked row (old rows, then the changed rows) behind every row of the result
+        positions = pd.Series(np.arange(len(old)), index=old['slug'])
+        known = rows['slug'].isin(positions.index).to_numpy()
+        source = np.arange(len(old))
+        source[positions[rows['slug'][known]].to_numpy()] = len(old) + np.flatnonzero(known)
+        keep = ~old['slug'].isin(retired).to_numpy()
+        order = np.concatenate([source[keep], len(old) + np.flatnonzero(~known)])
+        
+        if len(rows):
+            new_vectors = (self.vectorizer_eligibility.transform(rows['clean_eligibility']),
+                           self.vectorizer_benefits.transform(rows['clean_benefits']),
+                           self.vectorizer_category.transform(rows['clean_category']))
+        else:
+            # Retire-only update: TfidfTransformer and normalize reject zero rows
+            new_vectors = tuple(sparse.csr_matrix((0, getattr(self, name).shape[1]))
+                                for name in SCHEME_MATRICES[:3])
+        if self.engine == 'hashing':
+            # Keep the streamed statistics those of the current catalogue; the columns
+            # and IDF in use stay fixed until refit()
+            gone = np.concatenate([np.flatnonzero(~keep), positions[rows['slug'][known]].to_numpy()])
+            for _, vectorizer, column in self.hashing_views():
+                if len(gone):
+                    vectorizer.forget(old[column].iloc[gone])
+                if len(rows):
+                    vectorizer.partial_fit(rows[column])
+        patch = lambda matrix, new: sparse.vstack([matrix, new], format='csr')[order]
+        for name, new in zip(SCHEME_MATRICES, new_vectors):
+            setattr(self, name, patch(getattr(self, name), new))
+        if self.fused_vectors is not None:
+            new_fused = (fuse_matrices(*new_vectors) if len(rows)
+                         else sparse.csr_matrix((0, self.fused_vectors.shape[1])))
+            self.fused_vectors = patch(self.fused_vectors, new_fused)
+        
+        age_boost_table, income_boost = boost_masks(rows['eligibility'])
+        self.age_boost_table = np.hstack([self.age_boost_table, age_boost_table])[:, order]
+        self.income_boost = np.concatenate([self.income_boost, income_boost])[order]
+        if self.display_length:
+            rows = trim_display_fields(rows, self.display_length)
+        self.schemes_df = pd.concat([old, rows], ignore_index=True).iloc[order].reset_index(drop=True)
+        if self.display_length:
+            for col in CATEGORICAL_COLUMNS:
+                self.schemes_df[col] = self.schemes_df[col].astype(str).astype('category')
+        self.display_store = self.display_store.patch(rows, order)
+        
+        counts = {'added': int((~known).sum()), 'modified': int(known.sum()), 'retired': int((~keep).sum())}
+        tokens, missing = token_counts(self.vectorizer_eligibility, rows['clean_eligibility'])
+        self.catalog_drift['changed'] += len(rows) + counts['retired']
+        self.catalog_drift['tokens'] += tokens
+        self.catalog_drift['oov_tokens'] += missing
+        
+        print(f"✓ Catalogue updated: {counts['added']} added, {counts['modified']} modified, "
+              f"{counts['retired']} retired ({len(self.schemes_df)} schemes)")
+        if self.needs_refit():
+            drift = self.vocabulary_drift()
+            print(f"⚠️ Catalogue drift {drift['changed_fraction']:.0%} changed, "
+                  f"+{drift['oov_increase']:.1%} unknown words: refit recommended")
+        return counts
+    
+    def vocabulary_drift(self):
+        """
+        How far the catalogue has moved from the vocabularies' last fit
+        
+        Returns:
+            Dictionary with changed_fraction (schemes added, modified or retired since the
+            fit, relative to the fitted count), oov_rate (share of eligibility words added
+            since then that the vocabulary lacks) and oov_increase (oov_rate minus the rate
+            of the fitted catalogue itself)
+        """
+        if self.catalog_drift is None:
+            self.reset_catalog_drift()
+        drift = self.catalog_drift
+        oov_rate = drift['oov_tokens'] / drift['tokens'] if drift['tokens'] else drift['fit_oov_rate']
+        return {'changed_fraction': drift['changed'] / max(drift['fit_rows'], 1),
+                'oov_rate': oov_rate,
+                'oov_increase': oov_rate - drift['fit_oov_rate']}
+    
+    def needs_refit(self, max_changed=REFIT_CHANGED_FRACTION, max_oov_increase=REFIT_OOV_INCREASE):
+        """True once the catalogue drift passes either threshold"""
+        drift = self.vocabulary_drift()
+        return drift['changed_fraction'] >= max_changed or drift['oov_increase'] >= max_oov_increase
+    
+    def refit(self):
+        """
+        Refit the vocabularies on the current catalogue, e.g. after needs_refit()
+        
+        The hashing engine's statistics already match the catalogue (update_schemes
+        streams changed rows into them), so it only re-selects columns and IDF and
+        weights the schemes again.
+        """
+        fused = self.fused_vectors is not None
+        if self.engine == 'hashing':
+            self.reweight_hashing_vectorizers()
+            self.build_profile_encoders()
+            self.reset_catalog_drift()
+        else:
+            self.fit_vectorizers()
+        self.fused_vectors = None
+        if fused:
+            self.build_fused_matrix()
+    
     def save_model(self, directory='models/'):
-        """Save high accuracy model"""
-        import os
-        os.makedirs(directory, exist_ok=True)
+        """
+        Save high accuracy model as a load-only artifact directory
         
+        The files are written to a staging directory first and moved into place,
+        all under artifact_lock, so no process ever loads a half-written artifact.
+        """
+        with artifact_lock(directory):
+            self._save_locked(directory)
+    
+    def _save_locked(self, directory):
+        """save_model for a caller that already holds artifact_lock(directory)"""
+        staging = tempfile.mkdtemp(prefix='.save-', dir=directory)
+        try:
+            self.write_artifacts(staging)
+            install_artifacts(staging, directory)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        print("✓ High accuracy model saved")
+    
+    def write_artifacts(self, directory):
+        """Write every artifact file into an existing (staging) directory, metadata last"""
         joblib.dump(self.vectorizer_eligibility, f'{directory}/high_acc_vectorizer_elig.pkl')
         joblib.dump(self.vectorizer_benefits, f'{directory}/high_acc_vectorizer_bene.pkl')
         joblib.dump(self.vectorizer_category, f'{directory}/high_acc_vectorizer_cate.pkl')
-        self.schemes_df.to_csv(f'{directory}/high_acc_schemes.csv', index=False)
+        for name in SCHEME_MATRICES:
+            if getattr(self, name) is not None:
+                save_csr(getattr(self, name), f'{directory}/high_acc_{name}')
+        save_array(f'{directory}/high_acc_age_boost_table.npy', self.age_boost_table)
+        save_array(f'{directory}/high_acc_income_boost.npy', self.income_boost)
+        self.schemes_df.to_pickle(f'{directory}/high_acc_schemes.pkl')
         
         metadata = {
             'model_version': '3.0 - High Accuracy',
+            'artifact_version': ARTIFACT_VERSION,
+            'source_path': os.path.basename(self.data_path),
+            'source_sha256': self.data_hash,
             'total_schemes': len(self.schemes_df),
+            'catalog_drift': self.catalog_drift,
+            'display_length': self.display_length,
+            'engine': self.engine,
+            'matrix_shapes': {name: list(getattr(self, name).shape) for name in SCHEME_MATRICES
+                              if getattr(self, name) is not None},
             'techniques': [
                 'Triple vectorization ensemble',
                 'Weighted scoring (60-25-15)',
@@ -389,8 +1348,79 @@ class HighAccuracyPredictor:
                 'Maximum feature extraction (1500+800+300)'
             ]
         }
-        json.dump(metadata, open(f'{directory}/high_acc_metadata.json', 'w'), indent=2)
-        print(f"✓ High accuracy model saved")
+        # Written last and renamed into place: a watcher that sees it can load everything else
+        with open(f'{directory}/{METADATA_FILE}.tmp', 'w') as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(f'{directory}/{METADATA_FILE}.tmp', f'{directory}/{METADATA_FILE}')
+    
+    @classmethod
+    def load_model(cls, directory='models/', data_path=None, mmap=False, fused=False):
+        """
+        Load a model written by save_model without refitting anything
+        
+        Args:
+            directory: Artifact directory written by save_model
+            data_path: Source CSV. If given, the artifacts must have been built from
+                       a file with the same SHA-256, otherwise ValueError is raised.
+            mmap: Memory-map the scheme matrices and boost masks instead of reading
+                  them into the heap (shared between worker processes)
+            fused: Score with the fused weighted matrix (loaded if saved, else built)
+        """
+        with open(f'{directory}/{METADATA_FILE}') as f:
+            metadata = json.load(f)
+        
+        if metadata.get('artifact_version') != ARTIFACT_VERSION:
+            raise ValueError(f"Artifact version {metadata.get('artifact_version')} in {directory} "
+                             f"does not match expected version {ARTIFACT_VERSION}")
+        if data_path is not None and compute_data_hash(data_path) != metadata['source_sha256']:
+            raise ValueError(f"Artifacts in {directory} are stale: {data_path} has changed")
+        
+        predictor = cls(data_path or metadata['source_path'], build=False,
+                        engine=metadata.get('engine', 'tfidf'))
+        predictor.data_hash = metadata['source_sha256']
+        predictor.vectorizer_eligibility = joblib.load(f'{directory}/high_acc_vectorizer_elig.pkl')
+        predictor.vectorizer_benefits = joblib.load(f'{directory}/high_acc_vectorizer_bene.pkl')
+        predictor.vectorizer_category = joblib.load(f'{directory}/high_acc_vectorizer_cate.pkl')
+        for name, shape in metadata['matrix_shapes'].items():
+            if name != 'fused_vectors' or fused:
+                setattr(predictor, name, load_csr(f'{directory}/high_acc_{name}', shape, mmap=mmap))
+        if fused and predictor.fused_vectors is None:
+            predictor.build_fused_matrix()
+        mmap_mode = 'r' if mmap else None
+        predictor.age_boost_table = np.load(f'{directory}/high_acc_age_boost_table.npy', mmap_mode=mmap_mode)
+        predictor.income_boost = np.load(f'{directory}/high_acc_income_boost.npy', mmap_mode=mmap_mode)
+        predictor.schemes_df = pd.read_pickle(f'{directory}/high_acc_schemes.pkl')
+        predictor.catalog_drift = metadata.get('catalog_drift')
+        predictor.display_length = metadata.get('display_length')
+        predictor.build_display_store()
+        predictor.build_profile_encoders()
+        
+        print(f"✓ Loaded {len(predictor.schemes_df)} schemes from {directory}")
+        return predictor
+    
+    @classmethod
+    def from_artifacts(cls, data_path='updated_data.csv', directory='models/', mmap=False, fused=False,
+                       chunksize=None, engine='tfidf'):
+        """
+        Fast start: load saved artifacts if they match data_path, otherwise rebuild and save
+        
+        chunksize and engine are only used for a rebuild (see __init__); saved artifacts
+        keep the layout and engine they were built with. The check and any rebuild run
+        under artifact_lock, so when several workers start on a changed dataset one of
+        them refits and the others load what it saved.
+        """
+        with artifact_lock(directory):
+            try:
+                return cls.load_model(directory, data_path=data_path, mmap=mmap, fused=fused)
+            except (OSError, EOFError, ValueError, KeyError, pickle.UnpicklingError) as e:
+                print(f"⚠️ Saved model not usable ({type(e).__name__}: {e}), rebuilding from {data_path}...")
+            
+            predictor = cls(data_path, fused=fused, chunksize=chunksize, engine=engine)
+            predictor._save_locked(directory)
+            if mmap:
+                # Reopen so the matrices are backed by the shared files, not this process's heap
+                return cls.load_model(directory, data_path=data_path, mmap=True, fused=fused)
+            return predictor
 
 
 # Test
@@ -0,0 +1,127 @@
+"""
+Hot Model Reload
+Builds a new serving state in the background and swaps it in with one reference assignment
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+
+class ModelReloader:
+    """
+    Holds the current serving state and replaces it without a restart
+
+    Requests read `current` once and use that object to the end, so a request
+    that started before a swap finishes on the old model while new requests
+    get the new one. Building happens on a background thread; the swap itself
+    is a single attribute assignment. Replaced states are closed after a grace
+    period, once requests that still hold them have finished.
+    """
+
+    def __init__(self, build_state, state=None, on_swap=None, retire_after=60):
+        """
+        Args:
+            build_state: Callable returning a fully built state (loads the model, indexes, pages)
+            state: Already built initial state (default: build one now)
+            on_swap: Called as on_swap(old, new) right after a swap, e.g. to clear caches
+            retire_after: Seconds before a replaced state's close() is called
+        """
+        self.build_state = build_state
+        self.on_swap = on_swap
+        self.retire_after = retire_after
+        self.current = state if state is not None else build_state()
+        self.version = 1
+        self.loaded_at = datetime.now()
+        self.last_error = None
+        self.last_reload_seconds = None
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+
+    def reload(self, wait=False):
+        """
+        Build a new state and swap it in
+
+        Returns:
+            False if a reload is already running, otherwise True (with wait=True, once swapped)
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        thread = threading.Thread(target=self._reload, name='model-reload', daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+        return True
+
+    def _reload(self):
+        try:
+            start = time.perf_counter()
+            print("🔄 Reloading model in the background...")
+            try:
+                state = self.build_state()
+            except Exception as e:
+                # The old state keeps serving
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"❌ Reload failed, still serving version {self.version}: {self.last_error}")
+                return
+
+            old, self.current = self.current, state
+            self.version += 1
+            self.loaded_at = datetime.now()
+            self.last_error = None
+            self.last_reload_seconds = time.perf_counter() - start
+            if self.on_swap:
+                self.on_swap(old, state)
+            if hasattr(old, 'close'):
+                timer = threading.Timer(self.retire_after, old.close)
+                timer.daemon = True
+                timer.start()
+            print(f"✓ Now serving model version {self.version} (built in {self.last_reload_seconds:.1f}s)")
+        finally:
+            self._reload_lock.release()
+
+    def watch(self, paths, interval=30):
+        """
+        Reload whenever one of the files changes (polled every interval seconds)
+
+        A change is acted on only once it has been stable for a whole interval,
+        so a dataset and its artifacts being rewritten together trigger one reload
+        after both are written. Files rewritten by the reload itself (the artifacts
+        saved by a refit) count as loaded and do not trigger another one.
+        """
+        def signature():
+            stamps = []
+            for path in paths:
+                try:
+                    info = os.stat(path)
+                    stamps.append((info.st_mtime_ns, info.st_size))
+                except FileNotFoundError:
+                    stamps.append(None)
+            return stamps
+
+        def run():
+            loaded = pending = signature()
+            while True:
+                time.sleep(interval)
+                seen = signature()
+                if seen != pending:
+                    pending = seen  # still changing; wait for it to settle
+                elif seen != loaded:
+                    print(f"👀 Change detected in {', '.join(paths)}")
+                    if self.reload(wait=True):
+                        loaded = pending = signature()
+
+        self._watcher = threading.Thread(target=run, name='model-watch', daemon=True)
+        self._watcher.start()
+
+    def status(self):
+        """Version, load time and last error, for the admin endpoint"""
+        return {
+            'version': self.version,
+            'loaded_at': self.loaded_at.isoformat(timespec='seconds'),
+            'reloading': self._reload_lock.locked(),
+            'last_reload_seconds': round(self.last_reload_seconds, 3) if self.last_reload_seconds else None,
+            'last_error': self.last_error,
+            'watching': self._watcher is not None,
+        }
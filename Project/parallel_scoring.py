@@ -0,0 +1,90 @@
+"""
+Parallel Scheme Scoring
+Rank large batches of profiles across a pool of worker processes
+
+Each worker loads the saved artifacts once, memory-mapped, when it starts; tasks carry
+only profile dictionaries and return (indices, scores) arrays. The scheme matrices are
+therefore shared through the page cache instead of being pickled or copied per worker.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from high_accuracy_model import HighAccuracyPredictor
+
+
+# The model loaded by this worker process (set by _init_worker)
+_predictor = None
+
+
+def _init_worker(directory):
+    """Load the memory-mapped model once per worker process"""
+    global _predictor
+    with contextlib.redirect_stdout(io.StringIO()):
+        _predictor = HighAccuracyPredictor.load_model(directory, mmap=True, fused=True)
+
+
+def _rank_chunk(task):
+    """Rank one chunk of profiles inside a worker"""
+    profiles, top_n, min_confidence = task
+    return _predictor.rank_schemes_batch(profiles, top_n, min_confidence)
+
+
+def worker_count(max_workers=None):
+    """max_workers if given, otherwise one worker per CPU"""
+    return max(1, max_workers) if max_workers else (os.cpu_count() or 1)
+
+
+class ParallelScorer:
+    """
+    Process pool that ranks profile chunks with a shared read-only model
+
+    Use as a context manager. The artifacts in directory must already exist
+    (e.g. written by HighAccuracyPredictor.from_artifacts in the parent).
+
+    Args:
+        directory: Artifact directory written by save_model
+        max_workers: Worker processes (default: CPU count); set it to cap the pool
+        chunk_size: Profiles per task; large enough to amortise the task round trip
+    """
+
+    def __init__(self, directory='models/', max_workers=None, chunk_size=2000):
+        self.workers = worker_count(max_workers)
+        self.chunk_size = chunk_size
+        # spawn: workers never inherit the parent's threads or heap-loaded model
+        self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                        mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_init_worker, initargs=(directory,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def rank_chunks(self, chunks, top_n=15, min_confidence=0):
+        """
+        Rank an iterable of profile lists, yielding one ranked list per input list in order
+
+        At most two tasks per worker are in flight, so a lazily read input
+        is never pulled into memory all at once.
+        """
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append([self.pool.submit(_rank_chunk, (chunk[i:i + self.chunk_size], top_n, min_confidence))
+                              for i in range(0, len(chunk), self.chunk_size)])
+            while sum(len(futures) for futures in in_flight) > 2 * self.workers:
+                yield [ranked for future in in_flight.popleft() for ranked in future.result()]
+        while in_flight:
+            yield [ranked for future in in_flight.popleft() for ranked in future.result()]
+
+    def rank(self, profiles, top_n=15, min_confidence=0):
+        """Same result as HighAccuracyPredictor.rank_schemes_batch, computed across the pool"""
+        return next(self.rank_chunks([profiles], top_n, min_confidence), [])
@@ -0,0 +1,128 @@
+"""
+Profile Input
+Validation of user profiles and chunked readers for CSV, JSONL and Parquet profile files
+"""
+
+import importlib.util
+import json
+import math
+import re
+
+import pandas as pd
+
+# Parquet files are read and written with pyarrow (listed in requirements.txt)
+PARQUET_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+
+# Profile fields and their types, as submitted by the HTML form
+PROFILE_FIELDS = {
+    'age': int,
+    'income': float,
+    'occupation': str,
+    'category': str,
+    'location': str,
+    'education': str,
+    'family_size': int,
+    'years_experience': int,
+}
+
+# PROFILE_FIELDS split by type, and the error for a bad number
+TEXT_FIELDS = [field for field, cast in PROFILE_FIELDS.items() if cast is str]
+NUMBER_FIELDS = [field for field, cast in PROFILE_FIELDS.items() if cast is not str]
+NUMBER_ERROR = "age, family_size and years_experience must be integers, income a number"
+
+# Optional column naming each profile (used for output file names)
+ID_COLUMNS = ('profile_id', 'id')
+
+
+def is_missing(value):
+    """None, or the NaN pandas reads for an empty CSV cell"""
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def parse_profile(raw):
+    """Validate one profile mapping, coercing fields the same way as the HTML form"""
+    if not isinstance(raw, dict):
+        raise ValueError("each profile must be a JSON object")
+    missing = [field for field in PROFILE_FIELDS if is_missing(raw.get(field))]
+    if missing:
+        raise ValueError(f"missing fields: {', '.join(missing)}")
+    # str() would otherwise turn a JSON number or list into text
+    if not all(isinstance(raw[field], str) for field in TEXT_FIELDS):
+        raise ValueError(f"{', '.join(TEXT_FIELDS)} must be strings")
+    # JSON true/false would otherwise pass int()/float() as 1/0
+    if any(isinstance(raw[field], bool) for field in NUMBER_FIELDS):
+        raise ValueError(NUMBER_ERROR)
+    try:
+        profile = {field: cast(raw[field]) for field, cast in PROFILE_FIELDS.items()}
+    except (TypeError, ValueError, OverflowError):
+        # OverflowError: int(float('inf'))
+        raise ValueError(NUMBER_ERROR)
+    # Flask's JSON parser accepts Infinity and NaN
+    if not all(math.isfinite(profile[field]) for field in NUMBER_FIELDS):
+        raise ValueError(NUMBER_ERROR)
+    return profile
+
+
+def profile_id(raw, row_number):
+    """The profile's own id if it has one, otherwise its 1-based row number"""
+    for column in ID_COLUMNS:
+        if not is_missing(raw.get(column)):
+            return str(raw[column])
+    return f'row-{row_number:07d}'
+
+
+def safe_filename(text):
+    """Profile id reduced to characters that are safe in a file name"""
+    return re.sub(r'[^\w\-.]', '_', text).strip('.') or '_'
+
+
+def iter_raw_chunks(path, chunk_size):
+    """Yield lists of raw profile dictionaries from a .csv, .jsonl or .parquet file"""
+    if path.endswith('.csv'):
+        # Text fields stay strings even when a column looks numeric (e.g. a PIN code)
+        for frame in pd.read_csv(path, chunksize=chunk_size, dtype={field: str for field in TEXT_FIELDS}):
+            yield frame.to_dict('records')
+    elif path.endswith(('.jsonl', '.ndjson')):
+        chunk = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    chunk.append(json.loads(line))
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+    elif path.endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet needs pyarrow (pip install pyarrow)")
+        # Row batches are decoded one at a time, so memory stays bounded
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+    else:
+        raise ValueError(f"Unsupported profile file {path}: expected .csv, .jsonl or .parquet")
+
+
+def iter_profile_chunks(path, chunk_size=1000):
+    """
+    Read profiles in chunks without loading the whole file
+
+    Yields:
+        (ids, profiles, errors) per chunk - parallel lists of profile ids and parsed
+        profiles, plus (id, message) pairs for rows that failed validation
+    """
+    row_number = 0
+    for raw_chunk in iter_raw_chunks(path, chunk_size):
+        ids, profiles, errors = [], [], []
+        for raw in raw_chunk:
+            row_number += 1
+            pid = profile_id(raw, row_number) if isinstance(raw, dict) else f'row-{row_number:07d}'
+            try:
+                profiles.append(parse_profile(raw))
+                ids.append(pid)
+            except ValueError as e:
+                errors.append((pid, str(e)))
+        yield ids, profiles, errors
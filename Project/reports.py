@@ -0,0 +1,153 @@
+"""
+Eligibility Report Generation
+Plain-text reports streamed one scheme at a time, and PDF reports drawn page by page
+"""
+
+from datetime import datetime
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfgen import canvas
+    PDF_AVAILABLE = True
+except ImportError:
+    PDF_AVAILABLE = False
+
+
+RULE = '=' * 80
+
+
+def report_filename(extension, now=None):
+    """Download name, e.g. scheme_report_20240101_120000.pdf"""
+    return f"scheme_report_{(now or datetime.now()).strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+
+def profile_lines(user_data, currency='₹'):
+    """The user profile as (label, value) pairs"""
+    income = user_data.get('income')
+    return [
+        ('Age', f"{user_data.get('age', 'N/A')} years"),
+        ('Annual Income', f"{currency}{income:,.0f}" if isinstance(income, (int, float)) else 'N/A'),
+        ('Occupation', user_data.get('occupation', 'N/A')),
+        ('Category', user_data.get('category', 'N/A')),
+        ('Location', user_data.get('location', 'N/A')),
+        ('Education', user_data.get('education', 'N/A')),
+        ('Family Size', user_data.get('family_size', 'N/A')),
+        ('Work Experience', f"{user_data.get('years_experience', 'N/A')} years"),
+    ]
+
+
+def text_header(user_data, scheme_count, now=None):
+    """Title, profile and match count of the text report"""
+    profile = '\n'.join(f"- {label}: {value}" for label, value in profile_lines(user_data))
+    return f"""
+GOVERNMENT SCHEME ELIGIBILITY REPORT
+Generated on: {(now or datetime.now()).strftime('%B %d, %Y at %I:%M %p')}
+{RULE}
+
+USER PROFILE:
+{profile}
+
+{RULE}
+MATCHING SCHEMES FOUND: {scheme_count}
+{RULE}
+
+"""
+
+
+def text_section(number, scheme):
+    """One scheme of the text report"""
+    return f"""
+{number}. {scheme['scheme_name']}
+{RULE}
+Confidence Score: {scheme['probability']:.1f}%
+Eligibility Status: {'✓ ELIGIBLE' if scheme['eligible'] else '✗ NOT ELIGIBLE'}
+Level: {scheme['level']}
+Category: {scheme['category']}
+
+BENEFITS:
+{scheme['benefits']}
+
+ELIGIBILITY CRITERIA:
+{scheme['eligibility']}
+
+DETAILS:
+{scheme['details']}
+
+{RULE}
+
+"""
+
+
+def iter_text_report(user_data, results, now=None):
+    """
+    Yield the plain-text report piece by piece
+
+    The header comes first and then one section per scheme, so a streaming
+    response can start sending before the last section is formatted.
+    """
+    yield text_header(user_data, len(results), now)
+    for number, scheme in enumerate(results, 1):
+        yield text_section(number, scheme)
+
+
+class PdfReportWriter:
+    """Draws report lines onto A4 pages, starting a new page whenever one is full"""
+
+    MARGIN = 50
+    LINE_HEIGHT = 14
+
+    def __init__(self, fileobj):
+        self.canvas = canvas.Canvas(fileobj, pagesize=A4, pageCompression=1)
+        self.width, self.height = A4
+        self.y = self.height - self.MARGIN
+
+    def line(self, text, font='Helvetica', size=10, indent=0):
+        """Write text, wrapped to the page width"""
+        width = self.width - 2 * self.MARGIN - indent
+        for wrapped in simpleSplit(str(text), font, size, width) or ['']:
+            if self.y < self.MARGIN:
+                # showPage() finalizes the page, so only the current page stays open
+                self.canvas.showPage()
+                self.y = self.height - self.MARGIN
+            self.canvas.setFont(font, size)
+            self.canvas.drawString(self.MARGIN + indent, self.y, wrapped)
+            self.y -= self.LINE_HEIGHT
+
+    def gap(self):
+        self.y -= self.LINE_HEIGHT / 2
+
+    def save(self):
+        self.canvas.save()
+
+
+def write_pdf_report(user_data, results, fileobj, now=None):
+    """
+    Render the report as a PDF into fileobj, one scheme at a time
+
+    Requires reportlab. The built-in PDF fonts have no rupee sign or check
+    marks, so those are spelled out.
+    """
+    pdf = PdfReportWriter(fileobj)
+    pdf.line('Government Scheme Eligibility Report', 'Helvetica-Bold', 16)
+    pdf.line(f"Generated on: {(now or datetime.now()).strftime('%B %d, %Y at %I:%M %p')}", size=9)
+    pdf.gap()
+
+    pdf.line('User Profile', 'Helvetica-Bold', 12)
+    for label, value in profile_lines(user_data, currency='Rs. '):
+        pdf.line(f"{label}: {value}", indent=10)
+    pdf.gap()
+    pdf.line(f'Matching Schemes Found: {len(results)}', 'Helvetica-Bold', 12)
+
+    for number, scheme in enumerate(results, 1):
+        pdf.gap()
+        pdf.line(f"{number}. {scheme['scheme_name']}", 'Helvetica-Bold', 11)
+        pdf.line(f"Confidence Score: {scheme['probability']:.1f}% | "
+                 f"{'ELIGIBLE' if scheme['eligible'] else 'NOT ELIGIBLE'} | "
+                 f"{scheme['level']} | {scheme['category']}", size=9)
+        for heading, field in (('Benefits', 'benefits'), ('Eligibility Criteria', 'eligibility'),
+                               ('Details', 'details')):
+            pdf.line(heading, 'Helvetica-Bold', 9)
+            pdf.line(scheme[field], size=9, indent=10)
+
+    pdf.save()
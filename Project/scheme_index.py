@@ -0,0 +1,105 @@
+"""
+Scheme Catalogue Index
+Precomputed filter indexes and pagination for the dataset browser
+"""
+
+from collections import defaultdict
+
+import numpy as np
+
+
+MAX_PER_PAGE = 100
+SUMMARY_LENGTH = 200
+
+
+def postings(keys_per_row):
+    """Map each key to the sorted row positions it occurs in"""
+    index = defaultdict(list)
+    for position, keys in enumerate(keys_per_row):
+        for key in set(keys):
+            index[key].append(position)
+    return {key: np.array(rows, dtype=np.int32) for key, rows in index.items()}
+
+
+class SchemeCatalogIndex:
+    """Level and category postings over the scheme catalogue, built once at load time"""
+
+    def __init__(self, schemes_df, search_index):
+        """
+        Args:
+            schemes_df: The predictor's schemes DataFrame (row position = scheme id)
+            search_index: SchemeSearchIndex over the same DataFrame, for free-text filters
+        """
+        self.schemes_df = schemes_df
+        self.search_index = search_index
+        self.size = len(schemes_df)
+
+        self.by_level = postings([level] if level else [] for level in schemes_df['level'])
+        # schemeCategory holds comma-separated categories; a scheme is listed under each
+        self.by_category = postings(
+            [c.strip() for c in categories.split(',') if c.strip()] for categories in schemes_df['schemeCategory'])
+
+    def levels(self):
+        """(level, scheme count) pairs, largest first"""
+        return sorted(((level, len(rows)) for level, rows in self.by_level.items()), key=lambda item: -item[1])
+
+    def categories(self):
+        """(category, scheme count) pairs in alphabetical order"""
+        return sorted((category, len(rows)) for category, rows in self.by_category.items())
+
+    def filter(self, level=None, category=None, query=None):
+        """
+        Sorted positions of the schemes matching every given filter
+
+        Args:
+            level: Exact level, e.g. 'Central' or 'State'
+            category: One of the comma-separated schemeCategory entries
+            query: Free-text words, all of which must appear in the scheme's indexed text
+        """
+        selected = []
+        if level:
+            selected.append(self.by_level.get(level, np.empty(0, dtype=np.int32)))
+        if category:
+            selected.append(self.by_category.get(category, np.empty(0, dtype=np.int32)))
+        if query:
+            keyword_rows = self.search_index.matching(query)
+            if keyword_rows is not None:
+                selected.append(keyword_rows)
+
+        if not selected:
+            return np.arange(self.size, dtype=np.int32)
+        # Intersect the smallest postings first
+        selected.sort(key=len)
+        positions = selected[0]
+        for rows in selected[1:]:
+            positions = np.intersect1d(positions, rows, assume_unique=True)
+        return positions
+
+    def page(self, positions, page=1, per_page=20):
+        """
+        One page of summary records for the given scheme positions
+
+        Returns:
+            Dictionary with the page records and the paging totals
+        """
+        per_page = max(1, min(per_page, MAX_PER_PAGE))
+        total = len(positions)
+        pages = max(1, -(-total // per_page))
+        page = max(1, min(page, pages))
+        selected = positions[(page - 1) * per_page:page * per_page]
+
+        rows = self.schemes_df.iloc[selected]
+        schemes = [
+            {
+                'scheme_id': f'SCH{position:04d}',
+                'scheme_name': name,
+                'slug': slug,
+                'level': level,
+                'category': category,
+                'summary': details[:SUMMARY_LENGTH] + '...' if len(details) > SUMMARY_LENGTH else details,
+            }
+            for position, name, slug, level, category, details in zip(
+                selected, rows['scheme_name'], rows['slug'], rows['level'],
+                rows['schemeCategory'], rows['details'])
+        ]
+        return {'page': page, 'per_page': per_page, 'pages': pages, 'total': total, 'schemes': schemes}
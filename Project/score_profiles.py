@@ -0,0 +1,194 @@
+"""
+Batch Scheme Scoring
+Stream a file of profiles through HighAccuracyPredictor and write each profile's top-k schemes
+
+Run with: python score_profiles.py profiles.csv scores.csv [--top-k 10] [--min-confidence 60]
+          python score_profiles.py profiles.parquet scores.parquet --workers 8
+
+Input (.csv, .jsonl or .parquet) is read chunk by chunk and output is appended per chunk,
+so peak memory depends on --chunk-size, not on the size of the input file.
+Output has one row per (profile, scheme): profile_id, rank, scheme_id, slug, score, confidence.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from high_accuracy_model import HighAccuracyPredictor, confidence_from_scores
+from parallel_scoring import ParallelScorer
+from profile_io import PARQUET_AVAILABLE, iter_profile_chunks
+
+
+OUTPUT_COLUMNS = ['profile_id', 'rank', 'scheme_id', 'slug', 'score', 'confidence']
+# Invalid profiles beyond this many are counted but not printed
+MAX_REPORTED_ERRORS = 20
+
+
+class CsvScoreWriter:
+    """Appends score frames to one CSV file, writing the header once"""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.header = True
+
+    def write(self, frame):
+        frame.to_csv(self.file, header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetScoreWriter:
+    """Appends score frames to one Parquet file, one row group per chunk"""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Writing Parquet needs pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.schema = pa.schema([('profile_id', pa.string()), ('rank', pa.int32()),
+                                 ('scheme_id', pa.string()), ('slug', pa.string()),
+                                 ('score', pa.float32()), ('confidence', pa.float32())])
+        self.writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+
+    def write(self, frame):
+        if len(frame):
+            self.writer.write_table(self.pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False))
+
+    def close(self):
+        self.writer.close()
+
+
+def open_writer(path):
+    """Score writer chosen by the output file extension"""
+    if path.endswith('.parquet'):
+        return ParquetScoreWriter(path)
+    if path.endswith('.csv'):
+        return CsvScoreWriter(path)
+    raise ValueError(f"Unsupported output file {path}: expected .csv or .parquet")
+
+
+def score_frame(slugs, ids, ranked, min_confidence):
+    """Long-format top-k rows for one chunk of ranked profiles"""
+    profile_ids, ranks, positions, scores = [], [], [], []
+    for pid, (indices, row_scores) in zip(ids, ranked):
+        keep = confidence_from_scores(row_scores) >= min_confidence
+        indices, row_scores = indices[keep], row_scores[keep]
+        profile_ids.extend([pid] * len(indices))
+        ranks.append(np.arange(1, len(indices) + 1, dtype=np.int32))
+        positions.append(indices)
+        scores.append(row_scores)
+
+    positions = np.concatenate(positions) if positions else np.empty(0, dtype=int)
+    scores = np.concatenate(scores) if scores else np.empty(0)
+    return pd.DataFrame({
+        'profile_id': profile_ids,
+        'rank': np.concatenate(ranks) if ranks else np.empty(0, dtype=np.int32),
+        'scheme_id': np.char.mod('SCH%04d', positions) if len(positions) else np.empty(0, dtype=str),
+        'slug': slugs[positions],
+        'score': scores.round(6).astype(np.float32),
+        'confidence': confidence_from_scores(scores).round(1).astype(np.float32),
+    }, columns=OUTPUT_COLUMNS)
+
+
+def iter_ranked_chunks(predictor, chunks, top_k, min_confidence, scorer=None):
+    """Yield (ids, errors, ranked) per input chunk, ranked in-process or across the scorer's pool"""
+    if scorer is None:
+        for ids, profiles, errors in chunks:
+            yield ids, errors, predictor.rank_schemes_batch(profiles, top_k, min_confidence)
+        return
+    # The pool needs only the profiles; ids and errors wait here in submission order
+    waiting = []
+
+    def profiles_only():
+        for ids, profiles, errors in chunks:
+            waiting.append((ids, errors))
+            yield profiles
+
+    for ranked in scorer.rank_chunks(profiles_only(), top_k, min_confidence):
+        ids, errors = waiting.pop(0)
+        yield ids, errors, ranked
+
+
+def score_file(input_path, output_path, top_k=10, min_confidence=0, chunk_size=10000,
+               data_path='updated_data.csv', models_dir='models/', workers=1):
+    """
+    Score every profile in input_path and write its top-k schemes to output_path
+
+    Args:
+        workers: Scoring processes; 1 scores in this process, more use a ParallelScorer
+
+    Returns:
+        Dictionary of counts and timings
+    """
+    predictor = HighAccuracyPredictor.from_artifacts(data_path, models_dir, mmap=True, fused=True)
+    slugs = predictor.schemes_df['slug'].to_numpy()
+    writer = open_writer(output_path)
+    scorer = ParallelScorer(models_dir, max_workers=workers) if workers > 1 else None
+    if scorer:
+        print(f"⚡ Scoring with {scorer.workers} worker processes")
+
+    stats = {'profiles': 0, 'invalid': 0, 'rows': 0}
+    start = time.perf_counter()
+    try:
+        chunks = iter_profile_chunks(input_path, chunk_size)
+        for ids, errors, ranked in iter_ranked_chunks(predictor, chunks, top_k, min_confidence, scorer):
+            for pid, message in errors:
+                stats['invalid'] += 1
+                if stats['invalid'] <= MAX_REPORTED_ERRORS:
+                    print(f"\n⚠️ Skipping profile {pid}: {message}")
+            if ids:
+                frame = score_frame(slugs, ids, ranked, min_confidence)
+                writer.write(frame)
+                stats['rows'] += len(frame)
+            stats['profiles'] += len(ids)
+
+            elapsed = time.perf_counter() - start
+            sys.stdout.write(f"\r   {stats['profiles']:,} profiles scored | "
+                             f"{stats['profiles'] / max(elapsed, 1e-9):,.0f} profiles/sec")
+            sys.stdout.flush()
+    finally:
+        writer.close()
+        if scorer:
+            scorer.close()
+
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('input', help='Profiles as .csv, .jsonl or .parquet')
+    parser.add_argument('output', help='Scores as .csv or .parquet')
+    parser.add_argument('--top-k', type=int, default=10, help='Schemes written per profile')
+    parser.add_argument('--min-confidence', type=float, default=0, help='Drop schemes below this confidence')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='Profiles read and scored per chunk')
+    parser.add_argument('--workers', type=int, default=1, help='Scoring processes (1 = score in this process)')
+    parser.add_argument('--data', default='updated_data.csv', help='Scheme dataset CSV')
+    parser.add_argument('--models', default='models/', help='Saved model directory')
+    args = parser.parse_args()
+
+    if not PARQUET_AVAILABLE and (args.input.endswith('.parquet') or args.output.endswith('.parquet')):
+        parser.error("Parquet files need pyarrow (pip install pyarrow); use .csv or .jsonl instead")
+
+    print("\n" + "="*70)
+    print("BATCH SCHEME SCORING")
+    print("="*70)
+    stats = score_file(args.input, args.output, args.top_k, args.min_confidence, args.chunk_size,
+                       args.data, args.models, args.workers)
+
+    print("\n" + "="*70)
+    print(f"✅ Scored {stats['profiles']:,} profiles in {stats['seconds']:.1f}s "
+          f"({stats['profiles'] / max(stats['seconds'], 1e-9):,.0f} profiles/sec)")
+    print(f"   Rows written: {stats['rows']:,} to {args.output} | invalid profiles: {stats['invalid']:,}")
+    print("="*70 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Scheme Full-Text Search
+BM25-ranked inverted index over the scheme catalogue with prefix autocomplete
+"""
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import CountVectorizer
+
+from high_accuracy_model import advanced_clean_column, clean_text, top_k
+
+
+# Scheme names are indexed this many times, so title matches outrank body matches
+NAME_WEIGHT = 2
+MAX_RESULTS = 50
+
+
+def query_terms(text):
+    """Index terms of a query: advanced_clean tokens, de-duplicated in order"""
+    return list(dict.fromkeys(clean_text(text).split()))
+
+
+class SchemeSearchIndex:
+    """
+    Inverted index of scheme_name, eligibility, benefits and schemeCategory
+
+    Postings are stored term-major as a CSR matrix whose values are the
+    precomputed BM25 weights, so a query only sums the rows of its terms.
+    """
+
+    def __init__(self, schemes_df, k1=1.5, b=0.75):
+        """
+        Args:
+            schemes_df: The predictor's schemes DataFrame with its clean_* columns
+            k1: BM25 term-frequency saturation
+            b: BM25 document-length normalization
+        """
+        names = advanced_clean_column(schemes_df['scheme_name'])
+        documents = ((names + ' ') * NAME_WEIGHT + schemes_df['clean_category'] + ' '
+                     + schemes_df['clean_eligibility'] + ' ' + schemes_df['clean_benefits'])
+
+        # Whitespace split of the cleaned text is exactly the advanced_clean tokenization
+        vectorizer = CountVectorizer(analyzer=str.split)
+        counts = vectorizer.fit_transform(documents)
+        self.vocabulary = vectorizer.vocabulary_
+        self.terms = vectorizer.get_feature_names_out()  # sorted, for prefix lookups
+        self.size = counts.shape[0]
+
+        doc_lengths = np.asarray(counts.sum(axis=1)).ravel()
+        self.doc_freq = np.bincount(counts.indices, minlength=len(self.terms))
+        idf = np.log1p((self.size - self.doc_freq + 0.5) / (self.doc_freq + 0.5))
+
+        tf = counts.data.astype(np.float64)
+        lengths = np.repeat(doc_lengths / doc_lengths.mean(), np.diff(counts.indptr))
+        weights = idf[counts.indices] * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths))
+        self.postings = csr_matrix((weights, counts.indices, counts.indptr), shape=counts.shape).T.tocsr()
+
+        self.levels = schemes_df['level'].to_numpy()
+
+    def term_ids(self, text):
+        """Vocabulary ids of the query terms, or None if any term is not indexed"""
+        ids = [self.vocabulary.get(term) for term in query_terms(text)]
+        return None if None in ids else ids
+
+    def term_postings(self, term_id):
+        """(document positions, BM25 weights) of one term"""
+        start, end = self.postings.indptr[term_id], self.postings.indptr[term_id + 1]
+        return self.postings.indices[start:end], self.postings.data[start:end]
+
+    def matching(self, text):
+        """Sorted positions of the schemes containing every query term"""
+        ids = self.term_ids(text)
+        if ids is None:
+            return np.empty(0, dtype=np.int32)
+        if not ids:
+            return None
+        # Intersect the rarest terms first
+        ids.sort(key=lambda term_id: self.doc_freq[term_id])
+        positions = self.term_postings(ids[0])[0]
+        for term_id in ids[1:]:
+            positions = np.intersect1d(positions, self.term_postings(term_id)[0], assume_unique=True)
+        return positions
+
+    def search(self, text, level=None, limit=10, match_all=True):
+        """
+        BM25-ranked schemes for a keyword query
+
+        Args:
+            text: Free-text query, cleaned like the catalogue
+            level: Only return schemes of this level, e.g. 'Central'
+            limit: Maximum number of results (at most MAX_RESULTS)
+            match_all: Require every query term (AND); False ranks any match (OR)
+
+        Returns:
+            (positions, scores, total) - best first, total counting every match
+        """
+        terms = query_terms(text)
+        ids = [self.vocabulary[term] for term in terms if term in self.vocabulary]
+        if not ids or (match_all and len(ids) < len(terms)):
+            return np.empty(0, dtype=np.int32), np.empty(0), 0
+
+        positions, weights = zip(*(self.term_postings(term_id) for term_id in ids))
+        positions, inverse = np.unique(np.concatenate(positions), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(weights))
+
+        keep = np.ones(len(positions), dtype=bool)
+        if match_all and len(ids) > 1:
+            keep &= np.bincount(inverse) == len(ids)
+        if level:
+            keep &= self.levels[positions] == level
+        positions, scores = positions[keep], scores[keep]
+
+        best = top_k(scores, max(0, min(limit, MAX_RESULTS)))
+        return positions[best], scores[best], len(positions)
+
+    def suggest(self, prefix, limit=10):
+        """
+        Autocomplete the last word of prefix from the index vocabulary
+
+        Returns:
+            (term, scheme count) pairs, most common terms first
+        """
+        words = prefix.lower().split()
+        if not words:
+            return []
+        start = np.searchsorted(self.terms, words[-1], side='left')
+        end = np.searchsorted(self.terms, words[-1] + '\U0010ffff', side='left')
+        best = start + top_k(self.doc_freq[start:end], limit)
+        return [(self.terms[i], int(self.doc_freq[i])) for i in best]
@@ -0,0 +1,128 @@
+"""
+Shared fixtures: a small synthetic scheme catalogue and predictors fitted on it
+
+The modules live flat in Project/, so that directory is put on the import path.
+"""
+
+import csv
+import os
+import random
+import sys
+
+import pytest
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+WORDS = ("scheme financial assistance government provide support students scholarship farmers "
+         "agriculture crop loan subsidy women girl child senior citizen elderly pension old age youth "
+         "young 18-35 minor below 18 under 18 bpl poor poverty low income ews sc st obc sc/st scheduled "
+         "caste tribe minority disability pwd msme business entrepreneur startup training skill iti "
+         "diploma rs lakh crore govt pvt ngo education college university health insurance housing "
+         "rural urban employment worker labour construction unorganized widow mother applicant must "
+         "be resident of state family annual income should not exceed age between years").split()
+CATEGORIES = ["Education & Learning", "Agriculture,Rural & Environment", "Social welfare & Empowerment",
+              "Business & Entrepreneurship", "Health & Wellness", "Women and Child", "Skills & Employment"]
+COLUMNS = ["scheme_name", "slug", "details", "benefits", "eligibility", "application", "documents",
+           "level", "schemeCategory", "tags"]
+
+PROFILES = [
+    {'age': 20, 'income': 150000, 'occupation': 'Student', 'category': 'General',
+     'location': 'Delhi', 'education': 'Undergraduate', 'family_size': 4, 'years_experience': 0},
+    {'age': 65, 'income': 80000, 'occupation': 'Retired', 'category': 'General',
+     'location': 'Maharashtra', 'education': 'Graduate', 'family_size': 2, 'years_experience': 40},
+    {'age': 35, 'income': 60000, 'occupation': 'Farmer', 'category': 'SC',
+     'location': 'Punjab', 'education': 'High School', 'family_size': 6, 'years_experience': 15},
+    {'age': 28, 'income': 250000, 'occupation': 'MSME', 'category': 'Women',
+     'location': 'Kerala', 'education': 'Postgraduate', 'family_size': 3, 'years_experience': 5},
+    {'age': 15, 'income': 40000, 'occupation': 'Student', 'category': 'ST',
+     'location': 'Bihar', 'education': 'Primary', 'family_size': 5, 'years_experience': 0},
+]
+
+
+def scheme_rows(count, seed=0, start=0):
+    """count synthetic scheme rows in the dataset's CSV layout"""
+    rng = random.Random(seed)
+
+    def text(words):
+        return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+    rows = []
+    for i in range(start, start + count):
+        rows.append({
+            'scheme_name': f"Scheme {i} " + text(4),
+            'slug': f"scheme-{i}",
+            'details': text(rng.randint(20, 120)),
+            'benefits': text(rng.randint(10, 80)),
+            'eligibility': text(rng.randint(10, 80)),
+            'application': text(20),
+            'documents': text(10),
+            'level': rng.choice(["Central", "State"]),
+            'schemeCategory': ", ".join(rng.sample(CATEGORIES, rng.randint(1, 2))),
+            'tags': 'tag',
+        })
+    return rows
+
+
+def write_catalogue(path, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def catalogue_csv(tmp_path_factory):
+    """Path of a 150-scheme synthetic catalogue"""
+    return write_catalogue(tmp_path_factory.mktemp('data') / 'schemes.csv', scheme_rows(150))
+
+
+@pytest.fixture(scope='session')
+def predictor(catalogue_csv):
+    """Predictor fitted on catalogue_csv, with the three separate matrices only"""
+    from high_accuracy_model import HighAccuracyPredictor
+    return HighAccuracyPredictor(catalogue_csv)
+
+
+@pytest.fixture(scope='session')
+def fused_predictor(catalogue_csv):
+    """Predictor fitted on catalogue_csv that scores with the fused matrix"""
+    from high_accuracy_model import HighAccuracyPredictor
+    return HighAccuracyPredictor(catalogue_csv, fused=True)
+
+
+@pytest.fixture
+def profiles():
+    return [dict(profile) for profile in PROFILES]
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """
+    app_realdata, started against a synthetic updated_data.csv
+
+    The app reads updated_data.csv and models/ relative to the working directory at
+    import time, so it is imported from a scratch directory holding the catalogue.
+    """
+    directory = tmp_path_factory.mktemp('app')
+    write_catalogue(directory / 'updated_data.csv', scheme_rows(150))
+    os.environ['MODEL_WATCH_INTERVAL'] = '0'
+    os.environ['ADMIN_TOKEN'] = 'test-admin-token'
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        import app_realdata
+    finally:
+        os.chdir(cwd)
+    app_realdata.app.config['TESTING'] = True
+    app_realdata.test_directory = directory
+    return app_realdata
+
+
+@pytest.fixture
+def client(app_module, monkeypatch):
+    """Flask test client, run from the app's data directory"""
+    monkeypatch.chdir(app_module.test_directory)
+    return app_module.app.test_client()
@@ -0,0 +1,198 @@
+"""Flask routes of app_realdata against a synthetic catalogue"""
+
+import json
+import time
+
+import pandas as pd
+import pytest
+
+from conftest import PROFILES
+
+
+def report_query(report_format=None):
+    query = {'user_data': json.dumps(PROFILES[0])}
+    if report_format:
+        query['format'] = report_format
+    return query
+
+
+def test_report_download_defaults_to_streamed_text(client):
+    response = client.get('/download_pdf', query_string=report_query())
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    assert '.txt' in response.headers['Content-Disposition']
+    assert response.get_data(as_text=True).strip()
+
+
+def test_report_download_rejects_unknown_format(client):
+    assert client.get('/download_pdf', query_string=report_query('doc')).status_code == 400
+
+
+def test_report_download_needs_user_data(client):
+    assert client.get('/download_pdf').status_code == 400
+
+
+def test_admin_reload_needs_the_token(client):
+    assert client.get('/api/admin/reload').status_code == 403
+    assert client.post('/api/admin/reload', headers={'X-Admin-Token': 'wrong'}).status_code == 403
+    response = client.get('/api/admin/reload', headers={'X-Admin-Token': 'test-admin-token'})
+    assert response.status_code == 200
+    assert response.get_json()['reloading'] is False
+
+
+def test_admin_reload_swaps_in_a_new_version(client, app_module):
+    version = app_module.reloader.version
+    response = client.post('/api/admin/reload', headers={'X-Admin-Token': 'test-admin-token'})
+    assert response.status_code == 202
+    deadline = time.monotonic() + 60
+    while app_module.reloader.status()['reloading'] and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert app_module.reloader.version == version + 1
+    assert app_module.reloader.last_error is None
+
+
+def test_predict_api_single_and_batch_agree_with_the_model(client, app_module):
+    response = client.post('/api/v1/predict?top_n=5', json=PROFILES[0])
+    assert response.status_code == 200
+    single = response.get_json()['schemes']
+
+    response = client.post('/api/v1/predict?top_n=5', json=PROFILES)
+    body = response.get_json()
+    assert body['count'] == len(PROFILES)
+    assert body['results'][0]['schemes'] == single
+
+    predictor = app_module.reloader.current.predictor
+    for result, (indices, scores) in zip(body['results'], predictor.rank_schemes_batch(PROFILES, 5)):
+        assert [match['scheme_id'] for match in result['schemes']] == [f'SCH{i:04d}' for i in indices]
+        assert [match['slug'] for match in result['schemes']] == predictor.schemes_df['slug'].iloc[indices].tolist()
+
+
+def test_predict_api_min_confidence(client):
+    schemes = client.post('/api/v1/predict?top_n=50&min_confidence=60', json=PROFILES[1]).get_json()['schemes']
+    assert all(match['confidence'] >= 60 for match in schemes)
+
+
+@pytest.mark.parametrize('body, query, status', [
+    ('not json', '', 400),
+    ([], '', 400),
+    ([PROFILES[0], 'x'], '', 400),
+    (dict(PROFILES[0], age='twenty'), '', 400),
+    (dict(PROFILES[0], age=True), '', 400),
+    # json.dumps writes these as Infinity, which Flask's parser accepts
+    (json.dumps(dict(PROFILES[0], age=float('inf'))), '', 400),
+    (json.dumps(dict(PROFILES[0], income=float('inf'))), '', 400),
+    (dict(PROFILES[0], occupation=5), '', 400),
+    ({k: v for k, v in PROFILES[0].items() if k != 'income'}, '', 400),
+    (PROFILES[0], '?top_n=0', 400),
+    (PROFILES[0], '?top_n=501', 400),
+])
+def test_predict_api_rejects_bad_requests(client, body, query, status):
+    if isinstance(body, str):
+        response = client.post('/api/v1/predict' + query, data=body, content_type='application/json')
+    else:
+        response = client.post('/api/v1/predict' + query, json=body)
+    assert response.status_code == status
+    assert 'error' in response.get_json()
+
+
+def test_predict_api_limits_batch_size(client, app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'API_MAX_PROFILES', 2)
+    assert client.post('/api/v1/predict', json=PROFILES[:3]).status_code == 413
+
+
+def catalogue(app_module):
+    """The CSV the app was started on"""
+    return pd.read_csv(app_module.test_directory / 'updated_data.csv')
+
+
+def test_dataset_pages_cover_the_catalogue_in_order(client, app_module):
+    ids = []
+    for page in range(1, 5):
+        body = client.get('/api/dataset', query_string={'page': page, 'per_page': 40}).get_json()
+        assert body['page'] == page and body['pages'] == 4 and body['total'] == 150
+        ids += [scheme['scheme_id'] for scheme in body['schemes']]
+    assert ids == [f'SCH{i:04d}' for i in range(150)]
+    assert [s['slug'] for s in client.get('/api/dataset').get_json()['schemes']] == \
+        catalogue(app_module)['slug'].tolist()[:20]
+
+
+def test_dataset_filters_match_the_catalogue(client, app_module):
+    from high_accuracy_model import clean_text
+    df = catalogue(app_module)
+    category = 'Health & Wellness'
+    expected = [f'SCH{i:04d}' for i, (level, categories, name) in
+                enumerate(zip(df['level'], df['schemeCategory'], df['scheme_name']))
+                if level == 'State' and category in categories.split(', ')
+                and 'scheme' in clean_text(f'{name} {categories}').split()]
+    assert expected
+    body = client.get('/api/dataset', query_string={'level': 'State', 'category': category, 'q': 'Scheme',
+                                                    'per_page': 100}).get_json()
+    assert body['total'] == len(expected)
+    assert [scheme['scheme_id'] for scheme in body['schemes']] == expected
+
+
+def test_dataset_clamps_paging(client):
+    body = client.get('/api/dataset', query_string={'page': 99, 'per_page': 1000}).get_json()
+    assert body['per_page'] == 100 and body['pages'] == 2 and body['page'] == 2
+    assert len(body['schemes']) == 50
+    assert client.get('/api/dataset', query_string={'q': 'zzzunknown'}).get_json()['total'] == 0
+
+
+def scheme_terms(app_module):
+    """Set of cleaned words of each scheme's name, category, eligibility and benefits"""
+    from high_accuracy_model import clean_text
+    df = app_module.reloader.current.predictor.schemes_df
+    return [set(clean_text(name).split()) | set(f'{category} {eligibility} {benefits}'.split())
+            for name, category, eligibility, benefits in
+            zip(df['scheme_name'], df['clean_category'], df['clean_eligibility'], df['clean_benefits'])]
+
+
+@pytest.mark.parametrize('mode', ['all', 'any'])
+def test_search_finds_exactly_the_matching_schemes(client, app_module, mode):
+    terms = scheme_terms(app_module)
+    query = ['scholarship', 'farmers']
+    match = all if mode == 'all' else any
+    expected = {f'SCH{i:04d}' for i, words in enumerate(terms) if match(q in words for q in query)}
+    assert expected
+
+    body = client.get('/api/search', query_string={'q': ' '.join(query), 'mode': mode, 'limit': 50}).get_json()
+    assert body['total'] == len(expected)
+    assert {r['scheme_id'] for r in body['results']} <= expected
+    assert len(body['results']) == min(50, len(expected))
+    scores = [r['score'] for r in body['results']]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_filters_and_limits(client):
+    body = client.get('/api/search', query_string={'q': 'scheme', 'level': 'State', 'limit': 3}).get_json()
+    assert 0 < len(body['results']) <= 3
+    assert all(r['level'] == 'State' for r in body['results'])
+    assert client.get('/api/search', query_string={'q': 'zzzunknown'}).get_json()['total'] == 0
+
+
+@pytest.mark.parametrize('query', [{}, {'q': '  '}, {'q': 'scheme', 'mode': 'some'}])
+def test_search_rejects_bad_queries(client, query):
+    assert client.get('/api/search', query_string=query).status_code == 400
+
+
+def test_search_suggest_completes_the_last_word(client):
+    suggestions = client.get('/api/search/suggest', query_string={'q': 'pension sch'}).get_json()['suggestions']
+    assert suggestions and all(s['term'].startswith('sch') for s in suggestions)
+    counts = [s['schemes'] for s in suggestions]
+    assert counts == sorted(counts, reverse=True)
+
+
+@pytest.mark.parametrize('url', ['/', '/dataset', '/insights'])
+def test_prerendered_pages_revalidate_with_etag(client, url):
+    first = client.get(url)
+    assert first.status_code == 200 and first.data
+    etag = first.headers['ETag']
+    assert 'no-cache' in first.headers['Cache-Control']
+
+    again = client.get(url, headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.data == b''
+    assert again.headers['ETag'] == etag
+
+    stale = client.get(url, headers={'If-None-Match': '"something-else"'})
+    assert stale.status_code == 200 and stale.data == first.data
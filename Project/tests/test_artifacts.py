@@ -0,0 +1,108 @@
+"""Saving, loading and rebuilding model artifacts"""
+
+import contextlib
+import io
+import os
+import time
+
+import numpy as np
+import pytest
+
+from conftest import scheme_rows, write_catalogue
+from high_accuracy_model import METADATA_FILE, HighAccuracyPredictor
+from model_reloader import ModelReloader
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    data_path = write_catalogue(tmp_path / 'updated_data.csv', scheme_rows(60))
+    models = str(tmp_path / 'models')
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor = HighAccuracyPredictor.from_artifacts(data_path, models)
+    return data_path, models, predictor
+
+
+def test_loaded_model_predicts_like_the_fitted_one(artifacts, profiles):
+    data_path, models, predictor = artifacts
+    with contextlib.redirect_stdout(io.StringIO()):
+        loaded = HighAccuracyPredictor.load_model(models, data_path=data_path)
+        for profile in profiles:
+            assert loaded.predict_schemes(profile, top_n=20) == predictor.predict_schemes(profile, top_n=20)
+
+
+def test_mmap_load_shares_the_saved_arrays(artifacts, profiles):
+    data_path, models, predictor = artifacts
+    with contextlib.redirect_stdout(io.StringIO()):
+        mapped = HighAccuracyPredictor.load_model(models, data_path=data_path, mmap=True)
+    # Read-only views of the files rather than private copies
+    assert not mapped.eligibility_vectors.data.flags.writeable
+    assert isinstance(mapped.age_boost_table, np.memmap)
+    for profile in profiles:
+        assert mapped.predict_schemes(profile, top_n=20) == predictor.predict_schemes(profile, top_n=20)
+
+
+def test_changed_dataset_is_rebuilt(artifacts):
+    data_path, models, predictor = artifacts
+    write_catalogue(data_path, scheme_rows(70, seed=5))
+    with pytest.raises(ValueError, match='stale'):
+        HighAccuracyPredictor.load_model(models, data_path=data_path)
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        rebuilt = HighAccuracyPredictor.from_artifacts(data_path, models)
+    assert 'rebuilding' in output.getvalue()
+    assert len(rebuilt.schemes_df) == 70
+    # The re-saved artifacts match the new dataset
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        HighAccuracyPredictor.from_artifacts(data_path, models)
+    assert 'rebuilding' not in output.getvalue()
+
+
+def test_save_model_leaves_only_artifacts(artifacts):
+    data_path, models, predictor = artifacts
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.save_model(models)
+    names = os.listdir(models)
+    assert METADATA_FILE in names
+    assert not [name for name in names if name.startswith('.save-') or name.endswith('.tmp')]
+
+
+@pytest.mark.parametrize('damage', ['truncate', 'garbage'])
+def test_unreadable_pickle_is_rebuilt(artifacts, damage, profiles):
+    data_path, models, predictor = artifacts
+    path = os.path.join(models, 'high_acc_vectorizer_elig.pkl')
+    with open(path, 'rb') as f:
+        content = f.read()
+    with open(path, 'wb') as f:
+        f.write(content[:len(content) // 2] if damage == 'truncate' else b'not a pickle' * 10)
+
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        rebuilt = HighAccuracyPredictor.from_artifacts(data_path, models, mmap=True, fused=True)
+    assert 'rebuilding' in output.getvalue()
+    assert not [name for name in os.listdir(models) if name.startswith('.save-')]
+    np.testing.assert_allclose(rebuilt.score_profiles(profiles), predictor.score_profiles(profiles))
+    # The rebuilt artifacts load directly again
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        HighAccuracyPredictor.from_artifacts(data_path, models, fused=True)
+    assert 'rebuilding' not in output.getvalue()
+
+
+def test_watcher_ignores_files_written_by_its_own_reload(tmp_path):
+    watched = tmp_path / 'metadata.json'
+    watched.write_text('0')
+    builds = []
+
+    def build_state():
+        # Like a refit after a dataset change: the reload rewrites a watched file
+        builds.append(len(builds))
+        watched.write_text(str(len(builds)) * len(builds))
+        return object()
+
+    reloader = ModelReloader(build_state, state=object())
+    reloader.watch([str(watched)], interval=0.05)
+    time.sleep(0.2)  # let the watcher take its first signature
+    watched.write_text('changed')
+    deadline = time.monotonic() + 10
+    while not builds and time.monotonic() < deadline:
+        time.sleep(0.05)
+    time.sleep(0.5)  # ten more polls
+    assert builds == [0]
+    assert reloader.version == 2
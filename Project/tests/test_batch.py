@@ -0,0 +1,60 @@
+"""predict_schemes_batch and rank_schemes_batch against one predict_schemes call per profile"""
+
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from benchmarks import random_profiles
+from conftest import scheme_rows, write_catalogue
+from high_accuracy_model import HighAccuracyPredictor, top_k
+
+PROFILES = random_profiles(40, seed=1)
+
+
+def assert_same_results(batch, single):
+    assert [r['scheme_id'] for r in batch] == [r['scheme_id'] for r in single]
+    np.testing.assert_allclose([r['similarity_score'] for r in batch],
+                               [r['similarity_score'] for r in single], rtol=1e-12)
+    strip = lambda results: [{k: v for k, v in r.items() if k not in ('similarity_score', 'probability')}
+                             for r in results]
+    assert strip(batch) == strip(single)
+
+
+@pytest.mark.parametrize('scorer', ['predictor', 'fused_predictor'])
+@pytest.mark.parametrize('top_n, min_confidence', [(15, 0), (50, 45), (500, 60)])
+def test_batch_matches_single(request, scorer, top_n, min_confidence, capsys):
+    predictor = request.getfixturevalue(scorer)
+    batch = predictor.predict_schemes_batch(PROFILES, top_n, min_confidence, chunk_size=7)
+    assert len(batch) == len(PROFILES)
+    for profile, results in zip(PROFILES, batch):
+        assert_same_results(results, predictor.predict_schemes(profile, top_n, min_confidence))
+
+
+def test_tied_scores_select_the_same_schemes(tmp_path, capsys):
+    # Each scheme appears three times under different slugs, so every score is tied
+    rows = [dict(row, slug=f'{row["slug"]}-{copy}') for row in scheme_rows(30) for copy in range(3)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor = HighAccuracyPredictor(write_catalogue(tmp_path / 'tied.csv', rows), fused=True)
+    for top_n in (1, 2, 4, 8, 20):
+        batch = predictor.predict_schemes_batch(PROFILES[:10], top_n, 0, chunk_size=4)
+        for profile, results in zip(PROFILES[:10], batch):
+            single = predictor.predict_schemes(profile, top_n, 0)
+            assert [r['scheme_id'] for r in results] == [r['scheme_id'] for r in single]
+            # Copies of one scheme are listed in catalogue order
+            ids = [int(r['scheme_id'][3:]) for r in single]
+            assert all(a < b for a, b in zip(ids, ids[1:]) if a // 3 == b // 3)
+
+
+def test_rank_schemes_batch_matches_score_profile(fused_predictor):
+    ranked = fused_predictor.rank_schemes_batch(PROFILES, top_n=20, chunk_size=16)
+    for profile, (indices, scores) in zip(PROFILES, ranked):
+        single = fused_predictor.score_profile(profile)
+        np.testing.assert_array_equal(indices, top_k(single, 20))
+        np.testing.assert_allclose(scores, single[indices], rtol=1e-12)
+
+
+def test_empty_batch(predictor):
+    assert predictor.rank_schemes_batch([], top_n=10) == []
+    assert predictor.predict_schemes_batch([]) == []
@@ -0,0 +1,67 @@
+"""MicroBatcher against scoring each profile directly"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from batch_scheduler import MicroBatcher
+from benchmarks import random_profiles
+
+PROFILES = random_profiles(24, seed=3)
+
+
+def test_concurrent_callers_get_their_own_rows(fused_predictor):
+    batcher = MicroBatcher(fused_predictor.score_profiles, max_batch=8, max_wait_ms=50)
+    rows = [None] * len(PROFILES)
+    start = threading.Barrier(len(PROFILES))
+
+    def call(position):
+        start.wait()
+        rows[position] = batcher.score(PROFILES[position], timeout=30)
+
+    threads = [threading.Thread(target=call, args=(position,)) for position in range(len(PROFILES))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    for row, profile in zip(rows, PROFILES):
+        np.testing.assert_allclose(row, fused_predictor.score_profile(profile), rtol=1e-12)
+    stats = batcher.stats()
+    assert stats['profiles'] == len(PROFILES)
+    assert len(PROFILES) // 8 <= stats['batches'] < len(PROFILES)
+
+
+def test_score_async(fused_predictor):
+    batcher = MicroBatcher(fused_predictor.score_profiles)
+
+    async def score_all():
+        return await asyncio.gather(*(batcher.score_async(profile) for profile in PROFILES[:4]))
+
+    rows = asyncio.run(score_all())
+    batcher.close()
+    np.testing.assert_allclose(np.vstack(rows), fused_predictor.score_profiles(PROFILES[:4]), rtol=1e-12)
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    def broken(profiles):
+        raise ValueError("bad batch")
+
+    batcher = MicroBatcher(broken, max_wait_ms=20)
+    futures = [batcher.submit(profile) for profile in PROFILES[:3]]
+    for future in futures:
+        with pytest.raises(ValueError, match='bad batch'):
+            future.result(timeout=10)
+    batcher.close()
+
+
+def test_closed_batcher_refuses_new_profiles(fused_predictor):
+    batcher = MicroBatcher(fused_predictor.score_profiles)
+    future = batcher.submit(PROFILES[0])
+    batcher.close()
+    assert future.result(timeout=10).shape == (len(fused_predictor.schemes_df),)
+    with pytest.raises(RuntimeError):
+        batcher.submit(PROFILES[1])
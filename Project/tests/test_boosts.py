@@ -0,0 +1,49 @@
+"""Precomputed boost masks against the per-row keyword loop they replaced"""
+
+import numpy as np
+import pytest
+
+AGES = [0, 5, 17, 18, 25, 35, 36, 50, 59, 60, 75, 99]
+INCOMES = [0, 50000, 99999, 100000, 250000]
+
+
+def boosted_per_row(predictor, scores, age, income):
+    """The original iterrows loop over the raw eligibility texts"""
+    scores = scores.copy()
+    for idx, elig in enumerate(predictor.schemes_df['eligibility']):
+        elig_text = str(elig).lower()
+        if age >= 60 and any(w in elig_text for w in ['60', 'senior', 'elderly', 'pension', 'old']):
+            scores[idx] *= 1.5
+        elif age < 18 and any(w in elig_text for w in ['minor', 'child', 'below 18', 'under 18']):
+            scores[idx] *= 1.5
+        elif 18 <= age <= 35 and any(w in elig_text for w in ['youth', 'young', '18-35', 'student']):
+            scores[idx] *= 1.3
+        if income < 100000 and any(w in elig_text for w in ['bpl', 'poor', 'poverty', 'low income', 'ews']):
+            scores[idx] *= 1.4
+    return scores
+
+
+@pytest.fixture(scope='module')
+def raw_scores(predictor):
+    return np.random.default_rng(0).random(len(predictor.schemes_df))
+
+
+def test_masks_cover_every_rule(predictor):
+    # The synthetic catalogue has schemes hit by each rule, and schemes hit by none
+    assert all((predictor.age_boost_table[group] != 1).any() for group in range(1, 4))
+    assert (predictor.income_boost != 1).any() and (predictor.income_boost == 1).any()
+
+
+@pytest.mark.parametrize('age', AGES)
+@pytest.mark.parametrize('income', INCOMES)
+def test_apply_boosts_matches_per_row_loop(predictor, raw_scores, age, income):
+    expected = boosted_per_row(predictor, raw_scores, age, income)
+    np.testing.assert_array_equal(predictor.apply_boosts(raw_scores.copy(), age, income), expected)
+
+
+def test_apply_boosts_batch_matches_per_row_loop(predictor, raw_scores):
+    pairs = [(age, income) for age in AGES for income in INCOMES]
+    scores = np.tile(raw_scores, (len(pairs), 1))
+    boosted = predictor.apply_boosts_batch(scores, np.array([a for a, _ in pairs]), np.array([i for _, i in pairs]))
+    for row, (age, income) in zip(boosted, pairs):
+        np.testing.assert_array_equal(row, boosted_per_row(predictor, raw_scores, age, income))
@@ -0,0 +1,76 @@
+"""Report names and resuming in bulk_reports"""
+
+import json
+import os
+import zipfile
+
+from bulk_reports import claim_report_name, export_reports
+from conftest import PROFILES
+
+
+def write_profiles(path):
+    """PROFILES as JSON lines with ids p0..p4, plus one profile without an income"""
+    with open(path, 'w') as f:
+        for i, profile in enumerate(PROFILES):
+            f.write(json.dumps({'profile_id': f'p{i}', **profile}) + '\n')
+        f.write(json.dumps({'profile_id': 'bad', **{k: v for k, v in PROFILES[0].items() if k != 'income'}}) + '\n')
+    return str(path)
+
+
+def test_rerun_renders_only_the_missing_reports(tmp_path, catalogue_csv):
+    profiles = write_profiles(tmp_path / 'profiles.jsonl')
+    output = str(tmp_path / 'reports')
+    options = dict(report_format='txt', workers=1, chunk_size=2, data_path=catalogue_csv,
+                   models_dir=str(tmp_path / 'models'))
+
+    stats = export_reports(profiles, output, **options)
+    assert stats['rendered'] == 5 and stats['invalid'] == 1 and stats['skipped'] == 0
+    assert sorted(os.listdir(output)) == [f'p{i}.txt' for i in range(5)]
+
+    # Simulate an interrupted run: one report missing, one left half-written
+    os.remove(os.path.join(output, 'p3.txt'))
+    with open(os.path.join(output, 'p4.txt.part'), 'w') as f:
+        f.write('half')
+    stats = export_reports(profiles, output, **options)
+    assert stats['rendered'] == 1 and stats['skipped'] == 4
+    assert sorted(os.listdir(output)) == [f'p{i}.txt' for i in range(5)]
+
+
+def test_zip_output_resumes(tmp_path, catalogue_csv):
+    profiles = write_profiles(tmp_path / 'profiles.jsonl')
+    output = str(tmp_path / 'reports.zip')
+    options = dict(report_format='txt', workers=1, data_path=catalogue_csv, models_dir=str(tmp_path / 'models'))
+
+    assert export_reports(profiles, output, **options)['rendered'] == 5
+    with zipfile.ZipFile(output) as archive:
+        assert sorted(archive.namelist()) == [f'p{i}.txt' for i in range(5)]
+        assert archive.read('p0.txt').strip()
+    stats = export_reports(profiles, output, **options)
+    assert stats['rendered'] == 0 and stats['skipped'] == 5
+
+
+def test_claim_report_name_suffixes_collisions():
+    claimed = set()
+    names = [claim_report_name(pid, 'txt', claimed) for pid in ['a b', 'a_b', 'A_B', 'a_b-2', 'c']]
+    assert names == [('a_b.txt', False), ('a_b-2.txt', True), ('A_B-3.txt', True),
+                     ('a_b-2-2.txt', True), ('c.txt', False)]
+
+
+def test_duplicate_ids_get_their_own_reports(tmp_path, catalogue_csv):
+    profiles = tmp_path / 'profiles.jsonl'
+    with open(profiles, 'w') as f:
+        for i, profile in enumerate(PROFILES * 2):
+            f.write(json.dumps({'profile_id': f'p{i % 3}', **profile}) + '\n')
+    output = str(tmp_path / 'reports')
+    options = dict(report_format='txt', workers=1, chunk_size=4, data_path=catalogue_csv,
+                   models_dir=str(tmp_path / 'models'))
+
+    stats = export_reports(str(profiles), output, **options)
+    assert stats['rendered'] == 10 and stats['skipped'] == 0 and stats['renamed'] == 7
+    copies = {'p0': 4, 'p1': 3, 'p2': 3}
+    assert sorted(os.listdir(output)) == sorted(
+        f'{pid}{suffix}.txt' for pid, count in copies.items() for suffix in ['', '-2', '-3', '-4'][:count])
+
+    # A rerun maps the same profiles to the same names, so everything is resumed
+    stats = export_reports(str(profiles), output, **options)
+    assert stats['rendered'] == 0 and stats['skipped'] == 10
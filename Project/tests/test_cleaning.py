@@ -0,0 +1,48 @@
+"""Single-pass abbreviation expansion"""
+
+import re
+
+import pandas as pd
+import pytest
+
+from conftest import scheme_rows
+from high_accuracy_model import ABBREVIATION_EXPANSIONS, advanced_clean_column, clean_text
+
+SAMPLES = [
+    'SC/ST students', 'Students of SC, ST & OBC castes', 'sc-st/obc', 'BPL/APL card (Govt.)',
+    'Rs. 2 lakh or ₹5 crore', 'MSME & SME units; ITI/NGO', 'pwd-pvt', 'first, last;  st.', 'ST',
+    'Resident of state', 'sc/st/obc', 'sc//st', '', '   ', 'ÉWS über', '18-35 years',
+]
+
+
+def expanded_by_token(text):
+    """Reference: split the separated text into words and single non-word characters, expand exact words"""
+    text = re.sub(r'[^\w\-\/]+', ' ', text.lower()).strip()
+    tokens = re.findall(r'\w+|\W', text)
+    out, i = [], 0
+    while i < len(tokens):
+        if tokens[i:i + 3] == ['sc', '/', 'st']:
+            out.append(ABBREVIATION_EXPANSIONS['sc/st'])
+            i += 3
+            continue
+        out.append(ABBREVIATION_EXPANSIONS.get(tokens[i], tokens[i]))
+        i += 1
+    return ''.join(out)
+
+
+@pytest.mark.parametrize('text', SAMPLES)
+def test_clean_text_matches_token_reference(text):
+    assert clean_text(text) == expanded_by_token(text)
+
+
+def test_abbreviations_inside_words_are_kept():
+    assert clean_text('Students of a caste') == 'students of a caste'
+    assert clean_text('SC/ST') == ABBREVIATION_EXPANSIONS['sc/st']
+    # Expansions are not expanded again
+    assert clean_text('ST') == 'scheduled tribe st'
+
+
+def test_column_cleaning_matches_row_cleaning():
+    texts = pd.Series(SAMPLES + [row['eligibility'] for row in scheme_rows(50)] + [None, float('nan')])
+    expected = ['' if pd.isna(text) else clean_text(text) for text in texts]
+    assert advanced_clean_column(texts).tolist() == expected
@@ -0,0 +1,46 @@
+"""dataset_stats and its JSON cache keyed on the dataset hash"""
+
+import contextlib
+import io
+import json
+import os
+
+import dataset_stats as stats_module
+from conftest import scheme_rows, write_catalogue
+from dataset_stats import STATS_FILE, compute_dataset_stats, dataset_stats
+
+
+def test_cached_stats_are_reused_until_the_csv_changes(tmp_path, monkeypatch):
+    data_path = write_catalogue(tmp_path / 'updated_data.csv', scheme_rows(40))
+    stats_module._loaded.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = dataset_stats(data_path, str(tmp_path))
+    expected = compute_dataset_stats(data_path)
+    assert {key: stats[key] for key in expected} == expected
+    with open(tmp_path / STATS_FILE) as f:
+        assert json.load(f)['total_schemes'] == 40
+
+    # A fresh process reads the JSON file instead of recomputing
+    stats_module._loaded.clear()
+    monkeypatch.setattr(stats_module, 'compute_dataset_stats', None)
+    assert dataset_stats(data_path, str(tmp_path)) == stats
+
+    monkeypatch.undo()
+    write_catalogue(data_path, scheme_rows(50, seed=4))
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert dataset_stats(data_path, str(tmp_path))['total_schemes'] == 50
+
+
+def test_corrupt_cache_is_recomputed(catalogue_csv, tmp_path):
+    (tmp_path / STATS_FILE).write_text('{"total_schemes": 1')  # truncated write
+    stats_module._loaded.clear()
+    stats = dataset_stats(catalogue_csv, str(tmp_path))
+    assert stats['total_schemes'] == 150
+    with open(tmp_path / STATS_FILE) as f:
+        assert json.load(f)['total_schemes'] == 150
+
+
+def test_cache_written_without_leftovers(catalogue_csv, tmp_path):
+    stats_module._loaded.clear()
+    dataset_stats(catalogue_csv, str(tmp_path))
+    assert os.listdir(tmp_path) == [STATS_FILE]
@@ -0,0 +1,67 @@
+"""build_results from SchemeDisplayStore against the per-hit schemes_df.iloc loop it replaced"""
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import scheme_rows
+from high_accuracy_model import HighAccuracyPredictor, confidence_from_scores
+
+
+def results_per_row(predictor, indices, scores, min_confidence=0):
+    """The original build_results: one schemes_df row per hit"""
+    results = []
+    for idx, score, confidence in zip(indices, scores, confidence_from_scores(scores)):
+        if confidence < min_confidence:
+            continue
+        scheme = predictor.schemes_df.iloc[idx]
+        results.append({
+            'scheme_id': f'SCH{idx:04d}',
+            'scheme_name': scheme['scheme_name'][:100],
+            'slug': scheme['slug'],
+            'details': scheme['details'][:300] + '...' if len(str(scheme['details'])) > 300 else scheme['details'],
+            'benefits': scheme['benefits'][:300] + '...' if len(str(scheme['benefits'])) > 300 else scheme['benefits'],
+            'eligibility': scheme['eligibility'][:300] + '...' if len(str(scheme['eligibility'])) > 300 else scheme['eligibility'],
+            'level': scheme['level'],
+            'category': scheme['schemeCategory'],
+            'probability': float(confidence),
+            'eligible': bool(confidence >= 70),
+            'similarity_score': float(score),
+            'match_quality': 'Excellent' if confidence >= 80 else 'Very Good' if confidence >= 70 else 'Good' if confidence >= 60 else 'Fair'
+        })
+    return results
+
+
+def assert_same_results(predictor, profiles):
+    for indices, scores in predictor.rank_schemes_batch(profiles, top_n=60):
+        for min_confidence in (0, 50):
+            results = predictor.build_results(indices, scores, min_confidence)
+            expected = results_per_row(predictor, indices, scores, min_confidence)
+            assert results == expected
+            assert [[type(value) for value in r.values()] for r in results] == \
+                [[type(value) for value in r.values()] for r in expected]
+
+
+def test_fitted_predictor(predictor, profiles):
+    assert any(len(text) > 300 for text in predictor.schemes_df['details'])
+    assert_same_results(predictor, profiles)
+
+
+def test_loaded_predictor(tmp_path, catalogue_csv, profiles):
+    with contextlib.redirect_stdout(io.StringIO()):
+        HighAccuracyPredictor.from_artifacts(catalogue_csv, str(tmp_path), fused=True)
+        loaded = HighAccuracyPredictor.load_model(str(tmp_path), data_path=catalogue_csv, mmap=True, fused=True)
+    assert_same_results(loaded, profiles)
+
+
+@pytest.mark.parametrize('retired', [[], ['scheme-0', 'scheme-77']])
+def test_patched_store_after_update(tmp_path, catalogue_csv, profiles, retired):
+    with contextlib.redirect_stdout(io.StringIO()):
+        updated = HighAccuracyPredictor(catalogue_csv, fused=True)
+        upserts = [dict(scheme_rows(1, seed=12)[0], slug='scheme-5')] + scheme_rows(4, seed=13, start=150)
+        updated.update_schemes(pd.DataFrame(upserts), retired)
+    assert np.array_equal(updated.display_store.slugs, updated.schemes_df['slug'].to_numpy(dtype=object))
+    assert_same_results(updated, profiles)
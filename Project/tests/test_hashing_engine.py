@@ -0,0 +1,76 @@
+"""HashingTfidfIndex statistics and the hashing engine's update path"""
+
+import contextlib
+import io
+import pickle
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from conftest import scheme_rows, write_catalogue
+from hashing_engine import HashingTfidfIndex
+from high_accuracy_model import HighAccuracyPredictor
+from test_update_schemes import BASE, CHANGES, final_rows
+
+TEXTS = [row['eligibility'] for row in scheme_rows(60)]
+MORE = [row['eligibility'] for row in scheme_rows(20, seed=3)]
+
+
+def index():
+    return HashingTfidfIndex(n_features=2 ** 18, ngram_range=(1, 2), max_df=0.85, max_features=200)
+
+
+def test_weighting_matches_tfidf_vectorizer():
+    options = dict(max_df=0.85, sublinear_tf=True)
+    expected = TfidfVectorizer(**options).fit(TEXTS)
+    hashed = HashingTfidfIndex(n_features=2 ** 20, **options)
+    rows = hashed.fit_transform(TEXTS, chunk_size=25)
+
+    terms = sorted(expected.vocabulary_)
+    columns = [hashed.vocabulary_.get(term) for term in terms]
+    # No collisions among these terms, so every term has a column of its own
+    assert None not in columns and len(set(columns)) == len(terms) == len(hashed.columns_)
+    np.testing.assert_allclose(hashed.idf_[columns], expected.idf_[[expected.vocabulary_[t] for t in terms]])
+    reference = expected.transform(TEXTS)[:, [expected.vocabulary_[t] for t in terms]]
+    assert abs(rows[:, columns] - reference).max() < 1e-12
+
+
+def test_partial_fit_after_fit_keeps_the_weighting():
+    fitted = index()
+    before = fitted.fit_transform(TEXTS, chunk_size=25)
+    columns, idf = fitted.columns_.copy(), fitted.idf_.copy()
+    fitted.partial_fit(MORE)
+    np.testing.assert_array_equal(fitted.columns_, columns)
+    np.testing.assert_array_equal(fitted.idf_, idf)
+    assert abs(fitted.transform(TEXTS) - before).max() == 0
+    # The frozen weighting survives pickling with the newer statistics
+    assert np.array_equal(pickle.loads(pickle.dumps(fitted)).idf_, idf)
+
+
+def test_reweight_matches_a_fit_on_the_same_documents():
+    streamed = index()
+    streamed.fit_transform(TEXTS[:40], chunk_size=25)
+    streamed.partial_fit(MORE).partial_fit(TEXTS[40:]).forget(MORE).reweight()
+    refitted = index()
+    expected = refitted.fit_transform(TEXTS, chunk_size=25)
+    np.testing.assert_array_equal(streamed.columns_, refitted.columns_)
+    np.testing.assert_allclose(streamed.idf_, refitted.idf_)
+    assert abs(streamed.transform(TEXTS) - expected).max() < 1e-12
+
+
+def test_appended_schemes_score_like_a_refit(tmp_path, profiles):
+    upserts, retired = CHANGES['mixed']
+    upserts = upserts + scheme_rows(10, seed=11, start=90)
+    with contextlib.redirect_stdout(io.StringIO()):
+        updated = HighAccuracyPredictor(write_catalogue(tmp_path / 'base.csv', BASE), fused=True,
+                                        engine='hashing')
+        updated.update_schemes(pd.DataFrame(upserts), retired)
+        updated.refit()
+        reference = HighAccuracyPredictor(write_catalogue(tmp_path / 'final.csv', final_rows(upserts, retired)),
+                                          fused=True, engine='hashing')
+
+    assert updated.schemes_df['slug'].tolist() == reference.schemes_df['slug'].tolist()
+    for name in ('vectorizer_eligibility', 'vectorizer_benefits', 'vectorizer_category'):
+        np.testing.assert_array_equal(getattr(updated, name).columns_, getattr(reference, name).columns_)
+    np.testing.assert_allclose(updated.score_profiles(profiles), reference.score_profiles(profiles))
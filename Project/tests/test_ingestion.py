@@ -0,0 +1,24 @@
+"""Chunked catalogue ingestion against the whole-file read_csv path"""
+
+import contextlib
+import io
+
+import numpy as np
+
+from high_accuracy_model import HighAccuracyPredictor
+
+
+def test_chunked_ingestion_matches_whole_file(catalogue_csv, predictor, profiles):
+    with contextlib.redirect_stdout(io.StringIO()):
+        chunked = HighAccuracyPredictor(catalogue_csv, chunksize=40)
+
+    assert chunked.schemes_df['slug'].tolist() == predictor.schemes_df['slug'].tolist()
+    for column in ('clean_eligibility', 'clean_benefits', 'clean_category'):
+        assert chunked.schemes_df[column].tolist() == predictor.schemes_df[column].tolist()
+    assert str(chunked.schemes_df['level'].dtype) == 'category'
+    np.testing.assert_array_equal(chunked.age_boost_table, predictor.age_boost_table)
+    np.testing.assert_array_equal(chunked.income_boost, predictor.income_boost)
+    np.testing.assert_allclose(chunked.score_profiles(profiles), predictor.score_profiles(profiles))
+    with contextlib.redirect_stdout(io.StringIO()):
+        for profile in profiles:
+            assert chunked.predict_schemes(profile, top_n=20) == predictor.predict_schemes(profile, top_n=20)
@@ -0,0 +1,29 @@
+"""ParallelScorer across worker processes against rank_schemes_batch in-process"""
+
+import contextlib
+import io
+
+import numpy as np
+
+from benchmarks import random_profiles
+from high_accuracy_model import HighAccuracyPredictor
+from parallel_scoring import ParallelScorer
+
+PROFILES = random_profiles(50, seed=5)
+
+
+def test_pool_ranks_like_the_parent(tmp_path, catalogue_csv):
+    models = str(tmp_path / 'models')
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor = HighAccuracyPredictor.from_artifacts(catalogue_csv, models, mmap=True, fused=True)
+        expected = predictor.rank_schemes_batch(PROFILES, 10, 40)
+
+    with ParallelScorer(models, max_workers=2, chunk_size=7) as scorer:
+        # Uneven chunks, each split into several tasks, come back whole and in order
+        chunks = list(scorer.rank_chunks([PROFILES[:20], PROFILES[20:21], PROFILES[21:]], 10, 40))
+        assert scorer.rank([], 10) == []
+
+    assert [len(chunk) for chunk in chunks] == [20, 1, 29]
+    for (indices, scores), (expected_indices, expected_scores) in zip(sum(chunks, []), expected):
+        np.testing.assert_array_equal(indices, expected_indices)
+        np.testing.assert_allclose(scores, expected_scores, rtol=1e-12)
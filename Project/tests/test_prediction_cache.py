@@ -0,0 +1,52 @@
+"""PredictionCache eviction and expiry, and the profile key it is looked up by"""
+
+import prediction_cache
+from prediction_cache import PredictionCache
+
+
+def test_evicts_the_least_recently_used_entry():
+    cache = PredictionCache(maxsize=2, ttl=None)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now the oldest
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats()['size'] == 2 and cache.stats()['hits'] == 3 and cache.stats()['misses'] == 1
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(prediction_cache.time, 'monotonic', lambda: now[0])
+    cache = PredictionCache(maxsize=8, ttl=10)
+    cache.put('a', 1)
+    now[0] += 9
+    assert cache.get('a') == 1
+    now[0] += 2
+    assert cache.get('a') is None
+    assert cache.stats()['size'] == 0
+
+
+def test_get_or_compute_computes_once():
+    cache = PredictionCache(maxsize=8)
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute('a', lambda: calls.append(1) or 'value') == 'value'
+    assert len(calls) == 1
+    assert cache.stats()['hit_rate'] == round(2 / 3, 4)
+
+
+def test_zero_size_disables_caching():
+    cache = PredictionCache(maxsize=0)
+    cache.put('a', 1)
+    assert cache.get('a') is None
+
+
+def test_profiles_with_one_key_get_the_same_predictions(predictor, profiles, capsys):
+    # Income within the same boost group does not change the scores
+    profile = profiles[0]
+    richer = dict(profile, income=profile['income'] + 1000)
+    assert predictor.profile_key(richer) == predictor.profile_key(profile)
+    assert predictor.predict_schemes(richer, top_n=20) == predictor.predict_schemes(profile, top_n=20)
+    poorer = dict(profile, income=50000)
+    assert predictor.profile_key(poorer) != predictor.profile_key(profile)
@@ -0,0 +1,40 @@
+"""Cached ProfileEncoder vectors against vectorizer.transform of the joined profile text"""
+
+import contextlib
+import io
+
+import pytest
+
+from benchmarks import random_profiles
+from high_accuracy_model import HighAccuracyPredictor
+
+PROFILES = random_profiles(60, seed=2) + [
+    {'age': 0, 'income': 0, 'occupation': 'Astronaut', 'category': 'SC/ST', 'location': 'Tamil Nadu',
+     'education': 'None', 'family_size': 1, 'years_experience': 0},
+    {'age': 120, 'income': 10 ** 9, 'occupation': 'Self-Employed', 'category': 'OBC (NCL)',
+     'location': "Jammu & Kashmir", 'education': 'Ph.D.', 'family_size': 12, 'years_experience': 60},
+]
+
+
+@pytest.fixture(scope='module')
+def hashing_predictor(catalogue_csv):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return HighAccuracyPredictor(catalogue_csv, engine='hashing')
+
+
+@pytest.mark.parametrize('engine', ['predictor', 'hashing_predictor'])
+def test_encoder_matches_transform(request, engine):
+    predictor = request.getfixturevalue(engine)
+    texts = [predictor.create_enhanced_profile(profile) for profile in PROFILES]
+    # Twice, so the second pass runs entirely from the part caches
+    for _ in range(2):
+        for encoded, transformed in zip(predictor.encode_profiles(PROFILES), predictor.transform_profiles(texts)):
+            assert encoded.shape == transformed.shape
+            assert abs(encoded - transformed).max() < 1e-12
+
+
+def test_single_profile_matches_batch(predictor):
+    batch = predictor.encode_profiles(PROFILES)
+    for row, profile in enumerate(PROFILES[:10]):
+        for single, encoded in zip(predictor.encode_profiles([profile]), batch):
+            assert abs(single - encoded[row]).max() < 1e-12
@@ -0,0 +1,46 @@
+"""parse_profile validation shared by the JSON API and the bulk tools"""
+
+import pandas as pd
+import pytest
+
+from profile_io import iter_profile_chunks, parse_profile
+
+
+def test_coerces_form_values(profiles):
+    raw = dict(profiles[0], age='20', income='150000.5')
+    profile = parse_profile(raw)
+    assert profile['age'] == 20 and profile['income'] == 150000.5
+
+
+@pytest.mark.parametrize('field', ['age', 'income', 'family_size', 'years_experience'])
+@pytest.mark.parametrize('value', [True, False])
+def test_rejects_booleans_for_numbers(profiles, field, value):
+    with pytest.raises(ValueError):
+        parse_profile(dict(profiles[0], **{field: value}))
+
+
+@pytest.mark.parametrize('field', ['age', 'income', 'family_size', 'years_experience'])
+@pytest.mark.parametrize('value', [float('inf'), float('-inf'), 'inf', '1e400'])
+def test_rejects_infinite_numbers(profiles, field, value):
+    with pytest.raises(ValueError, match='must be'):
+        parse_profile(dict(profiles[0], **{field: value}))
+
+
+@pytest.mark.parametrize('value', [5, 5.0, ['Student'], {'name': 'Student'}])
+def test_rejects_non_string_text(profiles, value):
+    with pytest.raises(ValueError, match='must be strings'):
+        parse_profile(dict(profiles[0], occupation=value))
+
+
+def test_csv_text_columns_stay_strings(profiles, tmp_path):
+    path = tmp_path / 'profiles.csv'
+    pd.DataFrame([dict(profiles[0], location='110001')]).to_csv(path, index=False)
+    (ids, parsed, errors), = iter_profile_chunks(str(path))
+    assert errors == [] and parsed[0]['location'] == '110001'
+
+
+def test_reports_missing_fields(profiles):
+    raw = dict(profiles[0])
+    del raw['income']
+    with pytest.raises(ValueError, match='income'):
+        parse_profile(raw)
@@ -0,0 +1,51 @@
+"""score_profiles.py output against rank_schemes_batch on the same profiles"""
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks import random_profiles
+from high_accuracy_model import HighAccuracyPredictor, confidence_from_scores
+from score_profiles import score_file
+
+PROFILES = random_profiles(30, seed=4)
+
+
+@pytest.fixture
+def profile_csv(tmp_path):
+    frame = pd.DataFrame([{'profile_id': f'p{i}', **profile} for i, profile in enumerate(PROFILES)])
+    frame.loc[len(frame)] = dict(frame.iloc[0], profile_id='bad', age='old')
+    frame.to_csv(tmp_path / 'profiles.csv', index=False)
+    return str(tmp_path / 'profiles.csv')
+
+
+@pytest.mark.parametrize('min_confidence', [0, 55])
+def test_csv_output_matches_rank_schemes_batch(tmp_path, catalogue_csv, profile_csv, min_confidence):
+    models = str(tmp_path / 'models')
+    output = str(tmp_path / 'scores.csv')
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = score_file(profile_csv, output, top_k=8, min_confidence=min_confidence, chunk_size=7,
+                           data_path=catalogue_csv, models_dir=models)
+        predictor = HighAccuracyPredictor.load_model(models, data_path=catalogue_csv, fused=True)
+        ranked = predictor.rank_schemes_batch(PROFILES, 8, min_confidence)
+    assert stats['profiles'] == len(PROFILES) and stats['invalid'] == 1
+
+    scores = pd.read_csv(output)
+    assert stats['rows'] == len(scores)
+    for i, (indices, row_scores) in enumerate(ranked):
+        keep = confidence_from_scores(row_scores) >= min_confidence
+        indices, row_scores = indices[keep], row_scores[keep]
+        rows = scores[scores['profile_id'] == f'p{i}']
+        assert rows['rank'].tolist() == list(range(1, len(indices) + 1))
+        assert rows['scheme_id'].tolist() == [f'SCH{idx:04d}' for idx in indices]
+        assert rows['slug'].tolist() == predictor.schemes_df['slug'].iloc[indices].tolist()
+        np.testing.assert_allclose(rows['score'], row_scores, atol=1e-6)
+
+
+def test_rejects_unknown_output_format(tmp_path, catalogue_csv, profile_csv):
+    with pytest.raises(ValueError, match='expected .csv or .parquet'), contextlib.redirect_stdout(io.StringIO()):
+        score_file(profile_csv, str(tmp_path / 'scores.txt'), data_path=catalogue_csv,
+                   models_dir=str(tmp_path / 'models'))
@@ -0,0 +1,31 @@
+"""Fused single mat-vec scoring against the three cosine_similarity calls"""
+
+import numpy as np
+
+from conftest import PROFILES
+
+
+def test_fused_scores_match_three_cosines(predictor, fused_predictor, profiles):
+    assert predictor.fused_vectors is None and fused_predictor.fused_vectors is not None
+    texts = [predictor.create_enhanced_profile(profile) for profile in profiles]
+    np.testing.assert_allclose(fused_predictor.ensemble_scores(texts), predictor.ensemble_scores(texts),
+                               rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(fused_predictor.score_profiles(profiles), predictor.score_profiles(profiles),
+                               rtol=1e-10, atol=1e-12)
+
+
+def test_fused_ranking_matches(predictor, fused_predictor, capsys):
+    # Same schemes in the same order; scores agree to rounding error
+    for profile in PROFILES:
+        fused = fused_predictor.predict_schemes(profile, top_n=25)
+        separate = predictor.predict_schemes(profile, top_n=25)
+        assert [r['scheme_id'] for r in fused] == [r['scheme_id'] for r in separate]
+        np.testing.assert_allclose([r['similarity_score'] for r in fused],
+                                   [r['similarity_score'] for r in separate], rtol=1e-12)
+
+
+def test_empty_profile_text_scores_zero(predictor, fused_predictor):
+    # A profile with no known terms has all-zero vectors; both paths give zero, not NaN
+    for scorer in (predictor, fused_predictor):
+        scores = scorer.ensemble_scores(['zzzz qqqq'])
+        assert np.all(scores == 0)
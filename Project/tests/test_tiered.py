@@ -0,0 +1,28 @@
+"""predict_schemes_tiered against one predict_schemes call per tier"""
+
+import pytest
+
+TIERS = [((500, 60), (10, 50)), ((500, 100), (3, 99), (7, 0)), ((7, 0),), ((5, 100),)]
+
+
+def first_nonempty_tier(predictor, profile, tiers):
+    """The index route before: a full prediction for each tier until one has results"""
+    results = []
+    for top_n, min_confidence in tiers:
+        results = predictor.predict_schemes(profile, top_n, min_confidence)
+        if results:
+            break
+    return results
+
+
+@pytest.mark.parametrize('tiers', TIERS)
+def test_tiered_matches_one_prediction_per_tier(predictor, profiles, tiers, capsys):
+    for profile in profiles:
+        assert predictor.predict_schemes_tiered(profile, tiers) == first_nonempty_tier(predictor, profile, tiers)
+
+
+def test_falls_back_to_the_next_tier(predictor, profiles, capsys):
+    # Nothing scores 100% confidence, so the second tier is what comes back
+    results = predictor.predict_schemes_tiered(profiles[0], ((500, 100), (4, 0)))
+    assert len(results) == 4
+    assert 'trying next tier' in capsys.readouterr().out
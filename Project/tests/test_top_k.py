@@ -0,0 +1,47 @@
+"""top_k partial selection against a full stable argsort of the scores"""
+
+import numpy as np
+import pytest
+
+from high_accuracy_model import top_k
+
+
+def full_sort(scores, k, min_score=-np.inf):
+    order = np.argsort(-scores, kind='stable')[:max(k, 0)]
+    return order[scores[order] >= min_score]
+
+
+@pytest.mark.parametrize('k', [1, 5, 20, 50, 200])
+def test_matches_full_sort(k):
+    rng = np.random.default_rng(k)
+    scores = rng.random(100)
+    np.testing.assert_array_equal(top_k(scores, k), full_sort(scores, k))
+
+
+def test_min_score_filters_candidates():
+    scores = np.random.default_rng(1).random(100)
+    np.testing.assert_array_equal(top_k(scores, 30, 0.5), full_sort(scores, 30, 0.5))
+
+
+def test_matrix_rows_match_vector_path():
+    scores = np.random.default_rng(2).random((6, 80))
+    for k in (1, 10, 80, 500):
+        for row, selected in zip(scores, top_k(scores, k, 0.3)):
+            np.testing.assert_array_equal(selected, full_sort(row, k, 0.3))
+
+
+@pytest.mark.parametrize('k', [0, -1, -5])
+def test_non_positive_k_selects_nothing(k):
+    scores = np.random.default_rng(3).random((4, 30))
+    assert len(top_k(scores[0], k)) == 0
+    assert all(len(row) == 0 for row in top_k(scores, k))
+
+
+@pytest.mark.parametrize('k', [1, 3, 10, 25, 40])
+@pytest.mark.parametrize('min_score', [-np.inf, 0, 2])
+def test_ties_are_broken_by_position(k, min_score):
+    # Four distinct values in each row, so ties straddle every cut
+    scores = np.random.default_rng(4).integers(0, 4, (6, 40)).astype(float)
+    for row, selected in zip(scores, top_k(scores, k, min_score)):
+        np.testing.assert_array_equal(selected, full_sort(row, k, min_score))
+        np.testing.assert_array_equal(top_k(row, k, min_score), full_sort(row, k, min_score))
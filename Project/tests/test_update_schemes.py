@@ -0,0 +1,140 @@
+"""update_schemes and update_catalog against a predictor fitted on the final catalogue"""
+
+import contextlib
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import update_catalog
+from conftest import scheme_rows, write_catalogue
+from high_accuracy_model import METADATA_FILE, SCHEME_MATRICES, HighAccuracyPredictor, boost_masks
+
+BASE = scheme_rows(80)
+CHANGES = {
+    'retire': ([], ['scheme-3', 'scheme-40', 'scheme-79']),
+    'upsert': ([dict(row, slug=f'scheme-{i}') for i, row in zip([5, 17], scheme_rows(2, seed=7))]
+               + scheme_rows(3, seed=8, start=80), []),
+    'mixed': ([dict(scheme_rows(1, seed=9)[0], slug='scheme-10')] + scheme_rows(2, seed=10, start=80),
+              ['scheme-0', 'scheme-50']),
+}
+
+
+def final_rows(upserts, retired):
+    """BASE with the changes applied the way update_schemes orders them"""
+    by_slug = {row['slug']: row for row in upserts}
+    rows = [by_slug.pop(row['slug'], row) for row in BASE if row['slug'] not in retired]
+    return rows + list(by_slug.values())
+
+
+def fit(path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return HighAccuracyPredictor(path, fused=True)
+
+
+@pytest.fixture(params=sorted(CHANGES))
+def change(request):
+    return CHANGES[request.param]
+
+
+def test_update_matches_refit(tmp_path, change, profiles):
+    upserts, retired = change
+    updated = fit(write_catalogue(tmp_path / 'base.csv', BASE))
+    with contextlib.redirect_stdout(io.StringIO()):
+        updated.update_schemes(pd.DataFrame(upserts) if upserts else None, retired)
+    reference = fit(write_catalogue(tmp_path / 'final.csv', final_rows(upserts, retired)))
+
+    assert updated.schemes_df['slug'].tolist() == reference.schemes_df['slug'].tolist()
+    assert updated.display_store.names.tolist() == reference.display_store.names.tolist()
+    # Patched rows are what the frozen vectorizers make of the final catalogue
+    for name, vectorizer, column in zip(SCHEME_MATRICES, (updated.vectorizer_eligibility,
+                                        updated.vectorizer_benefits, updated.vectorizer_category),
+                                        ('clean_eligibility', 'clean_benefits', 'clean_category')):
+        expected = vectorizer.transform(reference.schemes_df[column])
+        assert abs(getattr(updated, name) - expected).max() < 1e-12
+    age_boost_table, income_boost = boost_masks(reference.schemes_df['eligibility'])
+    np.testing.assert_array_equal(updated.age_boost_table, age_boost_table)
+    np.testing.assert_array_equal(updated.income_boost, income_boost)
+
+    # After refit() the model is the one a full fit of the final catalogue gives
+    with contextlib.redirect_stdout(io.StringIO()):
+        updated.refit()
+    np.testing.assert_allclose(updated.score_profiles(profiles), reference.score_profiles(profiles))
+
+
+def test_update_catalog_keeps_csv_and_model_in_sync(tmp_path, change):
+    upserts, retired = change
+    data_path = write_catalogue(tmp_path / 'updated_data.csv', BASE)
+    models = str(tmp_path / 'models')
+    upsert_path = write_catalogue(tmp_path / 'upserts.csv', upserts) if upserts else None
+    with contextlib.redirect_stdout(io.StringIO()):
+        HighAccuracyPredictor.from_artifacts(data_path, models, fused=True)
+        update_catalog.update_catalog(upsert_path, retired, 'never', data_path, models)
+        loaded = HighAccuracyPredictor.load_model(models, data_path=data_path, fused=True)
+
+    expected = [row['slug'] for row in final_rows(upserts, retired)]
+    assert pd.read_csv(data_path)['slug'].tolist() == expected
+    assert loaded.schemes_df['slug'].tolist() == expected
+    assert sorted(os.listdir(tmp_path)) == sorted(['updated_data.csv', 'models'] + (['upserts.csv'] if upserts else []))
+    assert not [name for name in os.listdir(models) if name.startswith('.update-')]
+
+
+def test_failed_update_changes_nothing(tmp_path, monkeypatch):
+    data_path = write_catalogue(tmp_path / 'updated_data.csv', BASE)
+    models = str(tmp_path / 'models')
+    with contextlib.redirect_stdout(io.StringIO()):
+        HighAccuracyPredictor.from_artifacts(data_path, models, fused=True)
+    with open(data_path, 'rb') as f:
+        csv_before = f.read()
+    with open(os.path.join(models, METADATA_FILE)) as f:
+        metadata_before = json.load(f)
+
+    def broken_write(self, directory):
+        raise OSError("disk full")
+    monkeypatch.setattr(HighAccuracyPredictor, 'write_artifacts', broken_write)
+    with pytest.raises(OSError), contextlib.redirect_stdout(io.StringIO()):
+        update_catalog.update_catalog(None, ['scheme-3'], 'never', data_path, models)
+
+    with open(data_path, 'rb') as f:
+        assert f.read() == csv_before
+    with open(os.path.join(models, METADATA_FILE)) as f:
+        assert json.load(f) == metadata_before
+    assert sorted(os.listdir(tmp_path)) == ['models', 'updated_data.csv']
+    assert not [name for name in os.listdir(models) if name.startswith('.update-')]
+
+
+def test_duplicate_slugs_are_rejected(tmp_path):
+    data_path = write_catalogue(tmp_path / 'updated_data.csv', BASE)
+    predictor = fit(data_path)
+    upserts = pd.DataFrame([dict(row, slug='scheme-5') for row in scheme_rows(2, seed=7)])
+    with pytest.raises(ValueError, match='Duplicate slugs in the upserts: scheme-5'):
+        predictor.update_schemes(upserts)
+
+    predictor.schemes_df.loc[1, 'slug'] = 'scheme-0'
+    with pytest.raises(ValueError, match='Duplicate slugs in the catalogue: scheme-0'):
+        predictor.update_schemes(None, ['scheme-3'])
+
+
+def test_duplicate_slugs_change_nothing(tmp_path):
+    data_path = write_catalogue(tmp_path / 'updated_data.csv', BASE + [dict(BASE[7])])
+    models = str(tmp_path / 'models')
+    with contextlib.redirect_stdout(io.StringIO()):
+        HighAccuracyPredictor.from_artifacts(data_path, models, fused=True)
+    with open(data_path, 'rb') as f:
+        csv_before = f.read()
+    with open(os.path.join(models, METADATA_FILE)) as f:
+        metadata_before = json.load(f)
+
+    with pytest.raises(ValueError, match='scheme-7'), contextlib.redirect_stdout(io.StringIO()):
+        update_catalog.update_catalog(None, ['scheme-3'], 'never', data_path, models)
+    with pytest.raises(ValueError, match='scheme-7'):
+        update_catalog.apply_to_dataset(data_path, None, ['scheme-3'])
+
+    with open(data_path, 'rb') as f:
+        assert f.read() == csv_before
+    with open(os.path.join(models, METADATA_FILE)) as f:
+        assert json.load(f) == metadata_before
+    assert sorted(os.listdir(tmp_path)) == ['models', 'updated_data.csv']
@@ -0,0 +1,122 @@
+"""
+Scheme Catalogue Updates
+Apply new, changed and retired schemes to the dataset and the saved model without a full refit
+
+Run with: python update_catalog.py --upsert new_schemes.csv [--retire old-slug ...]
+          python update_catalog.py --retire old-slug --refit always
+
+Rows in the --upsert CSV use the dataset's columns; a slug that already exists
+replaces that scheme. The vocabularies stay frozen until the catalogue drifts past
+the refit thresholds (--refit auto), so weekly updates take seconds, not a full rebuild.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from high_accuracy_model import (HighAccuracyPredictor, artifact_lock, check_unique_slugs, compute_data_hash,
+                                 install_artifacts)
+
+
+def apply_to_dataset(data_path, upserts, retired_slugs, output_path=None):
+    """
+    Rewrite the dataset CSV with the same changes update_schemes makes to the model
+
+    Changed rows are replaced in place, new rows appended and retired rows dropped,
+    so a fresh load of the file yields the schemes in the same order. The result is
+    written to output_path if given (for the caller to move into place), otherwise
+    data_path is replaced atomically.
+    """
+    raw = pd.read_csv(data_path)
+    check_unique_slugs(raw['slug'], data_path)
+    raw = raw[~raw['slug'].isin(set(retired_slugs))]
+    if upserts is not None and len(upserts):
+        check_unique_slugs(upserts['slug'], 'the upserts')
+        updates = upserts.reindex(columns=raw.columns)
+        by_slug = updates.set_index('slug', drop=False)
+        updated = raw['slug'].isin(by_slug.index)
+        # Rows the predictor skipped (no name or eligibility) are replaced by appending, as in the model
+        usable = raw[['scheme_name', 'eligibility']].notna().all(axis=1)
+        raw = raw[~(updated & ~usable)].copy()
+        modified = updated & usable
+        raw.loc[modified] = by_slug.loc[raw.loc[modified, 'slug']].to_numpy()
+        raw = pd.concat([raw, updates[~updates['slug'].isin(raw['slug'])]], ignore_index=True)
+
+    if output_path:
+        raw.to_csv(output_path, index=False)
+        return
+    partial = data_path + '.tmp'
+    raw.to_csv(partial, index=False)
+    os.replace(partial, data_path)
+
+
+def update_catalog(upsert_path=None, retired_slugs=(), refit='auto',
+                   data_path='updated_data.csv', models_dir='models/'):
+    """
+    Update the dataset and the saved model in models_dir
+
+    The new CSV and artifacts are written to temporary locations first and only
+    moved into place once both are complete, under the models_dir lock, so a
+    failure leaves both untouched and loaders never see one without the other.
+
+    Args:
+        upsert_path: CSV of new or changed scheme rows
+        retired_slugs: Slugs of schemes to remove
+        refit: 'auto' (refit when needs_refit()), 'always' or 'never'
+
+    Returns:
+        The updated predictor
+    """
+    upserts = pd.read_csv(upsert_path) if upsert_path else None
+    predictor = HighAccuracyPredictor.from_artifacts(data_path, models_dir, fused=True)
+    predictor.update_schemes(upserts, retired_slugs)
+
+    if refit == 'always' or (refit == 'auto' and predictor.needs_refit()):
+        print("🔄 Refitting vocabularies on the updated catalogue...")
+        predictor.refit()
+
+    os.makedirs(models_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix='.update-', dir=models_dir)
+    partial = data_path + '.tmp'
+    try:
+        apply_to_dataset(data_path, upserts, retired_slugs, partial)
+        predictor.data_hash = compute_data_hash(partial)
+        predictor.write_artifacts(staging)
+        with artifact_lock(models_dir):
+            os.replace(partial, data_path)
+            install_artifacts(staging, models_dir)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+        if os.path.exists(partial):
+            os.remove(partial)
+
+    drift = predictor.vocabulary_drift()
+    print(f"✓ Drift since last fit: {drift['changed_fraction']:.1%} of schemes changed, "
+          f"unknown-word rate {drift['oov_rate']:.1%} (+{drift['oov_increase']:.1%})")
+    return predictor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--upsert', help='CSV of new or changed schemes (dataset columns, keyed by slug)')
+    parser.add_argument('--retire', nargs='*', default=[], help='Slugs of schemes to remove')
+    parser.add_argument('--refit', choices=['auto', 'always', 'never'], default='auto',
+                        help='Refit the vocabularies (auto: only when drift passes the thresholds)')
+    parser.add_argument('--data', default='updated_data.csv', help='Scheme dataset CSV')
+    parser.add_argument('--models', default='models/', help='Saved model directory')
+    args = parser.parse_args()
+    if not args.upsert and not args.retire and args.refit != 'always':
+        parser.error("nothing to do: give --upsert and/or --retire (or --refit always)")
+
+    print("\n" + "="*70)
+    print("SCHEME CATALOGUE UPDATE")
+    print("="*70)
+    update_catalog(args.upsert, args.retire, args.refit, args.data, args.models)
+    print("="*70 + "\n")
+
+
+if __name__ == '__main__':
+    main()